@@ -0,0 +1,522 @@
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+if __name__ == "__main__":
+    # Started as a script from this folder: the shared tempestpy package is one directory up
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tempestpy.trace import span
+from tempestpy.wind import wind_components
+
+# Parameters returned by hodograph_parameters, one value per sounding
+PARAMETERS = ["helicity", "shear_u", "shear_v", "shear_mag", "mean_u", "mean_v", "rm_u", "rm_v", "lm_u", "lm_v"]
+# Bunkers deviation of the right/left movers from the mean wind, in knots
+BUNKERS_DEVIATION_KT = 7.5
+# Levels averaged for the mean wind; create.py's five levels make this 1000-350 hPa (~0-6 km)
+MEAN_WIND_LEVELS = 4
+
+# Height-based mode (storm_relative_helicity)
+KNOTS_TO_MS = 0.514444
+DRY_AIR_GAS_CONSTANT = 287.04749  # J/(kg K)
+GRAVITY = 9.80665  # m/s^2
+# US standard atmosphere, used for heights when no temperature profile is given
+STANDARD_SURFACE_PRESSURE = 1013.25  # hPa
+STANDARD_SURFACE_TEMPERATURE = 288.0  # K
+STANDARD_LAPSE_RATE = 0.0065  # K/m
+# SRH layers in meters above ground: 0-1 km and 0-3 km
+DEFAULT_SRH_LAYERS = ((0, 1000), (0, 3000))
+# Bunkers (2000): 0-6 km mean wind, shear between the 0-0.5 km and 5.5-6 km means, 7.5 m/s deviation
+BUNKERS_DEPTH = 6000.0
+BUNKERS_SHEAR_LAYER = 500.0
+BUNKERS_DEVIATION_MS = 7.5
+
+@span("hodograph.calc")
+def hodograph_parameters(pressure, speed, direction, mean_levels=MEAN_WIND_LEVELS,
+                         deviation=BUNKERS_DEVIATION_KT):
+    """
+    Helicity, deep-layer shear and Bunkers storm motions for many soundings at once.
+
+    Reproduces the Custom Hodograph Creator calculations without pint: helicity is the sum
+    of u*dv/dp - v*du/dp over the levels (kt^2/hPa, as create.py computes it), shear is the
+    vector difference between the top and bottom level, and the right/left movers sit
+    `deviation` knots either side of the mean wind, perpendicular to the shear.
+
+    The rotation is create.py's, kept so results match what the tool has always drawn: its
+    "right mover" is the shear vector turned 90 degrees counterclockwise, i.e. to the left
+    of the shear, and "left mover" the other way round. storm_relative_helicity uses the
+    standard Bunkers convention instead (right mover to the right of the shear).
+
+    Soundings may have different numbers of levels: pad the top of shorter ones with NaN
+    (as load_profiles does). Each one is then used up to its last complete level, so its
+    shear is taken to that level and helicity is summed below it.
+
+    Parameters:
+        pressure (numpy.ndarray): Pressure levels in hPa, shape (levels,) shared by every sounding or (N, levels).
+        speed (numpy.ndarray): Wind speed in knots, shape (N, levels).
+        direction (numpy.ndarray): Wind direction in degrees, shape (N, levels).
+        mean_levels (int): Number of lowest levels averaged for the mean wind.
+        deviation (float): Bunkers deviation in knots.
+
+    Returns:
+        dict: Parameter name (see PARAMETERS) -> array of shape (N,). Soundings with no
+            shear get NaN storm motions, as the original script would, and soundings with
+            fewer than two complete levels get NaN throughout.
+    """
+    speed = np.atleast_2d(np.asarray(speed, dtype=np.float64))
+    direction = np.atleast_2d(np.asarray(direction, dtype=np.float64))
+    pressure = np.asarray(pressure, dtype=np.float64)
+    if speed.shape != direction.shape:
+        raise ValueError(f"speed {speed.shape} and direction {direction.shape} must have the same shape")
+    if pressure.shape[-1] != speed.shape[1] or pressure.ndim > 2:
+        raise ValueError(f"pressure {pressure.shape} doesn't match {speed.shape[1]} levels")
+    if speed.shape[1] < 2:
+        raise ValueError("at least two levels are needed")
+
+    complete = np.isfinite(speed) & np.isfinite(direction) & np.isfinite(pressure)
+    if not complete.all():
+        return _ragged_parameters(complete, pressure, speed, direction, mean_levels, deviation)
+
+    u, v = wind_components(speed, direction)
+    dp = np.diff(pressure, axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        helicity = np.sum((u[:, :-1] * np.diff(v, axis=1) - v[:, :-1] * np.diff(u, axis=1)) / dp, axis=1)
+        shear_u = u[:, -1] - u[:, 0]
+        shear_v = v[:, -1] - v[:, 0]
+        shear_mag = np.hypot(shear_u, shear_v)
+        mean_u = u[:, :mean_levels].mean(axis=1)
+        mean_v = v[:, :mean_levels].mean(axis=1)
+        perp_u = -shear_v / shear_mag * deviation
+        perp_v = shear_u / shear_mag * deviation
+    return {
+        "helicity": helicity,
+        "shear_u": shear_u,
+        "shear_v": shear_v,
+        "shear_mag": shear_mag,
+        "mean_u": mean_u,
+        "mean_v": mean_v,
+        "rm_u": mean_u + perp_u,
+        "rm_v": mean_v + perp_v,
+        "lm_u": mean_u - perp_u,
+        "lm_v": mean_v - perp_v,
+    }
+
+def _ragged_parameters(complete, pressure, speed, direction, mean_levels, deviation):
+    # Soundings cut at their first incomplete level, then computed in groups of equal length
+    count = np.where(complete.all(axis=1), complete.shape[1], np.argmin(complete, axis=1))
+    pressure = np.broadcast_to(pressure, speed.shape)
+    results = {name: np.full(len(speed), np.nan) for name in PARAMETERS}
+    for levels in np.unique(count[count >= 2]):
+        rows = np.flatnonzero(count == levels)
+        group = hodograph_parameters(pressure[rows, :levels], speed[rows, :levels], direction[rows, :levels],
+                                     mean_levels, deviation)
+        for name, value in group.items():
+            results[name][rows] = value
+    return results
+
+def reference_parameters(pressure, speed, direction):
+    """
+    The original one-sounding MetPy/pint calculation from create.py, for checking results.
+
+    Returns:
+        dict: Parameter name -> float (magnitudes, in the same units as hodograph_parameters).
+    """
+    import metpy.calc as mpcalc
+    from metpy.units import units
+    pressure_levels = np.asarray(pressure) * units.hPa
+    u, v = mpcalc.wind_components(np.asarray(speed) * units.knots, np.asarray(direction) * units.degrees)
+    du_dz = np.diff(u) / np.diff(pressure_levels)
+    dv_dz = np.diff(v) / np.diff(pressure_levels)
+    helicity = np.sum(u[:-1] * dv_dz - v[:-1] * du_dz)
+    shear_u, shear_v = u[-1] - u[0], v[-1] - v[0]
+    shear_mag = np.sqrt(shear_u**2 + shear_v**2)
+    mean_u, mean_v = np.mean(u[:MEAN_WIND_LEVELS]), np.mean(v[:MEAN_WIND_LEVELS])
+    perp_shear_u = -shear_v / shear_mag * BUNKERS_DEVIATION_KT * units.knots
+    perp_shear_v = shear_u / shear_mag * BUNKERS_DEVIATION_KT * units.knots
+    values = {
+        "helicity": helicity, "shear_u": shear_u, "shear_v": shear_v, "shear_mag": shear_mag,
+        "mean_u": mean_u, "mean_v": mean_v,
+        "rm_u": mean_u + perp_shear_u, "rm_v": mean_v + perp_shear_v,
+        "lm_u": mean_u - perp_shear_u, "lm_v": mean_v - perp_shear_v,
+    }
+    return {name: float(value.magnitude) for name, value in values.items()}
+
+def pressure_to_height(pressure, temperature=None):
+    """
+    Height above the lowest level of each profile.
+
+    With a temperature profile the hypsometric equation is applied layer by layer (using
+    the layer mean temperature); without one the US standard atmosphere is assumed.
+
+    Parameters:
+        pressure (numpy.ndarray): Pressure in hPa, (levels,) or (N, levels), surface first.
+        temperature (numpy.ndarray, optional): Temperature in degrees C, same shape as pressure.
+
+    Returns:
+        numpy.ndarray: Heights in meters above ground level, same shape as pressure.
+    """
+    pressure = np.asarray(pressure, dtype=np.float64)
+    if temperature is None:
+        exponent = DRY_AIR_GAS_CONSTANT * STANDARD_LAPSE_RATE / GRAVITY
+        height = (STANDARD_SURFACE_TEMPERATURE / STANDARD_LAPSE_RATE) * (1 - (pressure / STANDARD_SURFACE_PRESSURE) ** exponent)
+        return height - height[..., :1]
+    temperature = np.asarray(temperature, dtype=np.float64) + 273.15
+    height = np.zeros(np.broadcast_shapes(pressure.shape, temperature.shape))
+    layer_mean = (temperature[..., 1:] + temperature[..., :-1]) / 2
+    thickness = (DRY_AIR_GAS_CONSTANT / GRAVITY) * layer_mean * np.log(pressure[..., :-1] / pressure[..., 1:])
+    np.cumsum(thickness, axis=-1, out=height[..., 1:])
+    return height
+
+def _locate(height, level):
+    # Where `level` (meters) falls in each profile: row indices, the segment k with
+    # height[k] <= level <= height[k + 1], and the fractional position in that segment.
+    # Heights rise along each row and NaN padding at the top is skipped. Profiles that
+    # don't reach `level` get k = -1.
+    rows = np.arange(len(height))
+    count = np.count_nonzero(height <= level, axis=1)
+    top = np.count_nonzero(~np.isnan(height), axis=1)
+    k = np.minimum(count, top - 1) - 1
+    valid = (count > 0) & (k >= 0) & ((count < top) | (height[rows, top - 1] == level))
+    k = np.where(valid, k, -1)
+    safe = np.maximum(k, 0)
+    z0 = height[rows, safe]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = (level - z0) / (height[rows, safe + 1] - z0)
+    return rows, k, fraction
+
+def _interpolate(values, location):
+    # Linear interpolation of a (N, levels) array at a _locate result (NaN where k == -1)
+    rows, k, fraction = location
+    safe = np.maximum(k, 0)
+    v0 = values[rows, safe]
+    result = v0 + fraction * (values[rows, safe + 1] - v0)
+    result[k < 0] = np.nan
+    return result
+
+def _cumulative_trapezoid(height, wind):
+    cumulative = np.zeros_like(wind)
+    np.cumsum(np.diff(height, axis=1) * (wind[:, 1:] + wind[:, :-1]) / 2, axis=1, out=cumulative[:, 1:])
+    return cumulative
+
+def _integral_to(height, wind, cumulative, location, level):
+    # Integral of the wind from the ground to `level`: the cumulative trapezoid sum up to the
+    # segment, plus the exact (linear wind) integral over the part of the segment below `level`
+    rows, k, _ = location
+    safe = np.maximum(k, 0)
+    return cumulative[rows, safe] + (level - height[rows, safe]) * (wind[rows, safe] + _interpolate(wind, location)) / 2
+
+def bunkers_motion(height, u, v):
+    """
+    Bunkers right- and left-mover motion from height-based layer means.
+
+    The 0-6 km mean wind and the shear between the 0-0.5 km and 5.5-6 km mean winds are
+    height weighted, using the cumulative trapezoid integral of u and v, so the result
+    doesn't depend on how densely the profile is sampled. Movers sit 7.5 m/s to the
+    right/left of the shear vector.
+
+    Parameters:
+        height (numpy.ndarray): Heights above ground in meters, (N, levels).
+        u, v (numpy.ndarray): Wind components in m/s, (N, levels).
+
+    Returns:
+        dict: rm_u, rm_v, lm_u, lm_v, mean_u, mean_v, shear_u, shear_v in m/s, one value per profile.
+    """
+    levels = (0.0, BUNKERS_SHEAR_LAYER, BUNKERS_DEPTH - BUNKERS_SHEAR_LAYER, BUNKERS_DEPTH)
+    locations = [_locate(height, level) for level in levels]
+    mean, shear = {}, {}
+    for name, wind in (("u", u), ("v", v)):
+        cumulative = _cumulative_trapezoid(height, wind)
+        ground, low, high, depth = (_integral_to(height, wind, cumulative, location, level)
+                                    for location, level in zip(locations, levels))
+        mean[name] = (depth - ground) / BUNKERS_DEPTH
+        shear[name] = (depth - high - (low - ground)) / BUNKERS_SHEAR_LAYER
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = BUNKERS_DEVIATION_MS / np.hypot(shear["u"], shear["v"])
+    return {
+        "rm_u": mean["u"] + scale * shear["v"],
+        "rm_v": mean["v"] - scale * shear["u"],
+        "lm_u": mean["u"] - scale * shear["v"],
+        "lm_v": mean["v"] + scale * shear["u"],
+        "mean_u": mean["u"],
+        "mean_v": mean["v"],
+        "shear_u": shear["u"],
+        "shear_v": shear["v"],
+    }
+
+@span("hodograph.srh")
+def storm_relative_helicity(pressure, speed, direction, height=None, temperature=None, layers=DEFAULT_SRH_LAYERS):
+    """
+    Storm-relative helicity over height layers for many profiles of any resolution.
+
+    Pressure is converted to height (unless heights are given), the Bunkers right-mover is
+    computed from height-weighted layer means, and SRH relative to it is summed level by
+    level. Between two levels the wind is linear in height, which makes the running SRH
+    sum linear there too, so the SRH of any layer is read off exactly by interpolating that
+    cumulative sum at the layer bounds. Everything is O(levels) per profile, in a few
+    whole-array passes.
+
+    Unlike hodograph_parameters, which keeps create.py's flipped rotation, the right mover
+    here is to the right of the shear vector (clockwise), the standard Bunkers convention,
+    and SRH is relative to that right mover.
+
+    Profiles may have different numbers of levels: pad the top of shorter ones with NaN.
+    Layers a profile doesn't reach come back as NaN.
+
+    Parameters:
+        pressure (numpy.ndarray): Pressure in hPa, (levels,) shared or (N, levels), surface first.
+        speed (numpy.ndarray): Wind speed in knots, (N, levels).
+        direction (numpy.ndarray): Wind direction in degrees, (N, levels).
+        height (numpy.ndarray, optional): Heights in meters; used instead of converting pressure.
+        temperature (numpy.ndarray, optional): Temperature in degrees C for the hypsometric conversion.
+        layers (sequence): (bottom, top) pairs in meters above ground.
+
+    Returns:
+        dict: srh_<bottom>_<top>km for every layer (m^2/s^2), plus the Bunkers motion,
+            0-6 km mean wind and shear (knots), one value per profile.
+    """
+    speed = np.atleast_2d(np.asarray(speed, dtype=np.float64))
+    direction = np.atleast_2d(np.asarray(direction, dtype=np.float64))
+    if height is None:
+        height = pressure_to_height(pressure, temperature)
+    height = np.broadcast_to(np.asarray(height, dtype=np.float64), speed.shape)
+    u, v = wind_components(speed * KNOTS_TO_MS, direction)
+    motion = bunkers_motion(height, u, v)
+
+    # Running SRH sum: per segment (u[k+1] - cx)(v[k] - cy) - (u[k] - cx)(v[k+1] - cy)
+    u -= motion["rm_u"][:, None]
+    v -= motion["rm_v"][:, None]
+    cumulative = np.zeros_like(u)
+    np.cumsum(u[:, 1:] * v[:, :-1] - u[:, :-1] * v[:, 1:], axis=1, out=cumulative[:, 1:])
+
+    results = {}
+    for bottom, top in layers:
+        srh = _interpolate(cumulative, _locate(height, top)) - _interpolate(cumulative, _locate(height, bottom))
+        results[f"srh_{bottom / 1000:g}_{top / 1000:g}km"] = srh
+    for name, value in motion.items():
+        results[name] = value / KNOTS_TO_MS
+    return results
+
+def reference_srh(height, speed, direction, storm_u, storm_v, top):
+    """
+    metpy.calc.storm_relative_helicity for one profile, for checking storm_relative_helicity.
+
+    Returns:
+        float: Total SRH in m^2/s^2 from the ground to `top` meters, relative to (storm_u, storm_v) knots.
+    """
+    import metpy.calc as mpcalc
+    from metpy.units import units
+    u, v = mpcalc.wind_components(np.asarray(speed) * units.knots, np.asarray(direction) * units.degrees)
+    _, _, total = mpcalc.storm_relative_helicity(np.asarray(height) * units.meter, u, v, top * units.meter,
+                                                 storm_u=storm_u * units.knots, storm_v=storm_v * units.knots)
+    return float(total.to("m^2/s^2").magnitude)
+
+# Optional per-level inputs of the height-based mode, read when a file has them
+OPTIONAL_FIELDS = ("height", "temperature")
+
+def _load_npz(path):
+    with np.load(path) as data:
+        speed = data["speed"]
+        profiles = {name: np.broadcast_to(data[name], speed.shape).astype(np.float64)
+                    for name in ("pressure", "direction") + OPTIONAL_FIELDS if name in data}
+        profiles["speed"] = speed.astype(np.float64)
+        ids = data["ids"].astype(str) if "ids" in data else None
+    if ids is None:
+        name = os.path.splitext(os.path.basename(path))[0]
+        ids = np.array([f"{name}:{index}" for index in range(len(speed))])
+    profiles["ids"] = ids
+    return profiles
+
+def _load_csv(path):
+    # Long format, one row per level: sounding_id,pressure,speed,direction[,height][,temperature]
+    import pandas as pd
+    df = pd.read_csv(path, dtype={"sounding_id": str})
+    missing = {"sounding_id", "pressure", "speed", "direction"} - set(df.columns)
+    if missing:
+        raise ValueError(f"{path} is missing column(s): {', '.join(sorted(missing))}")
+    codes, ids = pd.factorize(df["sounding_id"])
+    counts = np.bincount(codes)
+    # Group by sounding (in file order), surface (highest pressure) first within each one;
+    # soundings with fewer levels are padded with NaN at the top
+    order = np.lexsort((-df["pressure"].to_numpy(), codes))
+    rows = codes[order]
+    positions = np.arange(len(rows)) - np.concatenate(([0], np.cumsum(counts)[:-1]))[rows]
+    profiles = {"ids": np.asarray(ids, dtype=str)}
+    for name in ("pressure", "speed", "direction") + OPTIONAL_FIELDS:
+        if name in df.columns:
+            profiles[name] = np.full((len(ids), counts.max()), np.nan)
+            profiles[name][rows, positions] = df[name].to_numpy(dtype=np.float64)[order]
+    return profiles
+
+def _pad(array, levels):
+    if array.shape[1] == levels:
+        return array
+    return np.pad(array, ((0, 0), (0, levels - array.shape[1])), constant_values=np.nan)
+
+def load_profiles(path):
+    """
+    Read soundings from a file or from every .npz/.csv file in a directory.
+
+    .npz files hold `pressure` (levels,) or (N, levels), `speed` and `direction` (N, levels),
+    and optionally `height` (m), `temperature` (degrees C) and `ids` (N,). .csv files are
+    long format with the columns sounding_id, pressure, speed, direction (hPa, knots,
+    degrees) and optionally height and temperature, one row per level. Soundings with
+    fewer levels than the longest one are padded with NaN at the top.
+
+    Returns:
+        dict: ids (N,), pressure, speed, direction and any optional field present in every
+            file, each N x levels.
+    """
+    if os.path.isdir(path):
+        paths = sorted(glob.glob(os.path.join(path, "*.npz")) + glob.glob(os.path.join(path, "*.csv")))
+        if not paths:
+            raise ValueError(f"no .npz or .csv soundings in {path}")
+    else:
+        paths = [path]
+    parts = [_load_npz(p) if p.endswith(".npz") else _load_csv(p) for p in paths]
+    levels = max(part["speed"].shape[1] for part in parts)
+    names = set.intersection(*(set(part) for part in parts))
+    profiles = {"ids": np.concatenate([part["ids"] for part in parts])}
+    for name in ("pressure", "speed", "direction") + OPTIONAL_FIELDS:
+        if name in names:
+            profiles[name] = np.concatenate([_pad(part[name], levels) for part in parts])
+    return profiles
+
+def load_soundings(path):
+    """
+    Read soundings for hodograph_parameters (see load_profiles for the file formats).
+
+    Returns:
+        tuple: (ids, pressure, speed, direction), each stacked to N x levels (ids is N).
+    """
+    profiles = load_profiles(path)
+    return profiles["ids"], profiles["pressure"], profiles["speed"], profiles["direction"]
+
+def write_results(path, ids, results):
+    """
+    Write one row per sounding to a .csv or .npz file.
+    """
+    if path.endswith(".npz"):
+        np.savez(path, ids=ids, **results)
+        return
+    import pandas as pd
+    df = pd.DataFrame(results)
+    df.insert(0, "sounding_id", ids)
+    df.to_csv(path, index=False, float_format="%.6g")
+
+def synthetic_soundings(count, levels=(1000, 850, 600, 350, 150), seed=0):
+    """
+    Random but plausible soundings (winds veering and strengthening with height) for benchmarks.
+    """
+    rng = np.random.default_rng(seed)
+    pressure = np.array(levels, dtype=np.float64)
+    height_fraction = np.linspace(0, 1, len(pressure))
+    speed = rng.uniform(5, 25, (count, 1)) + rng.uniform(10, 80, (count, 1)) * height_fraction + rng.normal(0, 3, (count, len(pressure)))
+    direction = (rng.uniform(90, 220, (count, 1)) + rng.uniform(0, 120, (count, 1)) * height_fraction) % 360
+    return pressure, np.abs(speed), direction
+
+def dense_levels(levels, bottom=1000.0, top=100.0):
+    """
+    `levels` pressure levels evenly spaced from bottom to top hPa, like a model or radiosonde profile.
+    """
+    return np.linspace(bottom, top, levels)
+
+def benchmark(count=100000, check=20):
+    """
+    Time the vectorized engine on `count` synthetic soundings and compare it with the
+    MetPy path, both for speed (extrapolated from `check` soundings) and for the values.
+
+    Returns:
+        dict: soundings, seconds, soundings_per_second, reference_seconds_estimate, max_abs_difference
+    """
+    pressure, speed, direction = synthetic_soundings(count)
+    started = time.perf_counter()
+    results = hodograph_parameters(pressure, speed, direction)
+    seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    difference = 0.0
+    for index in range(min(check, count)):
+        reference = reference_parameters(pressure, speed[index], direction[index])
+        difference = max(difference, max(abs(reference[name] - results[name][index]) for name in PARAMETERS))
+    reference_seconds = (time.perf_counter() - started) / min(check, count) * count
+    return {"soundings": count, "seconds": seconds, "soundings_per_second": count / seconds,
+            "reference_seconds_estimate": reference_seconds, "max_abs_difference": difference}
+
+def benchmark_srh(count=10000, levels=300, check=5):
+    """
+    Time storm_relative_helicity on `count` dense synthetic profiles and check its SRH against
+    metpy.calc.storm_relative_helicity (same heights and storm motion) on `check` of them.
+
+    Returns:
+        dict: profiles, levels, seconds, profiles_per_second, reference_seconds_estimate, max_abs_difference
+    """
+    pressure, speed, direction = synthetic_soundings(count, dense_levels(levels))
+    started = time.perf_counter()
+    results = storm_relative_helicity(pressure, speed, direction)
+    seconds = time.perf_counter() - started
+    height = pressure_to_height(pressure)
+    started = time.perf_counter()
+    difference = 0.0
+    for index in range(min(check, count)):
+        for bottom, top in DEFAULT_SRH_LAYERS:
+            reference = reference_srh(height, speed[index], direction[index],
+                                      results["rm_u"][index], results["rm_v"][index], top)
+            key = f"srh_{bottom / 1000:g}_{top / 1000:g}km"
+            difference = max(difference, abs(reference - results[key][index]))
+    reference_seconds = (time.perf_counter() - started) / min(check, count) * count
+    return {"profiles": count, "levels": levels, "seconds": seconds, "profiles_per_second": count / seconds,
+            "reference_seconds_estimate": reference_seconds, "max_abs_difference": difference}
+
+def parse_layers(text):
+    """
+    Parse SRH layers like '0-1000,0-3000' (meters above ground).
+    """
+    layers = []
+    for part in text.split(","):
+        bottom, _, top = part.partition("-")
+        bottom, top = float(bottom), float(top)
+        if not 0 <= bottom < top:
+            raise ValueError(f"invalid layer '{part}', expected BOTTOM-TOP in meters")
+        layers.append((bottom, top))
+    return layers
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch hodograph parameters (helicity, shear, Bunkers motion) for many soundings.")
+    parser.add_argument("input", nargs="?", help="Soundings file (.npz/.csv) or a directory of them")
+    parser.add_argument("-o", "--output", default="hodograph_parameters.csv", help="Results file, .csv or .npz (default: %(default)s)")
+    parser.add_argument("--mode", choices=("pressure", "height"), default="pressure",
+                        help="'pressure': the Custom Hodograph Creator numbers; 'height': SRH over height layers "
+                             "with height-based Bunkers motion (default: %(default)s)")
+    parser.add_argument("--layers", default="0-1000,0-3000", help="SRH layers in meters for --mode height (default: %(default)s)")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Time N synthetic soundings instead of reading input")
+    parser.add_argument("--levels", type=int, default=300, help="Levels per synthetic profile for --mode height --benchmark (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if args.benchmark and args.mode == "height":
+        result = benchmark_srh(args.benchmark, args.levels)
+        print(f"{result['profiles']} profiles x {result['levels']} levels in {result['seconds']:.3f} s "
+              f"({result['profiles_per_second']:,.0f}/s); MetPy one at a time: ~{result['reference_seconds_estimate']:.0f} s; "
+              f"max SRH difference {result['max_abs_difference']:.2e} m^2/s^2")
+        return
+    if args.benchmark:
+        result = benchmark(args.benchmark)
+        print(f"{result['soundings']} soundings in {result['seconds']:.3f} s "
+              f"({result['soundings_per_second']:,.0f}/s); MetPy one at a time: ~{result['reference_seconds_estimate']:.0f} s; "
+              f"max difference {result['max_abs_difference']:.2e}")
+        return
+    if not args.input:
+        parser.error("an input file or directory is required (or use --benchmark N)")
+    started = time.perf_counter()
+    profiles = load_profiles(args.input)
+    if args.mode == "height":
+        results = storm_relative_helicity(profiles["pressure"], profiles["speed"], profiles["direction"],
+                                          profiles.get("height"), profiles.get("temperature"), parse_layers(args.layers))
+    else:
+        results = hodograph_parameters(profiles["pressure"], profiles["speed"], profiles["direction"])
+    write_results(args.output, profiles["ids"], results)
+    print(f"{len(profiles['ids'])} soundings processed in {time.perf_counter() - started:.2f} s, results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
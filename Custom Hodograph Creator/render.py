@@ -0,0 +1,184 @@
+import argparse
+import os
+import sys
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from metpy.plots import Hodograph
+
+if __name__ == "__main__":
+    # Started as a script from this folder: the shared tempestpy package is one directory up
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from hodocalc import hodograph_parameters, load_soundings, synthetic_soundings, wind_components
+from tempestpy.blit import BlitRenderer, compare_with_fresh, print_comparison, render_all
+
+# Same plot range and grid as create.py, fixed so the background never has to be redrawn
+COMPONENT_RANGE = 100
+GRID_INCREMENT = 20
+
+class HodographRenderer(BlitRenderer):
+    """
+    Headless hodograph renderer that reuses one figure for any number of soundings.
+
+    The axes, range rings and legend are the cached background (see tempestpy.blit.BlitRenderer);
+    for each sounding only the wind profile, storm motions and the helicity/shear annotations
+    are drawn on top of it.
+    """
+
+    trace_name = "hodograph"
+
+    def __init__(self, figsize=(6, 6), dpi=100):
+        super().__init__(plt.figure(figsize=figsize, dpi=dpi))
+        ax = self.ax = self.fig.add_subplot(1, 1, 1)
+        hod = Hodograph(ax, component_range=COMPONENT_RANGE)
+        hod.add_grid(increment=GRID_INCREMENT)
+        ax.set_autoscale_on(False)
+
+        # Data layers: created once, animated so a normal draw leaves them out of the background
+        empty = ([], [])
+        self.profile_line, = hod.plot(*empty, marker='o', linestyle='-', color='b', label="Wind Profile", animated=True)
+        # Scatter markers in create.py; drawn here as line markers of the same size (6 pt plus a
+        # 1.5 pt edge), which Agg draws much faster than a path collection
+        points = {"marker": 'o', "linestyle": 'none', "markersize": 6, "markeredgewidth": 1.5, "animated": True}
+        self.points, = ax.plot(*empty, color='b', label="Wind Data", **points)
+        self.rm_line, = ax.plot(*empty, 'r-', label='Right-Moving (RM)', animated=True)
+        self.lm_line, = ax.plot(*empty, 'g-', label='Left-Moving (LM)', animated=True)
+        self.rm_point, = ax.plot(*empty, color='r', zorder=3, **points)
+        self.lm_point, = ax.plot(*empty, color='g', zorder=3, **points)
+        self.rm_label = ax.text(0, 0, 'RM', color='r', fontsize=12, fontweight='bold', ha='left', animated=True)
+        self.lm_label = ax.text(0, 0, 'LM', color='g', fontsize=12, fontweight='bold', ha='right', animated=True)
+        ax.legend()
+        self.title = ax.set_title("", animated=True)
+        # The units are part of the background; the values are drawn right-aligned against them
+        helicity_units = ax.text(0.95, 0.05, " m²/s²", transform=ax.transAxes, fontsize=12, ha='right', color='red')
+        shear_units = ax.text(0.95, 0.08, " kts", transform=ax.transAxes, fontsize=12, ha='right', color='green')
+        self.canvas.draw()
+        to_axes = ax.transAxes.inverted()
+        def value_text(units_text):
+            left = to_axes.transform(units_text.get_window_extent().get_points())[0][0]
+            return ax.text(left, units_text.get_position()[1], "", transform=ax.transAxes, fontsize=12, ha='right',
+                           color=units_text.get_color(), animated=True)
+        self.helicity_text = value_text(helicity_units)
+        self.shear_text = value_text(shear_units)
+        self.capture_background()
+
+    def _data_artists(self):
+        return [self.profile_line, self.points, self.rm_line, self.lm_line, self.rm_point, self.lm_point, self.rm_label,
+                self.lm_label, self.helicity_text, self.shear_text, self.title]
+
+    def update(self, name, u, v, params):
+        """
+        Point the data layers at a new sounding.
+
+        Parameters:
+            name (str): Hodograph title.
+            u, v (array-like): Wind components in knots, surface first.
+            params (dict): hodograph_parameters values for this sounding (scalars).
+        """
+        u = np.asarray(u, dtype=np.float64)
+        v = np.asarray(v, dtype=np.float64)
+        self.profile_line.set_data(u, v)
+        self.points.set_data(u, v)
+        mean = (params["mean_u"], params["mean_v"])
+        rm = (params["rm_u"], params["rm_v"])
+        lm = (params["lm_u"], params["lm_v"])
+        self.rm_line.set_data([mean[0], rm[0]], [mean[1], rm[1]])
+        self.lm_line.set_data([mean[0], lm[0]], [mean[1], lm[1]])
+        self.rm_point.set_data([rm[0]], [rm[1]])
+        self.lm_point.set_data([lm[0]], [lm[1]])
+        self.rm_label.set_position(rm)
+        self.lm_label.set_position(lm)
+        self.helicity_text.set_text(f"Helicity: {params['helicity']:.2f}")
+        self.shear_text.set_text(f"Wind Shear: {params['shear_mag']:.2f}")
+        self.title.set_text(name)
+
+def _sounding_params(params, index):
+    return {name: float(values[index]) for name, values in params.items()}
+
+def render_fresh(path, name, u, v, params):
+    """
+    The create.py way of drawing: a new figure and grid for every sounding.
+    Kept for the benchmark; with path=None the figure is only drawn, not saved.
+    """
+    fig, ax = plt.subplots(figsize=(6, 6))
+    hod = Hodograph(ax, component_range=COMPONENT_RANGE)
+    hod.add_grid(increment=GRID_INCREMENT)
+    hod.plot(u, v, marker='o', linestyle='-', color='b', label="Wind Profile")
+    ax.scatter(u, v, color='b', label="Wind Data", picker=True)
+    mean_u, mean_v = params["mean_u"], params["mean_v"]
+    rm_u, rm_v, lm_u, lm_v = params["rm_u"], params["rm_v"], params["lm_u"], params["lm_v"]
+    ax.plot([mean_u, rm_u], [mean_v, rm_v], 'r-', label='Right-Moving (RM)')
+    ax.plot([mean_u, lm_u], [mean_v, lm_v], 'g-', label='Left-Moving (LM)')
+    ax.scatter([rm_u, lm_u], [rm_v, lm_v], color=['r', 'g'], zorder=3)
+    ax.text(rm_u, rm_v, 'RM', color='r', fontsize=12, fontweight='bold', ha='left')
+    ax.text(lm_u, lm_v, 'LM', color='g', fontsize=12, fontweight='bold', ha='right')
+    ax.text(0.95, 0.05, f"Helicity: {params['helicity']:.2f} m²/s²", transform=ax.transAxes, fontsize=12, ha='right', color='red')
+    ax.text(0.95, 0.08, f"Wind Shear: {params['shear_mag']:.2f} kts", transform=ax.transAxes, fontsize=12, ha='right', color='green')
+    plt.legend()
+    plt.title(name)
+    if path is None:
+        FigureCanvasAgg(fig).draw()
+    else:
+        fig.savefig(path)
+    plt.close(fig)
+
+def render_batch(ids, pressure, speed, direction, out_dir, file_format="png"):
+    """
+    Render every sounding to out_dir/<sounding id>.<format> with one reused figure.
+
+    Parameters are computed for all soundings at once with hodograph_parameters; the
+    images are written by tempestpy.blit.render_all.
+
+    Returns:
+        dict: rendered, failed, seconds
+    """
+    params = hodograph_parameters(pressure, speed, direction)
+    u, v = wind_components(np.atleast_2d(speed), np.atleast_2d(direction))
+    renderer = HodographRenderer()
+    def update(sounding_id, index):
+        renderer.update(str(sounding_id), u[index], v[index], _sounding_params(params, index))
+    try:
+        return render_all(renderer, ((sounding_id, index) for index, sounding_id in enumerate(ids)), update,
+                          out_dir, file_format, default_name="hodograph")
+    finally:
+        renderer.close()
+
+def benchmark(count=50, out_dir="render_benchmark"):
+    """
+    Fresh figures (the create.py way) vs the reused, blitted figure on synthetic soundings.
+
+    Returns:
+        dict: tempestpy.blit.compare_with_fresh times per sounding and speedups.
+    """
+    pressure, speed, direction = synthetic_soundings(count)
+    params = hodograph_parameters(pressure, speed, direction)
+    u, v = wind_components(speed, direction)
+    soundings = [(f"synthetic:{index}", u[index], v[index], _sounding_params(params, index)) for index in range(count)]
+    renderer = HodographRenderer()
+    try:
+        return compare_with_fresh(soundings, render_fresh, renderer, out_dir, default_name="hodograph")
+    finally:
+        renderer.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render many hodographs headlessly (PNG or SVG).")
+    parser.add_argument("input", nargs="?", help="Soundings file (.npz/.csv) or a directory of them, as for hodocalc.py")
+    parser.add_argument("-o", "--out-dir", default="hodograph_images", help="Output directory (default: %(default)s)")
+    parser.add_argument("--format", choices=("png", "svg"), default="png", help="Image format (default: %(default)s)")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Compare fresh figures with the reused figure on N synthetic soundings")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        print_comparison(benchmark(args.benchmark, args.out_dir), "hodograph")
+        return
+    if not args.input:
+        parser.error("an input file or directory is required (or use --benchmark N)")
+    ids, pressure, speed, direction = load_soundings(args.input)
+    stats = render_batch(ids, pressure, speed, direction, args.out_dir, args.format)
+    print(f"{stats['rendered']} hodograph(s) written to {args.out_dir} in {stats['seconds']:.2f} s, {stats['failed']} failed")
+
+if __name__ == "__main__":
+    main()
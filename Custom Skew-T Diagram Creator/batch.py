@@ -0,0 +1,298 @@
+import argparse
+import csv
+import glob
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+if __name__ == "__main__":
+    # Started as a script from this folder: the shared tempestpy package is one directory up
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from thermo import RESULT_FIELDS, thermo_parameters
+from thermocache import DEFAULT_CACHE_PATH, ThermoCache
+
+OUTPUT_FIELDS = ["sounding_id"] + RESULT_FIELDS + ["error"]
+# Result cache of the current process (each pool worker opens its own connection)
+_cache = None
+
+# Optional per-level wind, read when iter_soundings is asked for it
+WIND_FIELDS = ("speed", "direction")
+
+def _read_npz(path, winds=False):
+    # pressure (levels,) or (N, levels), temperature and dewpoint (N, levels), optional ids (N,)
+    with np.load(path) as data:
+        temperature = np.atleast_2d(data["temperature"])
+        dewpoint = np.atleast_2d(data["dewpoint"])
+        pressure = np.broadcast_to(data["pressure"], temperature.shape)
+        ids = data["ids"].astype(str) if "ids" in data else None
+        wind = [np.broadcast_to(data[name], temperature.shape) if name in data else None for name in WIND_FIELDS]
+    name = os.path.splitext(os.path.basename(path))[0]
+    for index in range(len(temperature)):
+        sounding_id = ids[index] if ids is not None else f"{name}:{index}"
+        sounding = (sounding_id, pressure[index], temperature[index], dewpoint[index])
+        yield sounding + tuple(None if field is None else field[index] for field in wind) if winds else sounding
+
+def _read_csv(path, winds=False):
+    # Long format, one row per level: sounding_id,pressure,temperature,dewpoint[,speed,direction]
+    import pandas as pd
+    df = pd.read_csv(path, dtype={"sounding_id": str})
+    missing = {"sounding_id", "pressure", "temperature", "dewpoint"} - set(df.columns)
+    if missing:
+        raise ValueError(f"{path} is missing column(s): {', '.join(sorted(missing))}")
+    for sounding_id, group in df.groupby("sounding_id", sort=False):
+        group = group.sort_values("pressure", ascending=False)
+        sounding = (sounding_id, group["pressure"].to_numpy(dtype=np.float64),
+                    group["temperature"].to_numpy(dtype=np.float64), group["dewpoint"].to_numpy(dtype=np.float64))
+        if winds:
+            sounding += tuple(group[name].to_numpy(dtype=np.float64) if name in df.columns else None
+                              for name in WIND_FIELDS)
+        yield sounding
+
+def iter_soundings(path, winds=False):
+    """
+    Read soundings one at a time from a file or from every .npz/.csv file in a directory.
+
+    .npz files hold `pressure` (hPa), `temperature` and `dewpoint` (degrees C) and optionally
+    `ids`; .csv files are long format with the columns sounding_id, pressure, temperature,
+    dewpoint, one row per level. Either may also have wind `speed` (knots) and `direction`
+    (degrees), which are only read with winds=True.
+
+    Yields:
+        tuple: (sounding id, pressure, temperature, dewpoint), plus (speed, direction) with
+            winds=True (None where the file has no wind).
+    """
+    if os.path.isdir(path):
+        paths = sorted(glob.glob(os.path.join(path, "*.npz")) + glob.glob(os.path.join(path, "*.csv")))
+        if not paths:
+            raise ValueError(f"no .npz or .csv soundings in {path}")
+    else:
+        paths = [path]
+    for file_path in paths:
+        yield from (_read_npz(file_path, winds) if file_path.endswith(".npz") else _read_csv(file_path, winds))
+
+def _open_cache(cache_path):
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = ThermoCache(cache_path) if cache_path else None
+
+def _process_chunk(chunk):
+    # Runs in a worker process. One bad sounding only fails its own row.
+    rows = []
+    for sounding_id, pressure, temperature, dewpoint in chunk:
+        hits = _cache.hits if _cache is not None else 0
+        try:
+            result = thermo_parameters(pressure, temperature, dewpoint, cache=_cache)
+            row = {name: result[name] for name in RESULT_FIELDS}
+            row["error"] = ""
+        except Exception as e:
+            row = dict.fromkeys(RESULT_FIELDS, float("nan"))
+            row["error"] = f"{type(e).__name__}: {e}"
+        row["sounding_id"] = sounding_id
+        row["cached"] = _cache is not None and _cache.hits > hits
+        rows.append(row)
+    return rows
+
+def _chunks(soundings, size):
+    chunk = []
+    for sounding in soundings:
+        chunk.append(sounding)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _failed_chunk(chunk, error):
+    return [dict(dict.fromkeys(RESULT_FIELDS, float("nan")), sounding_id=sounding[0],
+                 error=f"{type(error).__name__}: {error}", cached=False) for sounding in chunk]
+
+def process_soundings(soundings, workers=None, chunk_size=8, cache_path=None):
+    """
+    Compute thermo_parameters for a stream of soundings on a process pool.
+
+    Soundings are sent to the workers in small chunks to keep inter-process overhead down.
+    At most 2 x workers chunks are in flight at once, so memory stays bounded however
+    long the input is. Results come back in input order.
+
+    Parameters:
+        soundings (iterable): (sounding id, pressure, temperature, dewpoint) tuples, e.g. from iter_soundings.
+        workers (int, optional): Worker processes, defaults to every core. 1 runs in this process.
+        chunk_size (int): Soundings per task.
+        cache_path (str, optional): ThermoCache file shared by the workers; soundings found
+            there skip the solver.
+
+    Yields:
+        dict: One row per sounding with the OUTPUT_FIELDS keys plus `cached`; `error` is
+            empty on success.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _open_cache(cache_path)
+        try:
+            for chunk in _chunks(soundings, chunk_size):
+                yield from _process_chunk(chunk)
+        finally:
+            _open_cache(None)
+        return
+    pool_args = {"max_workers": workers, "initializer": _open_cache, "initargs": (cache_path,)}
+    executor = ProcessPoolExecutor(**pool_args)
+    pending = deque()
+    try:
+        for chunk in _chunks(soundings, chunk_size):
+            pending.append((chunk, executor.submit(_process_chunk, chunk)))
+            while len(pending) >= 2 * workers:
+                executor = yield from _drain_one(pending, executor, pool_args)
+        while pending:
+            executor = yield from _drain_one(pending, executor, pool_args)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+def _drain_one(pending, executor, pool_args):
+    chunk, future = pending.popleft()
+    try:
+        yield from future.result()
+    except BrokenProcessPool as e:
+        # A worker died outright (e.g. killed for memory): its chunk and the ones queued with
+        # it are reported as failed and the rest of the input goes to a fresh pool
+        yield from _failed_chunk(chunk, e)
+        for queued_chunk, _ in pending:
+            yield from _failed_chunk(queued_chunk, e)
+        pending.clear()
+        executor.shutdown(cancel_futures=True)
+        executor = ProcessPoolExecutor(**pool_args)
+    return executor
+
+class ResultWriter:
+    """
+    Streams result rows to a .csv file, or to a .parquet file (needs pyarrow) in row groups.
+    """
+
+    def __init__(self, path, rows_per_group=1000):
+        self.path = path
+        self.rows_per_group = rows_per_group
+        self._buffer = []
+        self._parquet = None
+        if path.endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            self._schema = pa.schema([("sounding_id", pa.string())] + [(name, pa.float64()) for name in RESULT_FIELDS]
+                                     + [("error", pa.string())])
+            self._parquet = pq.ParquetWriter(path, self._schema)
+        else:
+            self._file = open(path, "w", newline="")
+            self._csv = csv.DictWriter(self._file, fieldnames=OUTPUT_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, row):
+        if self._parquet is None:
+            self._csv.writerow(row)
+            return
+        self._buffer.append(row)
+        if len(self._buffer) >= self.rows_per_group:
+            self._flush()
+
+    def _flush(self):
+        import pyarrow as pa
+        if self._buffer:
+            self._parquet.write_table(pa.Table.from_pylist(self._buffer, schema=self._schema))
+            self._buffer = []
+
+    def close(self):
+        if self._parquet is None:
+            self._file.close()
+        else:
+            self._flush()
+            self._parquet.close()
+
+def run_batch(input_path, output_path, workers=None, chunk_size=8, cache_path=DEFAULT_CACHE_PATH):
+    """
+    Process every sounding under input_path and write one result row each to output_path.
+
+    Returns:
+        dict: soundings, errors, cache_hits, cache_misses, seconds, soundings_per_second
+    """
+    started = time.perf_counter()
+    count = errors = hits = 0
+    writer = ResultWriter(output_path)
+    try:
+        for row in process_soundings(iter_soundings(input_path), workers, chunk_size, cache_path):
+            writer.write(row)
+            count += 1
+            errors += bool(row["error"])
+            hits += row["cached"]
+    finally:
+        writer.close()
+    seconds = time.perf_counter() - started
+    return {"soundings": count, "errors": errors, "cache_hits": hits,
+            "cache_misses": count - hits if cache_path else 0, "seconds": seconds,
+            "soundings_per_second": count / seconds if seconds else 0.0}
+
+def synthetic_soundings(count, levels=20, seed=0):
+    """
+    Random but plausible soundings (warm, moist surface, cooling and drying aloft) for benchmarks.
+
+    Yields:
+        tuple: (sounding id, pressure, temperature, dewpoint)
+    """
+    rng = np.random.default_rng(seed)
+    pressure = np.linspace(1000, 150, levels)
+    fraction = np.linspace(0, 1, levels)
+    for index in range(count):
+        surface = rng.uniform(15, 35)
+        temperature = surface - rng.uniform(75, 95) * fraction ** 1.1 + rng.normal(0, 0.5, levels)
+        dewpoint = temperature - rng.uniform(1, 8) - rng.uniform(10, 30) * fraction
+        yield f"synthetic:{index}", pressure, temperature, dewpoint
+
+def benchmark(count=200, levels=20, worker_counts=None):
+    """
+    Soundings per second for each number of worker processes.
+
+    Returns:
+        list: dicts with workers, seconds and soundings_per_second
+    """
+    if worker_counts is None:
+        cores = os.cpu_count() or 1
+        worker_counts = sorted({1, cores} | {n for n in (2, 4, 8, 16, 32) if n < cores})
+    results = []
+    for workers in worker_counts:
+        started = time.perf_counter()
+        for _ in process_soundings(synthetic_soundings(count, levels), workers):
+            pass
+        seconds = time.perf_counter() - started
+        results.append({"workers": workers, "seconds": seconds, "soundings_per_second": count / seconds})
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch CAPE/CIN/LCL/LFC for many soundings on all cores.")
+    parser.add_argument("input", nargs="?", help="Soundings file (.npz/.csv) or a directory of them")
+    parser.add_argument("-o", "--output", default="skewt_parameters.csv", help="Results file, .csv or .parquet (default: %(default)s)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=8, help="Soundings per task sent to a worker (default: %(default)s)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="Thermodynamics result cache file (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="Always run the solver, don't read or fill the cache")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Time N synthetic soundings at several core counts instead of reading input")
+    parser.add_argument("--levels", type=int, default=20, help="Levels per synthetic sounding for --benchmark (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        print(f"{args.benchmark} synthetic soundings, {args.levels} levels, {os.cpu_count()} core(s)")
+        worker_counts = [args.workers] if args.workers else None
+        for result in benchmark(args.benchmark, args.levels, worker_counts):
+            print(f"{result['workers']:>3} worker(s): {result['soundings_per_second']:8.1f} soundings/s ({result['seconds']:.2f} s)")
+        return
+    if not args.input:
+        parser.error("an input file or directory is required (or use --benchmark N)")
+    stats = run_batch(args.input, args.output, args.workers, args.chunk_size, None if args.no_cache else args.cache)
+    print(f"{stats['soundings']} soundings in {stats['seconds']:.2f} s ({stats['soundings_per_second']:.1f}/s), "
+          f"{stats['errors']} failed; results written to {args.output}")
+    if not args.no_cache:
+        print(f"Cache: {stats['cache_hits']} hit(s), {stats['cache_misses']} miss(es)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import argparse
+import os
+import sys
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from metpy.plots import SkewT
+from metpy.units import units
+
+if __name__ == "__main__":
+    # Started as a script from this folder: the shared tempestpy package is one directory up
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from batch import iter_soundings, synthetic_soundings
+from thermo import thermo_parameters
+from thermocache import DEFAULT_CACHE_PATH, ThermoCache
+from tempestpy.blit import BlitRenderer, compare_with_fresh, print_comparison, render_all
+from tempestpy.wind import wind_components
+
+# Fixed axes so the background never has to be redrawn (MetPy's SkewT defaults)
+PRESSURE_LIMITS = (1050, 100)
+TEMPERATURE_LIMITS = (-40, 50)
+
+class SkewTRenderer(BlitRenderer):
+    """
+    Headless Skew-T renderer that reuses one figure for any number of soundings.
+
+    The axes, dry/moist adiabats, mixing lines and legend are the cached background (see
+    tempestpy.blit.BlitRenderer). For each sounding only the data layers (temperature, dew
+    point, parcel ascent, LCL/LFC markers, barbs and the text annotations) are drawn on top
+    of it, which skips the adiabat computation and the full figure redraw that creating a
+    new figure costs every time.
+    """
+
+    trace_name = "skewt"
+
+    def __init__(self, figsize=(8, 10), dpi=100):
+        super().__init__(plt.figure(figsize=figsize, dpi=dpi))
+        self.skew = SkewT(self.fig, rotation=45)
+        ax = self.skew.ax
+        ax.set_ylim(*PRESSURE_LIMITS)
+        ax.set_xlim(*TEMPERATURE_LIMITS)
+        ax.set_autoscale_on(False)
+        ax.set_xlabel("Temperature (°C)")
+        ax.set_ylabel("Pressure (hPa)")
+        self.skew.plot_dry_adiabats()
+        self.skew.plot_moist_adiabats()
+        self.skew.plot_mixing_lines()
+        ax.grid(True)
+
+        # Data layers: created once, animated so a normal draw leaves them out of the background
+        empty = ([], [])
+        self.temperature_line, = ax.plot(*empty, 'r', linewidth=2, label="Temperature", animated=True)
+        self.dewpoint_line, = ax.plot(*empty, 'g', linewidth=2, label="Dew Point", animated=True)
+        self.parcel_line, = ax.plot(*empty, 'k', linewidth=2, linestyle='dashed', label="Parcel Ascent", animated=True)
+        self.lcl_marker, = ax.plot(*empty, 'ko', markersize=8, label="LCL", animated=True)
+        self.lfc_marker, = ax.plot(*empty, 'bo', markersize=8, label="LFC", animated=True)
+        ax.legend(loc="best")
+        self.title = ax.set_title("", fontsize=14, animated=True)
+        # Corner annotations: the labels are part of the background and only the values are
+        # drawn per sounding, which roughly halves the glyphs rendered for each diagram
+        labels = {}
+        for key, label, y, color in (("tcon", "TCON: ", 0.98, 'black'), ("lcl", "LCL: ", 0.94, 'black'),
+                                     ("lfc", "LFC: ", 0.90, 'blue'), ("cape", "CAPE: ", 0.86, 'red'),
+                                     ("cin", "CIN: ", 0.84, 'red')):
+            labels[key] = self.fig.text(0.02, y, label, fontsize=10, color=color, ha='left', va='top')
+        self.canvas.draw()
+        to_figure = self.fig.transFigure.inverted()
+        self.texts = {}
+        for key, label in labels.items():
+            right = to_figure.transform(label.get_window_extent().get_points())[1][0]
+            self.texts[key] = self.fig.text(right, label.get_position()[1], "", fontsize=10, color=label.get_color(),
+                                            ha='left', va='top', animated=True)
+        self.barbs = None
+        self.capture_background()
+
+    def _data_artists(self):
+        artists = [self.temperature_line, self.dewpoint_line, self.parcel_line, self.lcl_marker, self.lfc_marker,
+                   self.title, *self.texts.values()]
+        return artists + ([self.barbs] if self.barbs is not None else [])
+
+    def update(self, name, pressure, temperature, dewpoint, thermo, u=None, v=None):
+        """
+        Point the data layers at a new sounding.
+
+        Parameters:
+            name (str): Diagram title.
+            pressure, temperature, dewpoint (array-like): hPa and degrees C, surface first.
+            thermo (dict): thermo_parameters result for the sounding.
+            u, v (array-like, optional): Wind components in knots for the barbs.
+        """
+        # Lines take data coordinates; the skewed transform is applied by the axes
+        self.temperature_line.set_data(temperature, pressure)
+        self.dewpoint_line.set_data(dewpoint, pressure)
+        self.parcel_line.set_data(thermo["parcel_profile"], pressure)
+        self.lcl_marker.set_data([thermo["lcl_temperature"]], [thermo["lcl_pressure"]])
+        has_lfc = not np.isnan(thermo["lfc_pressure"])
+        if has_lfc:
+            self.lfc_marker.set_data([thermo["lfc_temperature"]], [thermo["lfc_pressure"]])
+        else:
+            self.lfc_marker.set_data([], [])
+        self.title.set_text(name)
+        self.texts["tcon"].set_text(f"{temperature[0]:.1f}°C")
+        self.texts["lcl"].set_text(f"{thermo['lcl_pressure']:.1f} hPa, {thermo['lcl_temperature']:.1f}°C")
+        self.texts["lfc"].set_text(f"{thermo['lfc_pressure']:.1f} hPa, {thermo['lfc_temperature']:.1f}°C" if has_lfc else "none")
+        self.texts["cape"].set_text(f"{thermo['cape']:.2f} J/kg")
+        self.texts["cin"].set_text(f"{thermo['cin']:.2f} J/kg")
+        if self.barbs is not None:
+            self.barbs.remove()
+            self.barbs = None
+        if u is not None and v is not None:
+            self.barbs = self.skew.plot_barbs(np.asarray(pressure) * units.hPa, np.asarray(u) * units.knots,
+                                              np.asarray(v) * units.knots)
+            self.barbs.set_animated(True)
+
+def render_fresh(path, name, pressure, temperature, dewpoint, thermo):
+    """
+    The create.py way of drawing: a new figure with its own adiabats for every sounding.
+    Kept for the benchmark; with path=None the figure is only drawn, not saved.
+    """
+    fig = plt.figure(figsize=(8, 10))
+    skew = SkewT(fig, rotation=45)
+    skew.plot(pressure, temperature, 'r', linewidth=2, label="Temperature")
+    skew.plot(pressure, dewpoint, 'g', linewidth=2, label="Dew Point")
+    skew.plot(pressure, thermo["parcel_profile"], 'k', linewidth=2, linestyle='dashed', label="Parcel Ascent")
+    skew.ax.plot(thermo["lcl_temperature"], thermo["lcl_pressure"], 'ko', markersize=8, label="LCL")
+    skew.ax.plot(thermo["lfc_temperature"], thermo["lfc_pressure"], 'bo', markersize=8, label="LFC")
+    skew.plot_dry_adiabats()
+    skew.plot_moist_adiabats()
+    skew.plot_mixing_lines()
+    skew.ax.set_xlabel("Temperature (°C)")
+    skew.ax.set_ylabel("Pressure (hPa)")
+    plt.figtext(0.02, 0.98, f"TCON: {temperature[0]:.1f}°C", fontsize=10, color='black', ha='left', va='top')
+    plt.figtext(0.02, 0.94, f"LCL: {thermo['lcl_pressure']:.1f} hPa, {thermo['lcl_temperature']:.1f}°C", fontsize=10, color='black', ha='left', va='top')
+    plt.figtext(0.02, 0.90, f"LFC: {thermo['lfc_pressure']:.1f} hPa, {thermo['lfc_temperature']:.1f}°C", fontsize=10, color='blue', ha='left', va='top')
+    plt.figtext(0.02, 0.86, f"CAPE: {thermo['cape']:.2f} J/kg", fontsize=10, color='red', ha='left', va='top')
+    plt.figtext(0.02, 0.84, f"CIN: {thermo['cin']:.2f} J/kg", fontsize=10, color='red', ha='left', va='top')
+    plt.title(name, fontsize=14)
+    plt.legend(loc="best")
+    plt.grid(True)
+    if path is None:
+        FigureCanvasAgg(fig).draw()
+    else:
+        fig.savefig(path)
+    plt.close(fig)
+
+def render_batch(soundings, out_dir, file_format="png", cache_path=DEFAULT_CACHE_PATH):
+    """
+    Render every sounding to out_dir/<sounding id>.<format> with one reused figure.
+
+    Soundings are (id, pressure, temperature, dewpoint) tuples, or iter_soundings(...,
+    winds=True) tuples with wind speed (knots) and direction (degrees) added; wind barbs
+    are drawn for soundings that have both. The images are written by
+    tempestpy.blit.render_all.
+
+    Returns:
+        dict: rendered, failed, seconds
+    """
+    cache = ThermoCache(cache_path) if cache_path else None
+    renderer = SkewTRenderer()
+    def update(sounding_id, fields):
+        pressure, temperature, dewpoint, *wind = fields
+        thermo = thermo_parameters(pressure, temperature, dewpoint, cache=cache)
+        u, v = wind_components(*wind) if len(wind) == 2 and all(field is not None for field in wind) else (None, None)
+        renderer.update(str(sounding_id), pressure, temperature, dewpoint, thermo, u, v)
+    try:
+        return render_all(renderer, ((sounding[0], sounding[1:]) for sounding in soundings), update,
+                          out_dir, file_format, default_name="sounding")
+    finally:
+        renderer.close()
+        if cache is not None:
+            cache.close()
+
+def benchmark(count=50, out_dir="render_benchmark"):
+    """
+    Fresh figures (the create.py way) vs the reused, blitted figure on synthetic soundings.
+
+    The reused figure also reuses the compressed background when encoding. Thermodynamics
+    are computed up front so neither side includes the solver.
+
+    Returns:
+        dict: tempestpy.blit.compare_with_fresh times per sounding and speedups.
+    """
+    soundings = [(sounding_id, p, t, d, thermo_parameters(p, t, d)) for sounding_id, p, t, d in synthetic_soundings(count)]
+    renderer = SkewTRenderer()
+    try:
+        return compare_with_fresh(soundings, render_fresh, renderer, out_dir, default_name="sounding")
+    finally:
+        renderer.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render many Skew-T diagrams headlessly (PNG or SVG).")
+    parser.add_argument("input", nargs="?", help="Soundings file (.npz/.csv) or a directory of them, as for batch.py "
+                                                 "(with optional speed/direction for wind barbs)")
+    parser.add_argument("-o", "--out-dir", default="skewt_images", help="Output directory (default: %(default)s)")
+    parser.add_argument("--format", choices=("png", "svg"), default="png", help="Image format (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="Don't use the thermodynamics result cache")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Compare fresh figures with the reused figure on N synthetic soundings")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        print_comparison(benchmark(args.benchmark, args.out_dir), "diagram")
+        return
+    if not args.input:
+        parser.error("an input file or directory is required (or use --benchmark N)")
+    stats = render_batch(iter_soundings(args.input, winds=True), args.out_dir, args.format, None if args.no_cache else DEFAULT_CACHE_PATH)
+    print(f"{stats['rendered']} diagram(s) written to {args.out_dir} in {stats['seconds']:.2f} s, {stats['failed']} failed")
+
+if __name__ == "__main__":
+    main()
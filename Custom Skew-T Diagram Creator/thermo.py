@@ -0,0 +1,61 @@
+import warnings
+
+import numpy as np
+from metpy.calc import lcl, lfc, parcel_profile, surface_based_cape_cin
+from metpy.units import units
+
+from thermocache import sounding_key
+from tempestpy.trace import span
+
+# Scalar results of thermo_parameters, in the order batch output files use
+RESULT_FIELDS = ["lcl_pressure", "lcl_temperature", "lfc_pressure", "lfc_temperature", "cape", "cin"]
+
+def thermo_parameters(pressure, temperature, dewpoint, cache=None):
+    """
+    Surface-based parcel diagnostics for one sounding, as the Skew-T creator plots them.
+
+    Runs the same MetPy calls as create.py (parcel_profile, lcl, lfc and
+    surface_based_cape_cin) and returns plain floats, so results can be pickled between
+    processes and written to files. With a cache, a sounding that was computed before
+    (same arrays, same MetPy version) skips the solver entirely.
+
+    Parameters:
+        pressure (array-like): Pressure levels in hPa, surface first.
+        temperature (array-like): Temperature in degrees C at each level.
+        dewpoint (array-like): Dew point in degrees C at each level.
+        cache (ThermoCache, optional): Persistent result cache to read and fill.
+
+    Returns:
+        dict: lcl_pressure/lfc_pressure (hPa), lcl_temperature/lfc_temperature (degrees C),
+            cape/cin (J/kg) and parcel_profile (degrees C at each level, numpy array).
+            The LFC values are NaN when the parcel has no LFC.
+    """
+    if cache is not None:
+        with span("skewt.cache"):
+            key = sounding_key(pressure, temperature, dewpoint)
+            result = cache.get(key)
+        if result is not None:
+            return result
+    pressure = np.asarray(pressure, dtype=np.float64) * units.hPa
+    temperature = np.asarray(temperature, dtype=np.float64) * units.degC
+    dewpoint = np.asarray(dewpoint, dtype=np.float64) * units.degC
+    with span("skewt.solver", levels=len(pressure)), warnings.catch_warnings():
+        # MetPy warns on every sounding without an LFC/EL; that is a result here, not a problem
+        warnings.simplefilter("ignore")
+        parcel_prof = parcel_profile(pressure, temperature[0], dewpoint[0])
+        lcl_pressure, lcl_temperature = lcl(pressure[0], temperature[0], dewpoint[0])
+        lfc_pressure, lfc_temperature = lfc(pressure, temperature, dewpoint)
+        cape_value, cin_value = surface_based_cape_cin(pressure, temperature, dewpoint)
+    result = {
+        "lcl_pressure": float(lcl_pressure.m_as("hPa")),
+        "lcl_temperature": float(lcl_temperature.m_as("degC")),
+        "lfc_pressure": float(lfc_pressure.m_as("hPa")),
+        "lfc_temperature": float(lfc_temperature.m_as("degC")),
+        "cape": float(cape_value.m_as("J/kg")),
+        "cin": float(cin_value.m_as("J/kg")),
+        "parcel_profile": parcel_prof.m_as("degC"),
+    }
+    if cache is not None:
+        with span("skewt.cache"):
+            cache.put(key, result)
+    return result
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import metpy
+import numpy as np
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "thermo.sqlite")
+# Bump when the layout of cached results changes, so old entries stop matching
+CACHE_FORMAT = 1
+
+def sounding_key(pressure, temperature, dewpoint):
+    """
+    Cache key for a sounding: sha256 of the three float64 arrays plus the MetPy version.
+
+    A MetPy upgrade can change results, so it starts a fresh set of keys.
+    """
+    digest = hashlib.sha256(f"thermo/{CACHE_FORMAT}/metpy-{metpy.__version__}".encode("utf-8"))
+    for values in (pressure, temperature, dewpoint):
+        array = np.ascontiguousarray(values, dtype=np.float64)
+        digest.update(str(array.shape).encode("ascii"))
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+class ThermoCache:
+    """
+    Persistent, size-bounded LRU cache of thermo_parameters results in a SQLite file.
+
+    Entries carry a last-used time; once the cache holds more than max_entries, the least
+    recently used ones are deleted. The file is in WAL mode with a busy timeout, so every
+    worker process of a batch run can open the same cache at once.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=50000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS thermo_cache (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_thermo_cache_last_used ON thermo_cache (last_used)")
+
+    def get(self, key):
+        """
+        Cached result for a key, or None. A hit marks the entry as recently used.
+        """
+        row = self.conn.execute("SELECT result FROM thermo_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self.conn:
+            self.conn.execute("UPDATE thermo_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+        result = json.loads(row[0])
+        result["parcel_profile"] = np.array(result["parcel_profile"], dtype=np.float64)
+        return result
+
+    def put(self, key, result):
+        stored = dict(result, parcel_profile=np.asarray(result["parcel_profile"]).tolist())
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO thermo_cache (key, result, last_used) VALUES (?, ?, ?)",
+                              (key, json.dumps(stored), time.time()))
+            excess = self.conn.execute("SELECT COUNT(*) FROM thermo_cache").fetchone()[0] - self.max_entries
+            if excess > 0:
+                # Evict a little more than needed so this doesn't run on every insert of a full cache
+                excess += self.max_entries // 100
+                deleted = self.conn.execute("""
+                    DELETE FROM thermo_cache WHERE key IN (
+                        SELECT key FROM thermo_cache ORDER BY last_used LIMIT ?
+                    )
+                """, (excess,))
+                self.evictions += deleted.rowcount
+
+    def stats(self):
+        """
+        Returns:
+            dict: hits, misses and evictions by this instance, plus the entries in the file.
+        """
+        entries = self.conn.execute("SELECT COUNT(*) FROM thermo_cache").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": entries}
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM thermo_cache")
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,177 @@
+import argparse
+import time
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+
+from schema import DEFAULT_DB_PATH, date_range_bounds, open_database
+
+# Column layout of the exported files. wind_direction stays text because the database
+# mixes degrees with compass points ("E"); `month` ('YYYY-MM') is the partition key.
+ARROW_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("date", pa.string()),
+    ("date_iso", pa.string()),
+    ("temperature", pa.float64()),
+    ("precipitation", pa.float64()),
+    ("wind_speed", pa.float64()),
+    ("wind_direction", pa.string()),
+    ("pressure", pa.float64()),
+    ("additional_info", pa.string()),
+    ("location", pa.string()),
+    ("latitude", pa.float64()),
+    ("longitude", pa.float64()),
+    ("month", pa.string()),
+])
+PARTITIONING = ds.partitioning(pa.schema([("month", pa.string())]), flavor="hive")
+FORMATS = {"parquet": "parquet", "arrow": "ipc"}
+_FLOAT_COLUMNS = {"temperature", "precipitation", "wind_speed", "pressure", "latitude", "longitude"}
+
+def _as_float(value):
+    # Hand-edited rows can hold text in REAL columns; those become nulls in the export
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _record_batches(conn, batch_size):
+    # Walk the table in rowid order, one bounded batch at a time
+    names = [field.name for field in ARROW_SCHEMA if field.name != "month"]
+    query = f"""
+        SELECT {", ".join(names)} FROM historical_weather
+        WHERE id > ? AND date_iso IS NOT NULL
+        ORDER BY id LIMIT ?
+    """
+    last_id = 0
+    while True:
+        rows = conn.execute(query, (last_id, batch_size)).fetchall()
+        if not rows:
+            return
+        columns = [list(column) for column in zip(*rows)]
+        data = dict(zip(names, columns))
+        for name in _FLOAT_COLUMNS:
+            data[name] = [_as_float(value) for value in data[name]]
+        data["wind_direction"] = [None if value is None else str(value) for value in data["wind_direction"]]
+        data["month"] = [value[:7] for value in data["date_iso"]]
+        yield pa.RecordBatch.from_pydict(data, schema=ARROW_SCHEMA)
+        last_id = rows[-1][0]
+
+def export_columnar(db_path, out_dir, file_format="parquet", batch_size=100000):
+    """
+    Export historical_weather into month-partitioned Parquet or Arrow IPC files.
+
+    The export streams from SQLite in batches, so it never holds the whole table in memory.
+    SQLite stays the write store; re-run the export to pick up new rows (it replaces the
+    partitions it writes).
+
+    Parameters:
+        db_path (str): Path to the SQLite database file.
+        out_dir (str): Directory for the dataset (one month=YYYY-MM subdirectory per month).
+        file_format (str): 'parquet' or 'arrow'.
+        batch_size (int): Rows read from SQLite per batch.
+
+    Returns:
+        int: Number of rows exported.
+    """
+    # pyarrow pulls the batches from one of its own threads (one at a time)
+    conn = open_database(db_path, check_same_thread=False)
+    exported = 0
+    def counted(batches):
+        nonlocal exported
+        for batch in batches:
+            exported += batch.num_rows
+            yield batch
+    try:
+        ds.write_dataset(counted(_record_batches(conn, batch_size)), out_dir, schema=ARROW_SCHEMA,
+                         format=FORMATS[file_format], partitioning=PARTITIONING,
+                         existing_data_behavior="delete_matching", max_partitions=100000)
+    finally:
+        conn.close()
+    return exported
+
+def open_columnar(out_dir, file_format="parquet"):
+    """
+    Open an exported dataset with memory-mapped file access.
+    """
+    return ds.dataset(out_dir, format=FORMATS[file_format], partitioning=PARTITIONING,
+                      filesystem=pafs.LocalFileSystem(use_mmap=True))
+
+def query_columnar(out_dir, start_date, end_date, columns=None, file_format="parquet"):
+    """
+    Read events between start_date and end_date from an exported dataset.
+
+    Only the month partitions overlapping the range are opened (partition pruning on
+    `month`), the date predicate is pushed down into the scan, and only the requested
+    columns are decoded.
+
+    Parameters:
+        out_dir (str): Directory written by export_columnar.
+        start_date (str): Start date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format.
+        end_date (str): End date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format (inclusive).
+        columns (list, optional): Columns to read, defaults to all of them.
+        file_format (str): 'parquet' or 'arrow', matching the export.
+
+    Returns:
+        pyarrow.Table: Matching rows, ordered by date when date_iso is among the columns.
+    """
+    lower, upper = date_range_bounds(start_date, end_date)
+    predicate = ((ds.field("month") >= lower[:7]) & (ds.field("month") <= upper[:7])
+                 & (ds.field("date_iso") >= lower) & (ds.field("date_iso") < upper))
+    table = open_columnar(out_dir, file_format).to_table(columns=columns, filter=predicate)
+    if "date_iso" in table.column_names:
+        table = table.sort_by([("date_iso", "ascending"), ("id", "ascending")] if "id" in table.column_names
+                              else [("date_iso", "ascending")])
+    return table
+
+def plot_time_series(table, column):
+    """
+    Plot one measurement over time from a table returned by query_columnar.
+    """
+    import matplotlib.pyplot as plt
+    df = table.select(["date_iso", column]).to_pandas()
+    fig, ax = plt.subplots(figsize=(10, 4))
+    ax.plot(df["date_iso"].astype("datetime64[ns]"), df[column], linewidth=1)
+    ax.set_xlabel("Date")
+    ax.set_ylabel(column)
+    ax.set_title(f"RetroWx - {column}")
+    plt.show()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RetroWx columnar - Parquet/Arrow export and analytical queries.")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="parquet", help="File format (default: parquet)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export = subparsers.add_parser("export", help="Export the database into month-partitioned files")
+    export.add_argument("out_dir", help="Directory to write the dataset to")
+    export.add_argument("--db", default=DEFAULT_DB_PATH, help="Path to the SQLite database file (default: the bundled RetroWx/database one)")
+    query = subparsers.add_parser("query", help="Query an exported dataset by date range")
+    query.add_argument("out_dir", help="Directory the dataset was exported to")
+    query.add_argument("start", help="Start date (YYYY/MM/DD or YYYY-MM-DD)")
+    query.add_argument("end", help="End date (YYYY/MM/DD or YYYY-MM-DD)")
+    query.add_argument("--columns", help="Comma separated columns to read (default: all)")
+    query.add_argument("--plot", metavar="COLUMN", help="Plot this column over time")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.command == "export":
+        count = export_columnar(args.db, args.out_dir, args.format)
+        print(f"Exported {count} rows to {args.out_dir} in {time.perf_counter() - started:.2f} s")
+        return
+    columns = args.columns.split(",") if args.columns else None
+    if columns and args.plot:
+        columns = list(dict.fromkeys(columns + ["date_iso", args.plot]))
+    try:
+        table = query_columnar(args.out_dir, args.start, args.end, columns, args.format)
+    except ValueError as e:
+        print(f"Invalid input: {e}")
+        return
+    except FileNotFoundError:
+        print(f"No exported dataset found at {args.out_dir}")
+        return
+    print(f"{table.num_rows} rows in {time.perf_counter() - started:.3f} s")
+    print(table.slice(0, 10).to_pandas().to_string(index=False))
+    if args.plot:
+        plot_time_series(table, args.plot)
+
+if __name__ == "__main__":
+    main()
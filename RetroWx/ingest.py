@@ -0,0 +1,247 @@
+import argparse
+import csv
+import gzip
+import os
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+
+from rollups import refresh_rollups
+from schema import DEFAULT_DB_PATH, normalize_date, open_database, parse_location
+if __name__ == "__main__":
+    # Started as a script from this folder: the shared tempestpy package is one directory up
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tempestpy.trace import span
+
+# CSV columns RetroWx understands; anything else in an archive is ignored.
+# latitude/longitude are optional, when missing they are parsed from location.
+CSV_COLUMNS = ["date", "temperature", "precipitation", "wind_speed", "wind_direction",
+               "pressure", "additional_info", "location", "latitude", "longitude"]
+
+# Rows are only inserted when no event exists yet for the same date and location,
+# which makes re-running an import over the same archive a no-op.
+INSERT_SQL = """
+    INSERT INTO historical_weather (date, temperature, precipitation, wind_speed, wind_direction,
+                                    pressure, additional_info, location, date_iso, latitude, longitude)
+    SELECT ?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11
+    WHERE NOT EXISTS (SELECT 1 FROM historical_weather WHERE date_iso = ?9 AND location IS ?8)
+"""
+
+# Per-row triggers that are too slow for bulk loads. They are dropped inside the load
+# transaction and replaced by one set-based statement over the new rows (see _end_bulk),
+# so other connections never see the table without them.
+BULK_SUSPENDED_TRIGGERS = {
+    "historical_weather_rtree_insert": """
+        INSERT INTO historical_weather_rtree
+        SELECT id, latitude, latitude, longitude, longitude FROM historical_weather
+        WHERE id > ? AND latitude IS NOT NULL AND longitude IS NOT NULL
+    """,
+    "historical_weather_rollup_insert": """
+        INSERT OR IGNORE INTO weather_rollup_dirty
+        SELECT DISTINCT substr(date_iso, 1, 10) FROM historical_weather
+        WHERE id > ? AND date_iso IS NOT NULL
+    """,
+    "historical_weather_fts_insert": """
+        INSERT INTO historical_weather_fts (rowid, additional_info)
+        SELECT id, additional_info FROM historical_weather WHERE id > ?
+    """,
+}
+
+def open_archive(path):
+    """
+    Open a plain or gzip'd CSV archive for streaming text reads.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+def read_batches(path, batch_size):
+    """
+    Stream raw CSV rows from an archive in lists of batch_size.
+
+    Yields:
+        tuple: (header, rows) where header is the list of lower-cased column names.
+    """
+    with open_archive(path) as file:
+        reader = csv.reader(file)
+        header = [name.strip().lower() for name in next(reader, [])]
+        if "date" not in header:
+            raise ValueError(f"{path}: CSV header must contain a 'date' column")
+        batch = []
+        for row in reader:
+            batch.append(row)
+            if len(batch) == batch_size:
+                yield header, batch
+                batch = []
+        if batch:
+            yield header, batch
+
+def _to_float(value):
+    value = value.strip()
+    return float(value) if value else None
+
+def _to_text(value):
+    return value.strip() or None
+
+def normalize_batch(header, rows):
+    """
+    Convert raw CSV rows into parameter tuples for INSERT_SQL.
+
+    Runs in the worker processes. Rows with an unparseable date or number are
+    counted and dropped rather than failing the whole import.
+
+    Returns:
+        tuple: (list of parameter tuples, number of rejected rows)
+    """
+    # Missing columns point one past the end of the header, where every row gets an empty padding cell
+    width = len(header)
+    positions = [header.index(column) if column in header else width for column in CSV_COLUMNS]
+    records = []
+    rejected = 0
+    for row in rows:
+        row.extend([""] * (width + 1 - len(row)))
+        (date_raw, temperature, precipitation, wind_speed, wind_direction,
+         pressure, additional_info, location, latitude, longitude) = [row[position] for position in positions]
+        try:
+            date_raw = date_raw.strip()
+            date_iso = normalize_date(date_raw)
+            temperature = _to_float(temperature)
+            precipitation = _to_float(precipitation)
+            wind_speed = _to_float(wind_speed)
+            pressure = _to_float(pressure)
+            latitude = _to_float(latitude)
+            longitude = _to_float(longitude)
+        except ValueError:
+            rejected += 1
+            continue
+        # Compass directions ("E", "NNW") are kept as text like in the hand-made database
+        wind_direction = _to_text(wind_direction)
+        if wind_direction is not None:
+            try:
+                wind_direction = float(wind_direction)
+            except ValueError:
+                pass
+        location = _to_text(location)
+        if latitude is None or longitude is None:
+            latitude, longitude = parse_location(location) or (None, None)
+        records.append((date_raw, temperature, precipitation, wind_speed, wind_direction, pressure,
+                        _to_text(additional_info), location, date_iso, latitude, longitude))
+    return records, rejected
+
+def _normalized_batches(paths, batch_size, workers):
+    # Yield normalized batches in file order. With workers, at most 2 * workers
+    # batches are in flight so memory stays bounded on very large archives.
+    if workers <= 1:
+        for path in paths:
+            for header, rows in read_batches(path, batch_size):
+                yield normalize_batch(header, rows)
+        return
+    with Pool(workers) as pool:
+        pending = deque()
+        for path in paths:
+            for header, rows in read_batches(path, batch_size):
+                pending.append(pool.apply_async(normalize_batch, (header, rows)))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+def _begin_bulk(conn):
+    # Start a load transaction with the slow triggers suspended
+    conn.execute("BEGIN")
+    last_id = conn.execute("SELECT ifnull(max(id), 0) FROM historical_weather").fetchone()[0]
+    trigger_sql = []
+    for name in BULK_SUSPENDED_TRIGGERS:
+        row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,)).fetchone()
+        if row:
+            trigger_sql.append((name, row[0]))
+            conn.execute(f"DROP TRIGGER {name}")
+    return last_id, trigger_sql
+
+def _end_bulk(conn, state):
+    # Catch up on the work of the suspended triggers, restore them and commit
+    last_id, trigger_sql = state
+    for name, sql in trigger_sql:
+        conn.execute(BULK_SUSPENDED_TRIGGERS[name], (last_id,))
+        conn.execute(sql)
+    conn.commit()
+
+def ingest(db_path, paths, batch_size=20000, commit_every=500000, workers=None, refresh=True):
+    """
+    Bulk-load CSV (or .csv.gz) station archives into historical_weather.
+
+    Parameters:
+        db_path (str): Path to the SQLite database file (created if missing).
+        paths (list): CSV archives to import, in order.
+        batch_size (int): Rows per executemany call / worker task.
+        commit_every (int): Rows per transaction.
+        workers (int, optional): Parsing processes, defaults to the CPU count. 0 or 1 parses inline.
+        refresh (bool): Refresh the climatology rollups for the imported days afterwards.
+
+    Returns:
+        dict: Counts of rows read, inserted, skipped as duplicates and rejected, load seconds and rows/s,
+              and the number of rollup days refreshed.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    conn = open_database(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -262144")  # 256 MiB page cache for the dedupe index
+    stats = {"read": 0, "inserted": 0, "duplicates": 0, "rejected": 0}
+    started = time.perf_counter()
+    uncommitted = 0
+    try:
+        try:
+            state = _begin_bulk(conn)
+            # Time not spent in retrowx.insert/commit is reading and normalizing the CSVs
+            for records, rejected in _normalized_batches(paths, batch_size, workers):
+                with span("retrowx.insert", rows=len(records)):
+                    cursor = conn.executemany(INSERT_SQL, records)
+                stats["read"] += len(records) + rejected
+                stats["rejected"] += rejected
+                stats["inserted"] += cursor.rowcount
+                stats["duplicates"] += len(records) - cursor.rowcount
+                uncommitted += len(records)
+                if uncommitted >= commit_every:
+                    with span("retrowx.commit"):
+                        _end_bulk(conn, state)
+                    state = _begin_bulk(conn)
+                    uncommitted = 0
+            with span("retrowx.commit"):
+                _end_bulk(conn, state)
+        except BaseException:
+            conn.rollback()
+            raise
+        stats["seconds"] = time.perf_counter() - started
+        with span("retrowx.rollups"):
+            stats["days_refreshed"] = refresh_rollups(conn) if refresh else 0
+    finally:
+        conn.close()
+    stats["rows_per_second"] = stats["read"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RetroWx ingest - bulk-load CSV station archives into the database.")
+    parser.add_argument("paths", nargs="+", help="CSV or gzip'd CSV archives with a header row (needs a 'date' column)")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Path to the SQLite database file (default: the bundled RetroWx/database one)")
+    parser.add_argument("--batch-size", type=int, default=20000, help="Rows per insert batch (default: 20000)")
+    parser.add_argument("--commit-every", type=int, default=500000,
+                        help="Rows per transaction; other readers see the new rows after each commit (default: 500000)")
+    parser.add_argument("--workers", type=int, default=None, help="Parsing processes (default: CPU count, 0 = inline)")
+    parser.add_argument("--no-refresh", action="store_true", help="Don't refresh the climatology rollups after importing")
+    args = parser.parse_args(argv)
+
+    print(f"Importing {len(args.paths)} archive(s) into {args.db}...")
+    stats = ingest(args.db, args.paths, batch_size=args.batch_size, commit_every=args.commit_every,
+                   workers=args.workers, refresh=not args.no_refresh)
+    print(f"Read {stats['read']} rows: {stats['inserted']} inserted, "
+          f"{stats['duplicates']} duplicates skipped, {stats['rejected']} rejected.")
+    if stats["days_refreshed"]:
+        print(f"Refreshed climatology rollups for {stats['days_refreshed']} day(s).")
+    print(f"Finished in {stats['seconds']:.2f} s ({stats['rows_per_second']:,.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import math
+from schema import WEATHER_COLUMNS, date_range_bounds
+
+# SQL for RetroWx's read queries. Everything here works on an open connection and returns
+# plain (columns, rows) so it can be shared by the CLI (which wraps it in DataFrames)
+# and by the query service's pooled read-only connections.
+
+def _date_filter(start_date, end_date, alias=""):
+    # Optional inclusive date range on the indexed date_iso column
+    if not (start_date or end_date):
+        return "", ()
+    if not (start_date and end_date):
+        raise ValueError("start_date and end_date must be given together")
+    return f"AND {alias}date_iso >= ? AND {alias}date_iso < ?", date_range_bounds(start_date, end_date)
+
+def select_range(conn, start_date, end_date, limit=-1, offset=0):
+    """
+    Events between start_date and end_date in date order.
+
+    Parameters:
+        conn (sqlite3.Connection): Open connection to a migrated database.
+        start_date (str): Start date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format.
+        end_date (str): End date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format (inclusive).
+        limit (int): Maximum number of rows, -1 for all of them.
+        offset (int): Number of rows to skip.
+
+    Returns:
+        tuple: (column names, list of row tuples)
+    """
+    lower, upper = date_range_bounds(start_date, end_date)
+    # date_iso is indexed, so this is a range seek instead of a full table scan
+    query = f"""
+        SELECT {", ".join(WEATHER_COLUMNS)}
+        FROM historical_weather
+        WHERE date_iso >= ? AND date_iso < ?
+        ORDER BY date_iso, id
+        LIMIT ? OFFSET ?
+    """
+    return list(WEATHER_COLUMNS), conn.execute(query, (lower, upper, limit, offset)).fetchall()
+
+def build_search_query(text, phrase=False):
+    """
+    Turn user input into an FTS5 MATCH expression.
+
+    Every word is quoted so punctuation can't break the FTS5 query syntax.
+
+    Parameters:
+        text (str): Keywords, or the exact phrase to look for.
+        phrase (bool): Match the words as one phrase instead of all of them anywhere.
+    """
+    words = text.split()
+    if not words:
+        raise ValueError("search text is empty")
+    if phrase:
+        words = [" ".join(words)]
+    quoted = ['"' + word.replace('"', '""') + '"' for word in words]
+    return " AND ".join(quoted)
+
+def select_search(conn, text, start_date=None, end_date=None, phrase=False, limit=10, offset=0):
+    """
+    Full-text search over event descriptions, best matches first.
+
+    Returns:
+        tuple: (column names, list of row tuples), with the bm25 rank as the last column.
+    """
+    date_filter, date_params = _date_filter(start_date, end_date, "w.")
+    query = f"""
+        SELECT {", ".join("w." + column for column in WEATHER_COLUMNS)}, bm25(historical_weather_fts) AS rank
+        FROM historical_weather_fts
+        JOIN historical_weather w ON w.id = historical_weather_fts.rowid
+        WHERE historical_weather_fts MATCH ?
+        {date_filter}
+        ORDER BY rank
+        LIMIT ? OFFSET ?
+    """
+    params = (build_search_query(text, phrase),) + tuple(date_params) + (limit, offset)
+    return WEATHER_COLUMNS + ["rank"], conn.execute(query, params).fetchall()
+
+# Mean Earth radius used for great-circle distances
+EARTH_RADIUS_KM = 6371.0088
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance between two points in kilometres.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def _radius_boxes(lat, lon, radius_km):
+    # Bounding box(es) that contain every point within radius_km of (lat, lon).
+    # Boxes crossing the antimeridian are split in two so the R*Tree can still use them.
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat - dlat, lat + dlat
+    if min_lat <= -90 or max_lat >= 90:
+        # The circle contains a pole, so every longitude is in range
+        return [(max(min_lat, -90), -180, min(max_lat, 90), 180)]
+    dlon = math.degrees(math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat)))))
+    min_lon, max_lon = lon - dlon, lon + dlon
+    if min_lon < -180:
+        return [(min_lat, min_lon + 360, max_lat, 180), (min_lat, -180, max_lat, max_lon)]
+    if max_lon > 180:
+        return [(min_lat, min_lon, max_lat, 180), (min_lat, -180, max_lat, max_lon - 360)]
+    return [(min_lat, min_lon, max_lat, max_lon)]
+
+def _box_lookups(boxes):
+    # R*Tree lookup for every box at once, as an id subquery, plus its parameters
+    lookups = " UNION ALL ".join(["SELECT id FROM historical_weather_rtree "
+                                  "WHERE min_lat >= ? AND max_lat <= ? AND min_lon >= ? AND max_lon <= ?"] * len(boxes))
+    params = [value for min_lat, min_lon, max_lat, max_lon in boxes for value in (min_lat, max_lat, min_lon, max_lon)]
+    return lookups, tuple(params)
+
+def select_in_bbox(conn, min_lat, min_lon, max_lat, max_lon, start_date=None, end_date=None, limit=-1, offset=0):
+    """
+    Events inside a latitude/longitude bounding box in date order, using the R*Tree index.
+
+    A box with min_lon greater than max_lon crosses the antimeridian (e.g. 170 to -170).
+
+    Parameters:
+        conn (sqlite3.Connection): Open connection to a migrated database.
+        min_lat, min_lon, max_lat, max_lon (float): Box corners in decimal degrees.
+        start_date, end_date (str, optional): Inclusive date range, given together or not at all.
+        limit (int): Maximum number of rows, -1 for all of them.
+        offset (int): Number of rows to skip.
+
+    Returns:
+        tuple: (column names, list of row tuples) including latitude and longitude.
+    """
+    if min_lon > max_lon:
+        # Split at the antimeridian like _radius_boxes does, so the R*Tree can still use both halves
+        boxes = [(min_lat, min_lon, max_lat, 180), (min_lat, -180, max_lat, max_lon)]
+    else:
+        boxes = [(min_lat, min_lon, max_lat, max_lon)]
+    lookups, lookup_params = _box_lookups(boxes)
+    date_filter, date_params = _date_filter(start_date, end_date, "w.")
+    query = f"""
+        SELECT {", ".join("w." + column for column in WEATHER_COLUMNS)}, w.latitude, w.longitude
+        FROM historical_weather w
+        WHERE w.id IN ({lookups})
+        {date_filter}
+        ORDER BY w.date_iso, w.id
+        LIMIT ? OFFSET ?
+    """
+    params = lookup_params + tuple(date_params) + (limit, offset)
+    return WEATHER_COLUMNS + ["latitude", "longitude"], conn.execute(query, params).fetchall()
+
+def select_near(conn, lat, lon, radius_km, start_date=None, end_date=None, limit=-1, offset=0):
+    """
+    Events within radius_km (great-circle distance) of a point, nearest first.
+
+    The R*Tree narrows the search to a bounding box first; only those candidates have
+    their exact distance computed, and the page is cut after sorting by that distance.
+
+    Parameters:
+        conn (sqlite3.Connection): Open connection to a migrated database.
+        lat, lon (float): Centre point in decimal degrees.
+        radius_km (float): Search radius in kilometres.
+        start_date, end_date (str, optional): Inclusive date range, given together or not at all.
+        limit (int): Maximum number of rows, -1 for all of them.
+        offset (int): Number of rows to skip.
+
+    Returns:
+        tuple: (column names, list of row tuples) including latitude, longitude and distance_km.
+    """
+    # Registered per call, so the service's read-only pool connections have it too
+    conn.create_function("retrowx_distance_km", 4, haversine_km, deterministic=True)
+    lookups, lookup_params = _box_lookups(_radius_boxes(lat, lon, radius_km))
+    date_filter, date_params = _date_filter(start_date, end_date, "w.")
+    query = f"""
+        SELECT {", ".join(WEATHER_COLUMNS)}, latitude, longitude, distance_km
+        FROM (
+            SELECT {", ".join("w." + column for column in WEATHER_COLUMNS)}, w.latitude, w.longitude, w.date_iso,
+                   retrowx_distance_km(?, ?, w.latitude, w.longitude) AS distance_km
+            FROM historical_weather w
+            WHERE w.id IN ({lookups})
+            {date_filter}
+        )
+        WHERE distance_km <= ?
+        ORDER BY distance_km, date_iso, id
+        LIMIT ? OFFSET ?
+    """
+    params = (lat, lon) + lookup_params + tuple(date_params) + (radius_km, limit, offset)
+    return WEATHER_COLUMNS + ["latitude", "longitude", "distance_km"], conn.execute(query, params).fetchall()
@@ -0,0 +1,203 @@
+import argparse
+import re
+from datetime import date
+
+import pandas as pd
+
+from schema import DEFAULT_DB_PATH, ROLLUP_FIELDS, date_range_bounds, normalize_date, open_database
+
+# Aggregate columns shared by weather_daily and weather_monthly, in table order
+AGGREGATE_COLUMNS = ["event_count"] + [f"{field}_{stat}" for field in ROLLUP_FIELDS
+                                       for stat in ("count", "min", "max", "sum")]
+
+_DAILY_AGGREGATES = ", ".join(["count(*)"] + [f"count({field}), min({field}), max({field}), sum({field})"
+                                              for field in ROLLUP_FIELDS])
+_MONTHLY_AGGREGATES = ", ".join(["sum(event_count)"] + [
+    f"sum({field}_count), min({field}_min), max({field}_max), sum({field}_sum)" for field in ROLLUP_FIELDS])
+
+def normalize_month(value):
+    """
+    Convert 'YYYY/MM' or 'YYYY-MM' into the 'YYYY-MM' keys used by weather_monthly.
+    """
+    match = re.fullmatch(r"(\d{4})[/-](\d{1,2})", str(value).strip())
+    if not match or not 1 <= int(match[2]) <= 12:
+        raise ValueError(f"Unrecognised month '{value}', expected YYYY/MM or YYYY-MM")
+    return f"{match[1]}-{int(match[2]):02d}"
+
+def _month_bounds(month):
+    # First day of the month and first day of the next one, as ISO strings
+    year, number = int(month[:4]), int(month[5:])
+    following = date(year + number // 12, number % 12 + 1, 1)
+    return f"{month}-01", following.isoformat()
+
+def refresh_rollups(conn):
+    """
+    Recompute the daily and monthly rollups for every day marked dirty by the triggers.
+
+    Only the changed days are re-aggregated from historical_weather (using the date
+    index), and only the months containing them are rebuilt from weather_daily.
+
+    Parameters:
+        conn (sqlite3.Connection): Open read-write connection to a migrated database.
+
+    Returns:
+        int: Number of days that were refreshed.
+    """
+    days = [row[0] for row in conn.execute("SELECT day FROM weather_rollup_dirty ORDER BY day")]
+    if not days:
+        return 0
+    conn.execute("BEGIN")
+    try:
+        for day in days:
+            conn.execute("DELETE FROM weather_daily WHERE day = ?", (day,))
+            try:
+                lower, upper = date_range_bounds(day, day)
+            except ValueError:
+                # A date_iso edited by hand into something that isn't a date can't be rolled up
+                continue
+            if lower != day:
+                # Likewise an unpadded one typed in by hand; the triggers only ever store padded days
+                continue
+            conn.execute(f"""
+                INSERT INTO weather_daily
+                SELECT ifnull(location, ''), ?, {_DAILY_AGGREGATES}
+                FROM historical_weather
+                WHERE date_iso >= ? AND date_iso < ?
+                GROUP BY ifnull(location, '')
+            """, (day, lower, upper))
+        for month in sorted({day[:7] for day in days}):
+            conn.execute("DELETE FROM weather_monthly WHERE month = ?", (month,))
+            try:
+                first, following = _month_bounds(month)
+            except ValueError:
+                continue
+            conn.execute(f"""
+                INSERT INTO weather_monthly
+                SELECT location, ?, {_MONTHLY_AGGREGATES}
+                FROM weather_daily
+                WHERE day >= ? AND day < ?
+                GROUP BY location
+            """, (month, first, following))
+        conn.executemany("DELETE FROM weather_rollup_dirty WHERE day = ?", [(day,) for day in days])
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    return len(days)
+
+def _with_means(df):
+    # Means are derived from sum/count so rollups can be merged without losing precision
+    for field in ROLLUP_FIELDS:
+        df[f"{field}_mean"] = df[f"{field}_sum"] / df[f"{field}_count"].where(df[f"{field}_count"] > 0)
+    return df
+
+def select_rollup(conn, period, location, start, end):
+    """
+    Rollup rows for one location from an open connection, without refreshing first.
+
+    Returns:
+        tuple: (column names, list of row tuples)
+    """
+    if period == "daily":
+        table, key, start, end = "weather_daily", "day", normalize_date(start)[:10], normalize_date(end)[:10]
+    elif period == "monthly":
+        table, key, start, end = "weather_monthly", "month", normalize_month(start), normalize_month(end)
+    else:
+        raise ValueError("period must be 'daily' or 'monthly'")
+    query = f"""
+        SELECT {key}, {", ".join(AGGREGATE_COLUMNS)}
+        FROM {table}
+        WHERE location = ? AND {key} >= ? AND {key} <= ?
+        ORDER BY {key}
+    """
+    return [key] + AGGREGATE_COLUMNS, conn.execute(query, (location or "", start, end)).fetchall()
+
+def query_rollup(db_path, period, location, start, end):
+    """
+    Read pre-aggregated statistics for one location straight from the rollup tables.
+
+    Parameters:
+        db_path (str): Path to the SQLite database file.
+        period (str): 'daily' or 'monthly'.
+        location (str): Location text exactly as stored ('' or None for events without one).
+        start (str): First day ('YYYY/MM/DD') or month ('YYYY/MM') to include.
+        end (str): Last day or month to include (inclusive).
+
+    Returns:
+        pd.DataFrame: One row per day/month with count/min/max/sum/mean for each measurement.
+    """
+    conn = open_database(db_path)
+    try:
+        refresh_rollups(conn)
+        columns, rows = select_rollup(conn, period, location, start, end)
+    finally:
+        conn.close()
+    return _with_means(pd.DataFrame(rows, columns=columns))
+
+def monthly_climatology(db_path, location, month_number):
+    """
+    Statistics for one calendar month across every year on record, e.g. "May at El Reno".
+
+    Parameters:
+        db_path (str): Path to the SQLite database file.
+        location (str): Location text exactly as stored.
+        month_number (int): Calendar month, 1-12.
+
+    Returns:
+        dict: years on record, event_count and count/min/max/sum/mean per measurement,
+              plus the average precipitation total for that month per year.
+    """
+    if not 1 <= int(month_number) <= 12:
+        raise ValueError("month_number must be between 1 and 12")
+    conn = open_database(db_path)
+    try:
+        refresh_rollups(conn)
+        row = conn.execute(f"""
+            SELECT count(*), {_MONTHLY_AGGREGATES}
+            FROM weather_monthly
+            WHERE location = ? AND substr(month, 6, 2) = ?
+        """, (location or "", f"{int(month_number):02d}")).fetchone()
+    finally:
+        conn.close()
+    result = dict(zip(["years"] + AGGREGATE_COLUMNS, row))
+    for field in ROLLUP_FIELDS:
+        count, total = result[f"{field}_count"], result[f"{field}_sum"]
+        result[f"{field}_mean"] = total / count if count else None
+    total = result["precipitation_sum"]
+    result["precipitation_yearly_total"] = total / result["years"] if result["years"] and total is not None else None
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RetroWx rollups - daily/monthly climatology summaries.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Path to the SQLite database file (default: the bundled RetroWx/database one)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("refresh", help="Refresh the rollups for days changed since the last refresh")
+    summary = subparsers.add_parser("summary", help="Show daily or monthly statistics for a location")
+    summary.add_argument("period", choices=["daily", "monthly"])
+    summary.add_argument("location", help="Location exactly as stored, e.g. \"35.39° N 97.55°W\"")
+    summary.add_argument("start", help="First day (YYYY/MM/DD) or month (YYYY/MM)")
+    summary.add_argument("end", help="Last day or month (inclusive)")
+    climatology = subparsers.add_parser("climatology", help="Show statistics for a calendar month across all years")
+    climatology.add_argument("location", help="Location exactly as stored")
+    climatology.add_argument("month", type=int, help="Calendar month, 1-12")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "refresh":
+            conn = open_database(args.db)
+            print(f"Refreshed {refresh_rollups(conn)} day(s).")
+            conn.close()
+        elif args.command == "summary":
+            df = query_rollup(args.db, args.period, args.location, args.start, args.end)
+            if df.empty:
+                print("No rollups found for that location and range.")
+            else:
+                print(df.to_string(index=False))
+        else:
+            for key, value in monthly_climatology(args.db, args.location, args.month).items():
+                print(f"{key}: {value}")
+    except ValueError as e:
+        print(f"Invalid input: {e}")
+
+if __name__ == "__main__":
+    main()
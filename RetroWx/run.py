@@ -1,36 +1,215 @@
-import sqlite3
 import pandas as pd
-import matplotlib.pyplot as plt
-import re
+import argparse
+import os
+import sys
+from schema import DEFAULT_DB_PATH, WEATHER_COLUMNS, date_range_bounds, normalize_date, open_database
+from queries import select_in_bbox, select_near, select_range, select_search
+if __name__ == "__main__":
+    # Started as a script from this folder: the shared tempestpy package is one directory up
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tempestpy.trace import span
 
 version = "0.0.0.1"
 
+def _query_frame(db_path, select, *args, **kwargs):
+    # Run one of the queries.select_* functions on a fresh connection and wrap the rows in a DataFrame
+    with span("retrowx.sql", query=select.__name__):
+        conn = open_database(db_path)
+        try:
+            columns, rows = select(conn, *args, **kwargs)
+        finally:
+            conn.close()
+    with span("retrowx.dataframe", rows=len(rows)):
+        return pd.DataFrame(rows, columns=columns)
+
+def _page_bounds(page, limit):
+    # LIMIT/OFFSET keyword arguments for a 1-based page; limit -1 returns every row as one page
+    if page < 1 or not (limit >= 1 or limit == -1):
+        raise ValueError("page must be positive and limit positive (or -1 for every row)")
+    return {"limit": limit, "offset": (page - 1) * limit if limit > 0 else 0}
+
 def query_weather_database(db_path, start_date, end_date):
     """
     Query the historical weather events database for events between start_date and end_date.
     
     Parameters:
         db_path (str): Path to the SQLite database file.
-        start_date (str): Start date in 'YYYY-MM-DD' format.
-        end_date (str): End date in 'YYYY-MM-DD' format.
+        start_date (str): Start date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format.
+        end_date (str): End date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format (inclusive).
     
     Returns:
         pd.DataFrame: DataFrame containing the query results.
     """
-    conn = sqlite3.connect(db_path)
-    query = """
-        SELECT *
+    return _query_frame(db_path, select_range, start_date, end_date)
+
+def query_weather_page(db_path, start_date, end_date, page=1, limit=10):
+    """
+    Query a single page of events between start_date and end_date.
+
+    LIMIT/OFFSET is pushed down into SQLite, so only `limit` rows ever leave the database.
+
+    Parameters:
+        db_path (str): Path to the SQLite database file.
+        start_date (str): Start date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format.
+        end_date (str): End date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format (inclusive).
+        page (int): 1-based page number.
+        limit (int): Number of rows per page.
+
+    Returns:
+        pd.DataFrame: DataFrame containing at most `limit` rows.
+    """
+    if page < 1 or limit < 1:
+        raise ValueError("page and limit must be positive")
+    return _query_frame(db_path, select_range, start_date, end_date, limit=limit, offset=(page - 1) * limit)
+
+def iter_weather_events(db_path, start_date, end_date, batch_size=1000):
+    """
+    Stream events between start_date and end_date one row at a time.
+
+    Rows are fetched in batches using keyset pagination on (date_iso, id), so every
+    batch is an index seek and memory use stays flat however wide the date range is.
+
+    Parameters:
+        db_path (str): Path to the SQLite database file.
+        start_date (str): Start date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format.
+        end_date (str): End date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format (inclusive).
+        batch_size (int): Number of rows fetched from SQLite per round trip.
+
+    Yields:
+        dict: One event, keyed by the historical_weather column names.
+    """
+    lower, upper = date_range_bounds(start_date, end_date)
+    conn = open_database(db_path)
+    query = f"""
+        SELECT {", ".join(WEATHER_COLUMNS)}, date_iso
         FROM historical_weather
-        WHERE date BETWEEN ? AND ?
-        ORDER BY date
+        WHERE (date_iso, id) > (?, ?) AND date_iso < ?
+        ORDER BY date_iso, id
+        LIMIT ?
+    """
+    try:
+        last_date, last_id = lower, -1
+        while True:
+            rows = conn.execute(query, (last_date, last_id, upper, batch_size)).fetchall()
+            for row in rows:
+                yield dict(zip(WEATHER_COLUMNS, row))
+            if len(rows) < batch_size:
+                break
+            last_date, last_id = rows[-1][-1], rows[-1][0]
+    finally:
+        conn.close()
+
+def iter_weather_chunks(db_path, start_date, end_date, chunk_size=10000):
+    """
+    Stream events between start_date and end_date as fixed-size DataFrame chunks.
+
+    Parameters:
+        db_path (str): Path to the SQLite database file.
+        start_date (str): Start date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format.
+        end_date (str): End date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format (inclusive).
+        chunk_size (int): Number of rows per DataFrame (the last chunk may be shorter).
+
+    Yields:
+        pd.DataFrame: Consecutive chunks of the query result.
+    """
+    chunk = []
+    for row in iter_weather_events(db_path, start_date, end_date, batch_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield pd.DataFrame(chunk, columns=WEATHER_COLUMNS)
+            chunk = []
+    if chunk:
+        yield pd.DataFrame(chunk, columns=WEATHER_COLUMNS)
+
+def search_weather_events(db_path, text, start_date=None, end_date=None, phrase=False, page=1, limit=10):
+    """
+    Full-text search over event descriptions, best matches first.
+
+    Parameters:
+        db_path (str): Path to the SQLite database file.
+        text (str): Keywords (all must match) or, with phrase=True, an exact phrase.
+        start_date (str, optional): Start date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format.
+        end_date (str, optional): End date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format (inclusive).
+        phrase (bool): Search for the words as one phrase.
+        page (int): 1-based page number.
+        limit (int): Number of rows per page.
+
+    Returns:
+        pd.DataFrame: Matching events with their bm25 rank (lower is better).
     """
-    df = pd.read_sql_query(query, conn, params=(start_date, end_date))
-    conn.close()
-    return df
+    if page < 1 or limit < 1:
+        raise ValueError("page and limit must be positive")
+    return _query_frame(db_path, select_search, text, start_date, end_date, phrase=phrase,
+                        limit=limit, offset=(page - 1) * limit)
 
-def display_results(df):
+def query_weather_in_bbox(db_path, min_lat, min_lon, max_lat, max_lon, start_date=None, end_date=None,
+                          page=1, limit=-1):
     """
-    Display the query results and plot a time series of temperature.
+    Query events inside a latitude/longitude bounding box using the R*Tree index.
+
+    Parameters:
+        db_path (str): Path to the SQLite database file.
+        min_lat, min_lon, max_lat, max_lon (float): Box corners in decimal degrees (south/west negative).
+        start_date (str, optional): Start date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format.
+        end_date (str, optional): End date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format (inclusive).
+        page (int): 1-based page number.
+        limit (int): Number of rows per page, -1 for every match.
+
+    Returns:
+        pd.DataFrame: Matching events with their parsed latitude/longitude, ordered by date.
+    """
+    return _query_frame(db_path, select_in_bbox, min_lat, min_lon, max_lat, max_lon, start_date, end_date,
+                        **_page_bounds(page, limit))
+
+def query_weather_near(db_path, lat, lon, radius_km, start_date=None, end_date=None, page=1, limit=-1):
+    """
+    Query events within radius_km (great-circle distance) of a point.
+
+    Parameters:
+        db_path (str): Path to the SQLite database file.
+        lat, lon (float): Centre point in decimal degrees (south/west negative).
+        radius_km (float): Search radius in kilometres.
+        start_date (str, optional): Start date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format.
+        end_date (str, optional): End date in 'YYYY/MM/DD' or 'YYYY-MM-DD' format (inclusive).
+        page (int): 1-based page number.
+        limit (int): Number of rows per page, -1 for every match.
+
+    Returns:
+        pd.DataFrame: Matching events with latitude, longitude and distance_km, nearest first.
+    """
+    return _query_frame(db_path, select_near, lat, lon, radius_km, start_date, end_date, **_page_bounds(page, limit))
+
+def print_event(row):
+    """
+    Print a single weather event.
+
+    Parameters:
+        row (dict): Event keyed by column name, with 'date' already formatted for display.
+    """
+    print("-------------------------------------------------")
+    print(f"Date: {row['date']}")
+    if pd.notnull(row.get('location')):
+        # Format the coordinates nicely if needed
+        formatted_coords = row['location']
+        print(f"Location: {formatted_coords}")
+    if pd.notnull(row.get('distance_km')):
+        print(f"Distance: {row['distance_km']:.1f} km")
+    if pd.notnull(row.get('temperature')):
+        print(f"Temperature: {row['temperature']} °C")
+    if pd.notnull(row.get('precipitation')):
+        print(f"Precipitation: {row['precipitation']} mm")
+    if pd.notnull(row.get('wind_speed')):
+        print(f"Wind Speed: {row['wind_speed']} km/h")
+    if pd.notnull(row.get('wind_direction')):
+        print(f"Wind Direction: {row['wind_direction']}")
+    if pd.notnull(row.get('additional_info')):
+        print(f"Description: {row['additional_info']}")
+    print("-------------------------------------------------")
+
+@span("retrowx.print")
+def display_results(df, max_rows=10):
+    """
+    Display the query results.
     
     For each row in the query result, display main weather values including:
       - date
@@ -40,6 +219,7 @@ def display_results(df):
     
     Parameters:
         df (pd.DataFrame): The historical weather data.
+        max_rows (int): Maximum number of rows to print.
     """
     if df.empty:
         print("No weather events found for the specified date range.")
@@ -49,46 +229,101 @@ def display_results(df):
     df['date'] = pd.to_datetime(df['date'])
     print("===========================")
     print("Historical Weather Event(s) entries found:")
-    # Loop over the first 10 rows and print details
-    for i, row in df.iterrows():
-        print("-------------------------------------------------")
-        print(f"Date: {row['date'].strftime('%Y-%m-%d')}")
-        if 'location' in df.columns and pd.notnull(row['location']):
-            # Format the coordinates nicely if needed
-            formatted_coords = row['location']
-            print(f"Location: {formatted_coords}")
-        if 'temperature' in df.columns and pd.notnull(row['temperature']):
-            print(f"Temperature: {row['temperature']} °C")
-        if 'precipitation' in df.columns and pd.notnull(row['precipitation']):
-            print(f"Precipitation: {row['precipitation']} mm")
-        if 'wind_speed' in df.columns and pd.notnull(row['wind_speed']):
-            print(f"Wind Speed: {row['wind_speed']} km/h")
-        if 'wind_direction' in df.columns and pd.notnull(row['wind_direction']):
-            print(f"Wind Direction: {row['wind_direction']}")
-        if 'additional_info' in df.columns and pd.notnull(row['additional_info']):
-            print(f"Description: {row['additional_info']}")
-        print("-------------------------------------------------")
-        if i >= 9:  # display only first 10 rows
-            break
-
-
-
-def main():
+    for row in df.head(max_rows).to_dict('records'):
+        row['date'] = row['date'].strftime('%Y-%m-%d')
+        print_event(row)
+
+def display_stream(rows):
+    """
+    Print every event from an iterator of rows without collecting them first.
+
+    Parameters:
+        rows (iterable): Events as yielded by iter_weather_events.
+    """
+    count = 0
+    for row in rows:
+        if count == 0:
+            print("===========================")
+            print("Historical Weather Event(s) entries found:")
+        try:
+            row['date'] = normalize_date(row['date'])
+        except ValueError:
+            pass
+        print_event(row)
+        count += 1
+    if count == 0:
+        print("No weather events found for the specified date range.")
+    else:
+        print(f"{count} event(s) shown.")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="RetroWx - query the historical weather events database.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Path to the SQLite database file (default: the bundled RetroWx/database one)")
+    parser.add_argument("--start", help="Start date (YYYY/MM/DD or YYYY-MM-DD); prompted for if omitted")
+    parser.add_argument("--end", help="End date (YYYY/MM/DD or YYYY-MM-DD); prompted for if omitted")
+    parser.add_argument("--page", type=int, default=1, help="Page of results to show (default: 1)")
+    parser.add_argument("--limit", type=int, default=10, help="Results per page (default: 10)")
+    parser.add_argument("--all", action="store_true", help="Stream every matching event instead of a single page")
+    parser.add_argument("--near", metavar="LAT,LON", help="Only show events near this point (south/west negative)")
+    parser.add_argument("--radius", type=float, default=50.0, help="Search radius in km for --near (default: 50)")
+    parser.add_argument("--bbox", metavar="MIN_LAT,MIN_LON,MAX_LAT,MAX_LON", help="Only show events inside this box")
+    parser.add_argument("--search", metavar="TEXT", help="Search event descriptions, best matches first")
+    parser.add_argument("--phrase", action="store_true", help="Treat --search as an exact phrase")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     print("Welcome to RetroWx!")
     print("A program/script that is a part of the TempestPy Weather Enthusiast Suite")
     print(f"Version {version}")
     print("by Blaine Palmer")
     print("===========================")
     
-    # Fixed database path:
-    db_path = "database/historicalweatherevents.db"
+    db_path = args.db
     print(f"Using database at: {db_path}")
     
-    start_date = input("Enter the start date (YYYY/MM/DD): ").strip()
-    end_date = input("Enter the end date (YYYY/MM/DD): ").strip()
+    if args.search:
+        try:
+            df = search_weather_events(db_path, args.search, args.start, args.end, phrase=args.phrase,
+                                       page=args.page, limit=args.limit)
+        except ValueError as e:
+            print(f"Invalid input: {e}")
+            return
+        display_results(df, max_rows=args.limit)
+        return
 
-    df = query_weather_database(db_path, start_date, end_date)
-    display_results(df)
+    if args.near or args.bbox:
+        # Spatial searches don't need a date range, so don't prompt for one
+        try:
+            if args.near:
+                lat, lon = (float(part) for part in args.near.split(","))
+                df = query_weather_near(db_path, lat, lon, args.radius, args.start, args.end,
+                                        page=args.page, limit=args.limit)
+            else:
+                min_lat, min_lon, max_lat, max_lon = (float(part) for part in args.bbox.split(","))
+                df = query_weather_in_bbox(db_path, min_lat, min_lon, max_lat, max_lon, args.start, args.end,
+                                           page=args.page, limit=args.limit)
+        except ValueError as e:
+            print(f"Invalid input: {e}")
+            return
+        display_results(df, max_rows=args.limit)
+        return
+
+    start_date = args.start or input("Enter the start date (YYYY/MM/DD): ").strip()
+    end_date = args.end or input("Enter the end date (YYYY/MM/DD): ").strip()
+
+    try:
+        if args.all:
+            display_stream(iter_weather_events(db_path, start_date, end_date))
+            return
+        df = query_weather_page(db_path, start_date, end_date, page=args.page, limit=args.limit)
+    except ValueError as e:
+        print(f"Invalid input: {e}")
+        return
+    display_results(df, max_rows=args.limit)
+    if len(df) == args.limit:
+        print(f"Page {args.page} shown. Use --page {args.page + 1} to see more.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,446 @@
+import os
+import re
+import sqlite3
+from datetime import date, datetime, timedelta
+
+# The bundled database, found from any working directory
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "database", "historicalweatherevents.db")
+
+# Columns of the original historical_weather table, in the order RetroWx shows them.
+# Internal helper columns added by migrations (date_iso, ...) are left out on purpose.
+WEATHER_COLUMNS = ["id", "date", "temperature", "precipitation", "wind_speed",
+                   "wind_direction", "pressure", "additional_info", "location"]
+
+# The one date syntax RetroWx accepts: 'YYYY/M/D' or 'YYYY-M-D' (one- or two-digit month and day),
+# optionally followed by spaces or 'T' and an 'H:M' or 'H:M:S' time. _date_iso_sql parses the same grammar.
+_DATE_RE = re.compile(r"([0-9]{4})[/-]([0-9]{1,2})[/-]([0-9]{1,2})"
+                      r"(?:(?: +|T)([0-9]{1,2}):([0-9]{1,2})(?::([0-9]{1,2}))?)?")
+# Whitespace stripped around a date, the same characters the triggers pass to trim()
+_DATE_WHITESPACE = " \t\n\r\v\f"
+
+def normalize_date(value):
+    """
+    Convert a RetroWx date into its sortable ISO form.
+
+    Parameters:
+        value (str): Date in 'YYYY/MM/DD' or ISO 'YYYY-MM-DD' form, optionally with an 'HH:MM[:SS]'
+            time after a space or 'T'. Single-digit fields are padded.
+
+    Returns:
+        str: 'YYYY-MM-DD' for plain dates, 'YYYY-MM-DDTHH:MM:SS' when a time was given.
+
+    Raises:
+        ValueError: If the value is not in the accepted format or names an impossible date or time.
+    """
+    match = _DATE_RE.fullmatch(str(value).strip(_DATE_WHITESPACE))
+    if not match:
+        raise ValueError(f"Unrecognised date '{value}', expected YYYY/MM/DD or YYYY-MM-DD")
+    year, month, day, hour, minute, second = match.groups()
+    try:
+        # date()/datetime() still validate the fields, the regex only checks their shape
+        if hour is None:
+            return date(int(year), int(month), int(day)).isoformat()
+        parsed = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second or 0))
+    except ValueError as error:
+        raise ValueError(f"Invalid date '{value}': {error}") from None
+    return parsed.strftime("%Y-%m-%dT%H:%M:%S")
+
+def date_range_bounds(start_date, end_date):
+    """
+    Turn an inclusive start/end date pair into half-open ISO bounds for the date_iso index.
+
+    The end bound is the day after end_date, so every timestamp on end_date is included.
+
+    Returns:
+        tuple: (lower, upper) strings to be used as `date_iso >= lower AND date_iso < upper`.
+    """
+    lower = normalize_date(start_date)
+    upper = normalize_date(end_date)
+    if "T" in upper:
+        upper = (datetime.strptime(upper, "%Y-%m-%dT%H:%M:%S") + timedelta(seconds=1)).strftime("%Y-%m-%dT%H:%M:%S")
+    else:
+        upper = (date.fromisoformat(upper) + timedelta(days=1)).isoformat()
+    return lower, upper
+
+# A coordinate is a signed number, an optional degree sign and an optional hemisphere letter,
+# e.g. "35.39° N 97.55°W", "35.39N, 97.55W" or "35.39, -97.55"
+_COORDINATE_RE = re.compile(r"([-+]?\d+(?:\.\d+)?)\s*°?\s*([NSEWnsew])?")
+
+def parse_location(value):
+    """
+    Parse a free-text location into numeric coordinates.
+
+    Parameters:
+        value (str): Location such as "35.39° N 97.55°W" or "35.39, -97.55".
+
+    Returns:
+        tuple: (latitude, longitude) in decimal degrees (south/west negative), or None if unparseable.
+    """
+    if value is None:
+        return None
+    matches = _COORDINATE_RE.findall(str(value))
+    if len(matches) != 2:
+        return None
+    coords = []
+    for number, hemisphere in matches:
+        coord = float(number)
+        if hemisphere.upper() in ("S", "W"):
+            coord = -abs(coord)
+        coords.append((coord, hemisphere.upper()))
+    (lat, lat_hemi), (lon, lon_hemi) = coords
+    # Allow longitude-first strings such as "97.55 W 35.39 N"
+    if lat_hemi in ("E", "W") and lon_hemi in ("N", "S"):
+        lat, lon = lon, lat
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return lat, lon
+
+def _sql_parse_coordinate(value, index):
+    coords = parse_location(value)
+    return coords[index] if coords else None
+
+def _sql_normalize_date(value):
+    # Registered as a SQL function so migrations can normalize rows without leaving SQLite
+    if value is None:
+        return None
+    try:
+        return normalize_date(value)
+    except ValueError:
+        return None
+
+# Migration 1: the table RetroWx has always used (only created for brand new databases)
+def _create_base_table(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS historical_weather (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            temperature REAL,
+            precipitation REAL,
+            wind_speed REAL,
+            wind_direction REAL,
+            pressure REAL,
+            additional_info TEXT,
+            location TEXT (256)
+        )
+    """)
+
+# Plain-SQL twin of normalize_date for the date_iso triggers, which have to work on
+# connections without our Python functions (e.g. SQLiteStudio). It parses the same grammar
+# as _DATE_RE and pads the result the same way; anything else becomes NULL rather than a
+# half-normalized value that sorts in the wrong place.
+def _date_iso_sql(value):
+    return f"""(
+        SELECT CASE
+            WHEN year NOT GLOB '[0-9][0-9][0-9][0-9]' OR year = '0000' OR sep <> '-'
+                OR NOT (month GLOB '[0-9]' OR month GLOB '[0-9][0-9]')
+                OR NOT (day GLOB '[0-9]' OR day GLOB '[0-9][0-9]')
+                OR date(julianday(day_iso)) IS NOT day_iso THEN NULL
+            WHEN tail = '' THEN day_iso
+            WHEN clock IS NULL
+                OR NOT (hour GLOB '[0-9]' OR hour GLOB '[0-9][0-9]')
+                OR NOT (minute GLOB '[0-9]' OR minute GLOB '[0-9][0-9]')
+                OR NOT (second GLOB '[0-9]' OR second GLOB '[0-9][0-9]')
+                OR CAST(hour AS INTEGER) > 23 OR CAST(minute AS INTEGER) > 59 OR CAST(second AS INTEGER) > 59 THEN NULL
+            ELSE printf('%sT%02d:%02d:%02d', day_iso, hour, minute, second)
+        END
+        FROM (
+            SELECT year, sep, month, day, day_iso, tail, clock,
+                   substr(clock, 1, instr(clock, ':') - 1) AS hour,
+                   CASE WHEN instr(after_hour, ':') > 0 THEN substr(after_hour, 1, instr(after_hour, ':') - 1)
+                        ELSE after_hour END AS minute,
+                   CASE WHEN instr(after_hour, ':') > 0 THEN substr(after_hour, instr(after_hour, ':') + 1)
+                        ELSE '0' END AS second
+            FROM (
+                SELECT year, sep, month, day, day_iso, tail, clock, substr(clock, instr(clock, ':') + 1) AS after_hour
+                FROM (
+                    SELECT year, sep, month, day, tail, printf('%s-%02d-%02d', year, month, day) AS day_iso,
+                           CASE WHEN substr(tail, 1, 1) = 'T' THEN substr(tail, 2)
+                                WHEN substr(tail, 1, 1) = ' ' THEN ltrim(tail, ' ') END AS clock
+                    FROM (
+                        SELECT year, sep, month, day, substr(rest, length(day) + 1) AS tail
+                        FROM (
+                            SELECT year, sep, month, rest,
+                                   CASE WHEN substr(rest, 2, 1) GLOB '[0-9]' THEN substr(rest, 1, 2) ELSE substr(rest, 1, 1) END AS day
+                            FROM (
+                                SELECT year, sep, substr(rest, 1, instr(rest, '-') - 1) AS month, substr(rest, instr(rest, '-') + 1) AS rest
+                                FROM (SELECT substr(d, 1, 4) AS year, substr(d, 5, 1) AS sep, substr(d, 6) AS rest
+                                      FROM (SELECT replace(trim({value}, ' ' || char(9, 10, 13, 11, 12)), '/', '-') AS d))
+                                WHERE instr(rest, '-') > 0
+                            )
+                        )
+                    )
+                )
+            )
+        )
+    )"""
+
+def _create_date_iso_triggers(conn):
+    # Rows added outside RetroWx (e.g. in SQLiteStudio) only fill in `date`, so derive date_iso for them
+    conn.execute(f"""
+        CREATE TRIGGER historical_weather_date_iso_insert
+        AFTER INSERT ON historical_weather
+        WHEN NEW.date_iso IS NULL
+        BEGIN
+            UPDATE historical_weather SET date_iso = {_date_iso_sql("NEW.date")} WHERE id = NEW.id;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER historical_weather_date_iso_update
+        AFTER UPDATE OF date ON historical_weather
+        WHEN NEW.date_iso IS OLD.date_iso
+        BEGIN
+            UPDATE historical_weather SET date_iso = {_date_iso_sql("NEW.date")} WHERE id = NEW.id;
+        END
+    """)
+
+# Migration 2: normalized, indexed date column so range queries stop scanning the table
+def _add_date_iso(conn):
+    conn.execute("ALTER TABLE historical_weather ADD COLUMN date_iso TEXT")
+    conn.execute("UPDATE historical_weather SET date_iso = retrowx_normalize_date(date)")
+    conn.execute("CREATE INDEX idx_historical_weather_date_iso ON historical_weather (date_iso)")
+    _create_date_iso_triggers(conn)
+
+# Migration 3: numeric coordinates plus an R*Tree so spatial searches don't parse every location string
+def _add_coordinates(conn):
+    conn.execute("ALTER TABLE historical_weather ADD COLUMN latitude REAL")
+    conn.execute("ALTER TABLE historical_weather ADD COLUMN longitude REAL")
+    conn.execute("""
+        UPDATE historical_weather
+        SET latitude = retrowx_parse_coordinate(location, 0), longitude = retrowx_parse_coordinate(location, 1)
+    """)
+    # Rows added outside RetroWx only have the text location; this partial index lets
+    # fill_missing_coordinates find them without a table scan.
+    conn.execute("""
+        CREATE INDEX idx_historical_weather_missing_coordinates ON historical_weather (id)
+        WHERE latitude IS NULL AND location IS NOT NULL
+    """)
+    conn.execute("CREATE VIRTUAL TABLE historical_weather_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon)")
+    conn.execute("""
+        INSERT INTO historical_weather_rtree
+        SELECT id, latitude, latitude, longitude, longitude FROM historical_weather WHERE latitude IS NOT NULL
+    """)
+    conn.execute("""
+        CREATE TRIGGER historical_weather_rtree_insert
+        AFTER INSERT ON historical_weather
+        WHEN NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL
+        BEGIN
+            INSERT INTO historical_weather_rtree VALUES (NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER historical_weather_rtree_update
+        AFTER UPDATE OF latitude, longitude ON historical_weather
+        BEGIN
+            DELETE FROM historical_weather_rtree WHERE id = OLD.id;
+            INSERT INTO historical_weather_rtree
+            SELECT NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude
+            WHERE NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER historical_weather_rtree_delete
+        AFTER DELETE ON historical_weather
+        BEGIN
+            DELETE FROM historical_weather_rtree WHERE id = OLD.id;
+        END
+    """)
+
+# Migration 4: (date_iso, location) index so bulk imports can skip events that are already stored.
+# The date-only index stays: range, page and keyset queries ORDER BY date_iso, id, and that index is
+# (date_iso, rowid) = (date_iso, id), so they are index seeks in order without a temp B-tree.
+def _add_event_key_index(conn):
+    conn.execute("CREATE INDEX idx_historical_weather_date_location ON historical_weather (date_iso, location)")
+
+# Measurements summarized by the daily/monthly rollup tables
+ROLLUP_FIELDS = ["temperature", "precipitation", "wind_speed", "pressure"]
+
+def _rollup_table_sql(name, period_column):
+    columns = ", ".join(f"{field}_count INTEGER, {field}_min REAL, {field}_max REAL, {field}_sum REAL"
+                        for field in ROLLUP_FIELDS)
+    # Events without a location are rolled up under ''
+    return f"""
+        CREATE TABLE {name} (
+            location TEXT NOT NULL,
+            {period_column} TEXT NOT NULL,
+            event_count INTEGER NOT NULL,
+            {columns},
+            PRIMARY KEY (location, {period_column})
+        ) WITHOUT ROWID
+    """
+
+# Migration 5: materialized daily/monthly climatology rollups. Triggers only record which
+# days changed; rollups.refresh_rollups recomputes just those days and their months.
+def _add_rollups(conn):
+    conn.execute(_rollup_table_sql("weather_daily", "day"))
+    conn.execute(_rollup_table_sql("weather_monthly", "month"))
+    # Refreshes replace whole days/months, so they need to find rows by period as well
+    conn.execute("CREATE INDEX idx_weather_daily_day ON weather_daily (day)")
+    conn.execute("CREATE INDEX idx_weather_monthly_month ON weather_monthly (month)")
+    conn.execute("CREATE TABLE weather_rollup_dirty (day TEXT PRIMARY KEY) WITHOUT ROWID")
+    # Every existing day starts out dirty, the first refresh builds the rollups from scratch
+    conn.execute("""
+        INSERT OR IGNORE INTO weather_rollup_dirty
+        SELECT DISTINCT substr(date_iso, 1, 10) FROM historical_weather WHERE date_iso IS NOT NULL
+    """)
+    conn.execute("""
+        CREATE TRIGGER historical_weather_rollup_insert
+        AFTER INSERT ON historical_weather
+        WHEN NEW.date_iso IS NOT NULL
+        BEGIN
+            INSERT OR IGNORE INTO weather_rollup_dirty VALUES (substr(NEW.date_iso, 1, 10));
+        END
+    """)
+    watched = ", ".join(["date_iso", "location"] + ROLLUP_FIELDS)
+    conn.execute(f"""
+        CREATE TRIGGER historical_weather_rollup_update
+        AFTER UPDATE OF {watched} ON historical_weather
+        BEGIN
+            INSERT OR IGNORE INTO weather_rollup_dirty
+            SELECT substr(OLD.date_iso, 1, 10) WHERE OLD.date_iso IS NOT NULL
+            UNION SELECT substr(NEW.date_iso, 1, 10) WHERE NEW.date_iso IS NOT NULL;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER historical_weather_rollup_delete
+        AFTER DELETE ON historical_weather
+        WHEN OLD.date_iso IS NOT NULL
+        BEGIN
+            INSERT OR IGNORE INTO weather_rollup_dirty VALUES (substr(OLD.date_iso, 1, 10));
+        END
+    """)
+
+# Migration 6: FTS5 index over the event descriptions, kept in sync by triggers.
+# It is an external-content table, so the text itself is only stored once. Every row
+# gets an index entry (even without a description) so FTS5's document counts stay consistent.
+def _add_description_search(conn):
+    conn.execute("""
+        CREATE VIRTUAL TABLE historical_weather_fts USING fts5(
+            additional_info, content='historical_weather', content_rowid='id', tokenize='porter unicode61'
+        )
+    """)
+    conn.execute("INSERT INTO historical_weather_fts (historical_weather_fts) VALUES ('rebuild')")
+    conn.execute("""
+        CREATE TRIGGER historical_weather_fts_insert
+        AFTER INSERT ON historical_weather
+        BEGIN
+            INSERT INTO historical_weather_fts (rowid, additional_info) VALUES (NEW.id, NEW.additional_info);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER historical_weather_fts_update
+        AFTER UPDATE OF additional_info ON historical_weather
+        BEGIN
+            INSERT INTO historical_weather_fts (historical_weather_fts, rowid, additional_info)
+            VALUES ('delete', OLD.id, OLD.additional_info);
+            INSERT INTO historical_weather_fts (rowid, additional_info) VALUES (NEW.id, NEW.additional_info);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER historical_weather_fts_delete
+        AFTER DELETE ON historical_weather
+        BEGIN
+            INSERT INTO historical_weather_fts (historical_weather_fts, rowid, additional_info)
+            VALUES ('delete', OLD.id, OLD.additional_info);
+        END
+    """)
+
+# Migration 7: remember locations that didn't parse, so fill_missing_coordinates (run on every
+# open) stops re-reading them on every query. Editing a location clears the flag.
+def _add_coordinates_checked(conn):
+    conn.execute("ALTER TABLE historical_weather ADD COLUMN coordinates_checked INTEGER")
+    conn.execute("DROP INDEX idx_historical_weather_missing_coordinates")
+    conn.execute("""
+        CREATE INDEX idx_historical_weather_missing_coordinates ON historical_weather (id)
+        WHERE latitude IS NULL AND location IS NOT NULL AND coordinates_checked IS NULL
+    """)
+    conn.execute("""
+        CREATE TRIGGER historical_weather_coordinates_recheck
+        AFTER UPDATE OF location ON historical_weather
+        WHEN NEW.coordinates_checked IS NOT NULL
+        BEGIN
+            UPDATE historical_weather SET coordinates_checked = NULL WHERE id = NEW.id;
+        END
+    """)
+
+# Ordered list of migrations; PRAGMA user_version records how many have been applied.
+MIGRATIONS = [
+    _create_base_table,
+    _add_date_iso,
+    _add_coordinates,
+    _add_event_key_index,
+    _add_rollups,
+    _add_description_search,
+    _add_coordinates_checked,
+]
+
+def migrate(conn):
+    """
+    Bring a RetroWx database up to the current schema in place.
+
+    Each migration runs in its own transaction and bumps PRAGMA user_version,
+    so existing rows are kept and an interrupted upgrade can simply be re-run.
+
+    Parameters:
+        conn (sqlite3.Connection): Open read-write connection.
+    """
+    conn.create_function("retrowx_normalize_date", 1, _sql_normalize_date, deterministic=True)
+    conn.create_function("retrowx_parse_coordinate", 2, _sql_parse_coordinate, deterministic=True)
+    current = conn.execute("PRAGMA user_version").fetchone()[0]
+    for version, migration in enumerate(MIGRATIONS, 1):
+        if version <= current:
+            continue
+        # Explicit BEGIN so the DDL statements are part of the same transaction as the data changes
+        conn.execute("BEGIN")
+        try:
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+
+def fill_missing_coordinates(conn):
+    """
+    Parse coordinates for rows that were inserted with only a text location.
+
+    Locations that don't parse are flagged as checked, so each row is only looked at once.
+
+    Parameters:
+        conn (sqlite3.Connection): Open read-write connection to a migrated database.
+
+    Returns:
+        int: Number of rows that received coordinates.
+    """
+    rows = conn.execute("""
+        SELECT id, location FROM historical_weather INDEXED BY idx_historical_weather_missing_coordinates
+        WHERE latitude IS NULL AND location IS NOT NULL AND coordinates_checked IS NULL
+    """).fetchall()
+    updates = []
+    unparsed = []
+    for row_id, location in rows:
+        coords = parse_location(location)
+        if coords:
+            updates.append((coords[0], coords[1], row_id))
+        else:
+            unparsed.append((row_id,))
+    if rows:
+        with conn:
+            conn.executemany("UPDATE historical_weather SET latitude = ?, longitude = ? WHERE id = ?", updates)
+            conn.executemany("UPDATE historical_weather SET coordinates_checked = 1 WHERE id = ?", unparsed)
+    return len(updates)
+
+def open_database(db_path, **connect_args):
+    """
+    Open a RetroWx database, applying any pending schema migrations first.
+
+    Parameters:
+        db_path (str): Path to the SQLite database file.
+        **connect_args: Extra keyword arguments for sqlite3.connect.
+
+    Returns:
+        sqlite3.Connection: Connection to the migrated database.
+    """
+    conn = sqlite3.connect(db_path, **connect_args)
+    migrate(conn)
+    fill_missing_coordinates(conn)
+    return conn
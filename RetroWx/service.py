@@ -0,0 +1,286 @@
+import argparse
+import asyncio
+import json
+import os
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import parse_qsl, quote, urlsplit
+
+from queries import select_in_bbox, select_near, select_range, select_search
+from rollups import refresh_rollups, select_rollup
+from schema import DEFAULT_DB_PATH, open_database
+
+version = "0.0.0.1"
+
+class ConnectionPool:
+    """
+    Fixed-size pool of read-only SQLite connections.
+
+    Every connection keeps its own prepared statement cache (`cached_statements`), so the
+    handful of query shapes the service runs are only compiled once per connection.
+    """
+
+    def __init__(self, db_path, size=8, cached_statements=256):
+        uri = f"file:{quote(os.path.abspath(db_path))}?mode=ro"
+        self.size = size
+        self._idle = queue.Queue()
+        for _ in range(size):
+            self._idle.put(sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                           cached_statements=cached_statements))
+        # Dedicated connection for PRAGMA data_version, which changes whenever another connection commits
+        self._watch = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._watch_lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def data_version(self):
+        with self._watch_lock:
+            return self._watch.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        for _ in range(self.size):
+            self._idle.get().close()
+        self._watch.close()
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of query results, keyed by endpoint and parameters.
+
+    The whole cache is dropped as soon as the database changes (see QueryService.run).
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+
+    def get(self, key, version):
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, version, value):
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+def _int(params, name, default):
+    return int(params.get(name, default))
+
+def _float(params, name):
+    if name not in params:
+        raise ValueError(f"missing parameter '{name}'")
+    return float(params[name])
+
+def _page(params):
+    page, limit = _int(params, "page", 1), _int(params, "limit", 100)
+    if page < 1 or not 1 <= limit <= 10000:
+        raise ValueError("page must be positive and limit between 1 and 10000")
+    return limit, (page - 1) * limit
+
+# Endpoint name -> function(conn, params) returning (columns, rows)
+def _events(conn, params):
+    limit, offset = _page(params)
+    return select_range(conn, params["start"], params["end"], limit=limit, offset=offset)
+
+def _near(conn, params):
+    limit, offset = _page(params)
+    return select_near(conn, _float(params, "lat"), _float(params, "lon"), float(params.get("radius_km", 50)),
+                       params.get("start"), params.get("end"), limit=limit, offset=offset)
+
+def _bbox(conn, params):
+    limit, offset = _page(params)
+    return select_in_bbox(conn, _float(params, "min_lat"), _float(params, "min_lon"),
+                          _float(params, "max_lat"), _float(params, "max_lon"), params.get("start"), params.get("end"),
+                          limit=limit, offset=offset)
+
+def _search(conn, params):
+    limit, offset = _page(params)
+    return select_search(conn, params["q"], params.get("start"), params.get("end"),
+                         phrase=params.get("phrase") in ("1", "true"), limit=limit, offset=offset)
+
+def _rollup(conn, params):
+    return select_rollup(conn, params.get("period", "monthly"), params.get("location", ""),
+                         params["start"], params["end"])
+
+ENDPOINTS = {
+    "/events": _events,
+    "/near": _near,
+    "/bbox": _bbox,
+    "/search": _search,
+    "/rollup": _rollup,
+}
+
+class QueryService:
+    """
+    Local JSON query service for RetroWx.
+
+    Requests are parsed on the asyncio loop and the SQL runs on a thread pool the same
+    size as the connection pool, so concurrent clients never wait for a connection to open.
+    One read-write connection is kept for refreshing the rollups of days changed by other
+    writers (e.g. an ingest) before /rollup answers.
+    """
+
+    def __init__(self, db_path, pool_size=8, cache_entries=1024):
+        # The read-write open applies pending migrations and switches the file to WAL,
+        # which lets the read-only pool run while an ingest is writing
+        self._writer = open_database(db_path, check_same_thread=False)
+        self._writer.execute("PRAGMA journal_mode = WAL")
+        self._writer_lock = threading.Lock()
+        self.pool = ConnectionPool(db_path, pool_size)
+        self._rollups_version = None
+        self._refresh_rollups()
+        self.cache = ResultCache(cache_entries)
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="retrowx-query")
+
+    def _refresh_rollups(self):
+        # Recompute dirty days if anyone committed since the last refresh. Returns the data
+        # version the rollups are now current for (our own refresh commit bumps it too).
+        version = self.pool.data_version()
+        if version == self._rollups_version:
+            return version
+        with self._writer_lock:
+            if self.pool.data_version() != self._rollups_version:
+                refresh_rollups(self._writer)
+                self._rollups_version = self.pool.data_version()
+        return self._rollups_version
+
+    def run(self, path, params):
+        """
+        Answer one request synchronously.
+
+        Returns:
+            tuple: (HTTP status, JSON-serializable body)
+        """
+        if path == "/stats":
+            return 200, {"cache": self.cache.stats(), "pool_size": self.pool.size}
+        endpoint = ENDPOINTS.get(path)
+        if endpoint is None:
+            return 404, {"error": f"unknown endpoint {path}", "endpoints": sorted(ENDPOINTS) + ["/stats"]}
+        key = (path, tuple(sorted(params.items())))
+        try:
+            version = self._refresh_rollups() if endpoint is _rollup else self.pool.data_version()
+        except sqlite3.OperationalError as e:
+            # Usually another process holding the write lock for longer than the busy timeout
+            return 503, {"error": f"could not refresh rollups: {e}"}
+        body = self.cache.get(key, version)
+        if body is not None:
+            return 200, body
+        try:
+            with self.pool.connection() as conn:
+                columns, rows = endpoint(conn, params)
+        except KeyError as e:
+            return 400, {"error": f"missing parameter {e}"}
+        except (ValueError, sqlite3.OperationalError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            # Anything else is our bug or a damaged database; answer instead of dropping the connection
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+        body = {"count": len(rows), "results": [dict(zip(columns, row)) for row in rows]}
+        self.cache.put(key, version, body)
+        return 200, body
+
+    async def handle_client(self, reader, writer):
+        # Minimal HTTP/1.1: GET requests with keep-alive, JSON responses
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3 or parts[0] != "GET":
+                    status, body = 405, {"error": "only GET is supported"}
+                else:
+                    url = urlsplit(parts[1])
+                    status, body = await loop.run_in_executor(self.executor, self.run, url.path,
+                                                              dict(parse_qsl(url.query)))
+                payload = json.dumps(body, default=str).encode("utf-8")
+                keep_alive = headers.get("connection", "").lower() != "close" and parts[-1] == "HTTP/1.1"
+                writer.write(f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                             f"Content-Type: application/json\r\n"
+                             f"Content-Length: {len(payload)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1"))
+                writer.write(payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, unix_socket=None):
+        if unix_socket:
+            server = await asyncio.start_unix_server(self.handle_client, path=unix_socket)
+            print(f"RetroWx query service listening on {unix_socket}")
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+            print(f"RetroWx query service listening on http://{host}:{server.sockets[0].getsockname()[1]}")
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown()
+        self.pool.close()
+        self._writer.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RetroWx query service - local JSON API over the weather database.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Path to the SQLite database file (default: the bundled RetroWx/database one)")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--unix-socket", help="Listen on this Unix socket instead of TCP")
+    parser.add_argument("--pool-size", type=int, default=8, help="Read-only connections / query threads (default: 8)")
+    parser.add_argument("--cache-entries", type=int, default=1024, help="Cached results (default: 1024)")
+    args = parser.parse_args(argv)
+
+    print("RetroWx Query Service")
+    print("A program/script that is a part of the TempestPy Weather Enthusiast Suite")
+    print(f"Version {version}")
+    print("===========================")
+    service = QueryService(args.db, args.pool_size, args.cache_entries)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix_socket))
+    except KeyboardInterrupt:
+        print("Shutting down.")
+    finally:
+        service.close()
+
+if __name__ == "__main__":
+    main()
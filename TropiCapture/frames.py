@@ -0,0 +1,209 @@
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+import tkinter
+
+from PIL import Image, ImageTk
+
+if __name__ == "__main__":
+    # Started as a script from this folder: the shared tempestpy package is one directory up
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tempestpy.trace import span
+
+# GIFs that leave out a frame duration (or ask for 0) play at the old fixed 100 ms rate
+DEFAULT_FRAME_MS = 100
+# Browsers clamp very short GIF delays the same way; a 0-20 ms delay means "as fast as the viewer likes"
+MIN_FRAME_MS = 20
+
+def frame_duration(image):
+    """
+    Display time in ms of the frame `image` is currently seeked to.
+    """
+    duration = image.info.get("duration") or DEFAULT_FRAME_MS
+    return max(int(duration), MIN_FRAME_MS)
+
+def decode_frames(image, max_size=None):
+    """
+    Decode every frame of an animated image once.
+
+    Parameters:
+        image (PIL.Image.Image): Animated GIF (or any multi-frame image).
+        max_size (int, optional): Downscale frames so their longest side fits, bounding memory use.
+
+    Yields:
+        tuple: (RGBA frame as a standalone PIL image, duration in ms)
+    """
+    for index in range(getattr(image, "n_frames", 1)):
+        with span("tropicapture.decode", frame=index):
+            image.seek(index)
+            frame = image.convert("RGBA")
+            if max_size:
+                frame.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+        yield frame, frame_duration(image)
+
+class FramePlayer:
+    """
+    Plays an animation in a Tk label from frames decoded once, off the UI thread.
+
+    A worker thread decodes the GIF and hands frames over through a queue; the Tk thread
+    only turns each frame into a PhotoImage once and then cycles through the cached list,
+    so playback costs a label update per tick. Playback starts with the first decoded
+    frame and loops over whatever has arrived until decoding finishes. Each frame stays
+    up for its own GIF duration. If decoding fails before the first frame, the label shows
+    the error and playback stops.
+    """
+
+    def __init__(self, root, label, image, max_size=None):
+        self.root = root
+        self.label = label
+        self.frames = []  # (PhotoImage, duration ms)
+        self.decoded = False
+        self.error = None  # exception that stopped decoding, if any
+        self.shown = 0
+        self._index = 0
+        self._incoming = queue.Queue()
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        threading.Thread(target=self._decode, args=(image, max_size), daemon=True).start()
+
+    def _decode(self, image, max_size):
+        try:
+            for frame in decode_frames(image, max_size):
+                self._incoming.put(frame)
+        except Exception as error:
+            # Dying silently here would leave the Tk thread polling for frames forever
+            self._incoming.put(error)
+        finally:
+            self._incoming.put(None)
+
+    def _collect(self):
+        # Turn newly decoded frames into PhotoImages (Tk objects must be made on the Tk thread)
+        while True:
+            try:
+                item = self._incoming.get_nowait()
+            except queue.Empty:
+                return
+            if item is None:
+                self.decoded = True
+                return
+            if isinstance(item, Exception):
+                self.error = item
+                continue
+            frame, duration = item
+            self.frames.append((ImageTk.PhotoImage(frame), duration))
+
+    def start(self):
+        self._tick()
+
+    def _tick(self):
+        if not self.decoded:
+            self._collect()
+        if not self.frames:
+            if self.decoded:
+                # Decoding is over and there is nothing to play
+                self.label.config(text=f"Could not play the animation: {self.error or 'it has no frames'}")
+                return
+            self.root.after(10, self._tick)
+            return
+        self._index %= len(self.frames)
+        photo, duration = self.frames[self._index]
+        self.label.config(image=photo)
+        self.shown += 1
+        self._index += 1
+        self.root.after(duration, self._tick)
+
+    def stats(self):
+        """
+        Playback statistics since the player started.
+
+        Returns:
+            dict: frames shown, frames cached, frames per second and CPU use of the process in %.
+        """
+        elapsed = time.perf_counter() - self._started
+        cpu = time.process_time() - self._cpu_started
+        return {
+            "frames_shown": self.shown,
+            "frames_cached": len(self.frames),
+            "fps": self.shown / elapsed if elapsed else 0.0,
+            "cpu_percent": 100.0 * cpu / elapsed if elapsed else 0.0,
+        }
+
+def _hidden_tk():
+    # A withdrawn Tk window for timing PhotoImage work, or None when there is no display
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError:
+        return None
+    root.withdraw()
+    return root
+
+def benchmark(image, ticks=200, max_size=None):
+    """
+    Compare the per-tick cost of the old seek-every-frame loop with cached playback.
+
+    The old loop decoded a frame and built a new PhotoImage for it on every tick. Cached
+    playback pays for both once per frame (one_off_*), after which a tick only hands a
+    ready PhotoImage to the label, and that handoff is what cached_ms_per_tick times.
+    PhotoImages need a display: without one only the decode work can be measured, so the
+    PhotoImage/label parts are left out of legacy_ms_per_tick and the cached and photo
+    figures are None.
+
+    Returns:
+        dict: frames, legacy_ms_per_tick and cached_ms_per_tick (CPU ms), one_off_decode_ms
+            and one_off_photo_ms, and display (whether Tk could be used).
+    """
+    root = _hidden_tk()
+    label = tkinter.Label(root) if root else None
+    n_frames = getattr(image, "n_frames", 1)
+    started = time.process_time()
+    for tick in range(ticks):
+        image.seek(tick % n_frames)
+        frame = image.convert("RGBA")
+        if root:
+            photo = ImageTk.PhotoImage(frame)
+            label.config(image=photo)
+            root.update_idletasks()
+    legacy = (time.process_time() - started) / ticks
+
+    started = time.process_time()
+    frames = [frame for frame, _ in decode_frames(image, max_size)]
+    decode = time.process_time() - started
+    result = {"frames": n_frames, "legacy_ms_per_tick": legacy * 1000, "cached_ms_per_tick": None,
+              "one_off_decode_ms": decode * 1000, "one_off_photo_ms": None, "display": root is not None}
+    if root:
+        started = time.process_time()
+        photos = [ImageTk.PhotoImage(frame) for frame in frames]
+        result["one_off_photo_ms"] = (time.process_time() - started) * 1000
+        # What FramePlayer._tick does once the frames are cached
+        started = time.process_time()
+        for tick in range(ticks):
+            label.config(image=photos[tick % len(photos)])
+            root.update_idletasks()
+        result["cached_ms_per_tick"] = (time.process_time() - started) / ticks * 1000
+        root.destroy()
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure animation decode cost for a GIF (old loop vs cached frames).")
+    parser.add_argument("gif", help="Path to an animated GIF, e.g. a saved Force-13 floater loop")
+    parser.add_argument("--ticks", type=int, default=200, help="Playback ticks to simulate (default: 200)")
+    parser.add_argument("--max-size", type=int, help="Downscale frames to this longest side")
+    args = parser.parse_args(argv)
+    with Image.open(args.gif) as image:
+        result = benchmark(image, args.ticks, args.max_size)
+    print(f"{result['frames']} frames, decoded once in {result['one_off_decode_ms']:.1f} ms")
+    if not result["display"]:
+        # Without Tk only the decoding can be timed, which cached playback never repeats
+        print(f"Old loop:      {result['legacy_ms_per_tick']:.3f} ms CPU per tick decoding (no display: PhotoImage work not timed)")
+        print(f"Cached frames: no per-tick decoding; the one-off decode equals "
+              f"{result['one_off_decode_ms'] / result['legacy_ms_per_tick']:.0f} ticks of the old loop")
+        return
+    print(f"PhotoImages built once in {result['one_off_photo_ms']:.1f} ms")
+    print(f"Old loop:      {result['legacy_ms_per_tick']:.3f} ms CPU per tick")
+    print(f"Cached frames: {result['cached_ms_per_tick']:.3f} ms CPU per tick")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+class CachedResponse:
+    """
+    The parts of a response TropiCapture uses, whether it came from the network or the disk cache.
+
+    stale is True when the server couldn't be reached (or failed with a 5xx) and an expired
+    cached copy was served instead; the caller decides whether to tell the user.
+    """
+
+    def __init__(self, url, status_code, content, headers, from_cache, stale=False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.from_cache = from_cache
+        self.stale = stale
+
+    @property
+    def text(self):
+        match = re.search(r"charset=([\w-]+)", self.headers.get("Content-Type", ""))
+        return self.content.decode(match.group(1) if match else "utf-8", errors="replace")
+
+def _max_age(headers):
+    # Seconds the response may be reused without revalidating, per Cache-Control
+    cache_control = headers.get("Cache-Control", "").lower()
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    match = re.search(r"max-age=(\d+)", cache_control)
+    return int(match.group(1)) if match else 0
+
+class CachedSession:
+    """
+    Shared HTTP session with keep-alive pooling, timeouts, retries and an on-disk cache.
+
+    Cached responses are revalidated with conditional GETs (If-None-Match / If-Modified-Since),
+    so unchanged pages and imagery come back as a tiny 304 and are served from disk. The
+    cache is capped at max_bytes and evicts the least recently used entries first.
+    It is safe to use from several threads at once.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=256 * 1024 * 1024, timeout=(5, 30),
+                 retries=3, backoff=0.5, pool_size=16):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = "TropiCapture (TempestPy)"
+        self._lock = threading.Lock()
+        # key -> [size in bytes, last access time], rebuilt from the files on disk
+        self._index = {}
+        os.makedirs(cache_dir, exist_ok=True)
+        for name in os.listdir(cache_dir):
+            if name.endswith(".json"):
+                key = name[:-5]
+                body = self._path(key, ".body")
+                if os.path.exists(body):
+                    self._index[key] = [os.path.getsize(body), os.path.getmtime(self._path(key, ".json"))]
+
+    def _path(self, key, suffix):
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def _load(self, key):
+        try:
+            with open(self._path(key, ".json"), "r") as file:
+                meta = json.load(file)
+            with open(self._path(key, ".body"), "rb") as file:
+                return meta, file.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def _touch(self, key):
+        now = time.time()
+        with self._lock:
+            if key in self._index:
+                self._index[key][1] = now
+        try:
+            os.utime(self._path(key, ".json"), (now, now))
+        except OSError:
+            pass
+
+    def _write_meta(self, key, meta):
+        # Temporary name first, so a crash or a concurrent reader never sees half a file
+        meta_tmp = self._path(key, f".json.{threading.get_ident()}.tmp")
+        with open(meta_tmp, "w") as file:
+            json.dump(meta, file)
+        os.replace(meta_tmp, self._path(key, ".json"))
+
+    def _store(self, key, url, response):
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_type": response.headers.get("Content-Type", ""),
+            "stored_at": time.time(),
+            "max_age": _max_age(response.headers),
+        }
+        if not (meta["etag"] or meta["last_modified"] or meta["max_age"]):
+            return  # nothing to revalidate with, so caching would only waste disk
+        if len(response.content) > self.max_bytes:
+            return
+        # Write to temporary names first so a concurrent reader never sees half a file
+        body_tmp = self._path(key, f".body.{threading.get_ident()}.tmp")
+        with open(body_tmp, "wb") as file:
+            file.write(response.content)
+        os.replace(body_tmp, self._path(key, ".body"))
+        self._write_meta(key, meta)
+        with self._lock:
+            self._index[key] = [len(response.content), time.time()]
+            self._evict()
+
+    def _evict(self):
+        # Drop least recently used entries until the cache fits (caller holds the lock)
+        total = sum(size for size, _ in self._index.values())
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            for suffix in (".json", ".body"):
+                try:
+                    os.remove(self._path(key, suffix))
+                except OSError:
+                    pass
+            del self._index[key]
+            total -= size
+
+    def get(self, url):
+        """
+        GET a URL through the cache.
+
+        Returns:
+            CachedResponse: The response; from_cache is True when the body came from disk.
+
+        Raises:
+            requests.RequestException: On network errors, timeouts and HTTP error statuses. A
+                cached copy, if any, is returned instead (with stale=True) for connection errors,
+                timeouts, exhausted retries and 5xx statuses; 4xx statuses always raise.
+        """
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        meta, body = self._load(key) if key in self._index else (None, None)
+        cached_headers = {"Content-Type": meta["content_type"]} if meta else {}
+        if meta and time.time() < meta["stored_at"] + meta["max_age"]:
+            self._touch(key)
+            return CachedResponse(url, 200, body, cached_headers, True)
+
+        headers = {}
+        if meta and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta and meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.RetryError):
+            # The server is unreachable or kept failing: an old copy beats no copy
+            if meta:
+                self._touch(key)
+                return CachedResponse(url, 200, body, cached_headers, True, stale=True)
+            raise
+        if response.status_code == 304 and meta:
+            # Unchanged: refresh the freshness info and serve the body we already have
+            meta["stored_at"] = time.time()
+            meta["max_age"] = _max_age(response.headers) or meta["max_age"]
+            self._write_meta(key, meta)
+            self._touch(key)
+            return CachedResponse(url, 200, body, cached_headers, True)
+        if response.status_code >= 500 and meta:
+            self._touch(key)
+            return CachedResponse(url, 200, body, cached_headers, True, stale=True)
+        # A 4xx means the request itself is wrong (e.g. the storm is gone), so the cached copy isn't served
+        response.raise_for_status()
+        self._store(key, url, response)
+        return CachedResponse(url, response.status_code, response.content, response.headers, False)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,220 @@
+import argparse
+import glob
+import os
+import time
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Optional
+from urllib.parse import parse_qs, urlparse, urlsplit, unquote_plus
+
+# lxml is optional: its C parser drives the same callbacks many times faster than html.parser
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+PARSER = "lxml" if etree is not None else "html.parser"
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+# Status words stripped from <option> labels, applied in this order (same as the original scraper)
+REMOVE_STATUSES = ["Tropical Depression", "Invest", "Tropical Storm", "CYCLONE", "Cyclone"]
+
+@dataclass(frozen=True)
+class StormRecord:
+    """
+    One active system from the Force-13 cyclone listing.
+
+    storm_id is what the floater URLs use (e.g. '27S'); status is the label that was
+    stripped from the menu entry ('Tropical Storm', 'Invest', ...), when there was one;
+    source is 'option' (the storm menu) or 'link' (a ?flt= link elsewhere on the page).
+    """
+    storm_id: str
+    status: Optional[str] = None
+    source: str = "option"
+
+    def __str__(self):
+        return self.storm_id
+
+def _clean_option(text):
+    status = None
+    storm_id = text.strip()
+    for candidate in REMOVE_STATUSES:
+        if candidate in storm_id:
+            status = status or candidate
+            storm_id = storm_id.replace(candidate, "").strip()
+    return storm_id, status
+
+def _flt_value(href):
+    # First non-blank flt= query value, decoded like parse_qs would
+    for pair in urlsplit(href).query.split("&"):
+        name, _, value = pair.partition("=")
+        if value and unquote_plus(name) == "flt":
+            return unquote_plus(value).strip()
+    return None
+
+class _ListingCollector:
+    """
+    Streaming parser target that keeps only <option> labels and ?flt= link targets.
+
+    No document tree is built: the parser calls start/end/data as it reads the page and
+    everything except these two tags is dropped on the spot.
+    """
+
+    def __init__(self):
+        self.options = []
+        self.links = []
+        self._text = None
+
+    def start(self, tag, attrib):
+        if tag == "option":
+            self._flush()
+            self._text = []
+        elif tag == "a":
+            href = attrib.get("href")
+            if href and "flt=" in href:
+                self.links.append(href)
+        elif tag == "select":
+            self._flush()
+
+    def end(self, tag):
+        if tag in ("option", "select"):
+            self._flush()
+
+    def data(self, text):
+        if self._text is not None:
+            self._text.append(text)
+
+    def _flush(self):
+        # An option ends at </option>, at the next <option> or at the end of its <select>
+        if self._text is not None:
+            self.options.append("".join(self._text))
+            self._text = None
+
+    def close(self):
+        self._flush()
+        return self
+
+class _FallbackParser(HTMLParser):
+    # Feeds a _ListingCollector from the standard library parser when lxml isn't installed
+    def __init__(self, target):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, dict(attrs))
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+def _collect(html):
+    if etree is not None:
+        parser = etree.HTMLParser(target=_ListingCollector())
+        parser.feed(html)
+        return parser.close()
+    if isinstance(html, bytes):
+        html = html.decode("utf-8", errors="replace")
+    parser = _FallbackParser(_ListingCollector())
+    parser.feed(html)
+    parser.close()
+    return parser.target.close()
+
+def parse_listing(html):
+    """
+    Parse the cyclone listing page into storm records.
+
+    The page is streamed through lxml (or html.parser) without building a tree, only the
+    <option> labels and ?flt= links are kept, and duplicates are dropped with an
+    insertion-ordered dict, so ids keep their page order: menu entries first, then storms
+    that only appear as links.
+
+    Parameters:
+        html (str | bytes): The listing page.
+
+    Returns:
+        list: StormRecord objects, one per storm id.
+    """
+    collected = _collect(html)
+    records = {}
+    for text in collected.options:
+        if "comments" in text.lower():
+            continue
+        storm_id, status = _clean_option(text)
+        if storm_id and storm_id not in records:
+            records[storm_id] = StormRecord(storm_id, status, "option")
+    for href in collected.links:
+        storm_id = _flt_value(href)
+        if storm_id and storm_id not in records:
+            records[storm_id] = StormRecord(storm_id, None, "link")
+    return list(records.values())
+
+def parse_listing_legacy(html):
+    """
+    The original scrape_active_storms parsing, kept to check parse_listing against.
+
+    Returns:
+        list: Storm ids as strings. Unlike parse_listing, repeated menu entries are kept.
+    """
+    # Only needed for this reference path, so importing listing doesn't load bs4
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    storm_ids = [option.text.strip() for option in soup.find_all('option') if "comments" not in option.text.lower()]
+    cleaned_storm_ids = []
+    for storm_id in storm_ids:
+        for status in REMOVE_STATUSES:
+            storm_id = storm_id.replace(status, "").strip()
+        if storm_id:
+            cleaned_storm_ids.append(storm_id)
+    for link in soup.find_all('a', href=True):
+        href = link['href']
+        if 'flt=' in href:
+            query = parse_qs(urlparse(href).query)
+            if 'flt' in query:
+                cyclone_id = query['flt'][0].strip()
+                if cyclone_id and cyclone_id not in cleaned_storm_ids:
+                    cleaned_storm_ids.append(cyclone_id)
+    return cleaned_storm_ids
+
+def _best_of(function, html, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(html)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def benchmark(paths, repeat=20):
+    """
+    Time both parsers on saved listing pages. Their output is checked by tests/test_listing.py.
+
+    Returns:
+        list: One dict per page with legacy/fast timings in ms.
+    """
+    results = []
+    for path in paths:
+        with open(path, "rb") as file:
+            html = file.read()
+        results.append({
+            "page": os.path.basename(path),
+            "bytes": len(html),
+            "storms": len(parse_listing(html)),
+            "legacy_ms": _best_of(parse_listing_legacy, html, repeat) * 1000,
+            "fast_ms": _best_of(parse_listing, html, repeat) * 1000,
+        })
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the cyclone listing parser against the original one.")
+    parser.add_argument("pages", nargs="*", help="Saved listing pages (default: fixtures/*.html)")
+    parser.add_argument("--repeat", type=int, default=20, help="Timing runs per page, best is reported (default: 20)")
+    args = parser.parse_args(argv)
+    paths = args.pages or sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html")))
+    print(f"Parser: {PARSER}")
+    for result in benchmark(paths, args.repeat):
+        speedup = result["legacy_ms"] / result["fast_ms"] if result["fast_ms"] else float("inf")
+        print(f"{result['page']}: {result['bytes']} bytes, {result['storms']} storms, "
+              f"legacy {result['legacy_ms']:.2f} ms, fast {result['fast_ms']:.2f} ms ({speedup:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+class Prefetcher:
+    """
+    Downloads a batch of URLs concurrently in the background and keeps the bodies in memory.
+
+    A bounded thread pool caps the total number of downloads in flight and a semaphore per
+    host caps how hard any one server is hit. Downloads go through the shared CachedSession,
+    so everything fetched here also lands in the on-disk cache.
+    """
+
+    def __init__(self, session, max_workers=8, per_host=4):
+        self.session = session
+        self.per_host = per_host
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tropicapture-prefetch")
+        self._host_limits = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        self._host_lock = threading.Lock()
+        self._futures = {}
+
+    def _host_limit(self, url):
+        with self._host_lock:
+            return self._host_limits[urlsplit(url).netloc]
+
+    def _download(self, url):
+        with self._host_limit(url):
+            return self.session.get(url).content
+
+    def prefetch(self, urls):
+        """
+        Start downloading every URL that isn't already queued. Returns immediately.
+        """
+        for url in urls:
+            if url not in self._futures:
+                self._futures[url] = self._executor.submit(self._download, url)
+
+    def get(self, url):
+        """
+        Body of a prefetched URL, waiting for it if the download is still running.
+
+        Returns:
+            bytes: The body, or None if the URL was never prefetched or its download failed.
+        """
+        future = self._futures.get(url)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception:
+            return None
+
+    def close(self):
+        """
+        Stop the pool: queued downloads are cancelled and running ones are left to finish.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
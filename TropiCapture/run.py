@@ -1,50 +1,48 @@
-from bs4 import BeautifulSoup
 import requests
 from tkinter import *
 from PIL import Image, ImageTk
 from io import BytesIO
-import re
-from urllib.parse import urlparse, parse_qs
+import argparse
+import os
+import sys
+if __name__ == "__main__":
+    # Started as a script from this folder: the shared tempestpy package is one directory up
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from httpcache import CachedSession, DEFAULT_CACHE_DIR
+from prefetch import Prefetcher
+from frames import FramePlayer
+from watch import DEFAULT_ARCHIVE_DIR, Watcher
+from listing import parse_listing
+from tempestpy.config import release_name
+from tempestpy.trace import span
 
 version = "0.0.0.3"
 
-# Open the file in read mode
-with open('..\globalversionnumber.txt', 'r') as file:
-    tempestpy_releasenameandversion = file.read()
+# Force-13 base URL; point it at a local stand-in server with TROPICAPTURE_BASE_URL or --base-url
+base_url = os.environ.get("TROPICAPTURE_BASE_URL", "https://www.force-13.com")
+cache_dir = DEFAULT_CACHE_DIR
+_session = None
+_prefetcher = None
+
+# Shared pooled/cached HTTP session, created on first use
+def get_session():
+    global _session
+    if _session is None:
+        _session = CachedSession(cache_dir)
+    return _session
 
 # Function to scrape active storm data from Force-13
 def scrape_active_storms():
-    url = "https://www.force-13.com/cyclones"
+    url = f"{base_url}/cyclones"
     
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Step 1: From <option> tags (excluding comments)
-        storm_ids = [option.text.strip() for option in soup.find_all('option') if "comments" not in option.text.lower()]
-        
-        remove_statuses = ["Tropical Depression", "Invest", "Tropical Storm", "CYCLONE", "Cyclone"]
-        cleaned_storm_ids = []
-        for storm_id in storm_ids:
-            for status in remove_statuses:
-                storm_id = storm_id.replace(status, "").strip()
-            if storm_id:
-                cleaned_storm_ids.append(storm_id)
-
-        # Step 2: Extract 'flt' values from <a href="...flt=27S">
-        storm_links = soup.find_all('a', href=True)
-        for link in storm_links:
-            href = link['href']
-            if 'flt=' in href:
-                parsed_url = urlparse(href)
-                query = parse_qs(parsed_url.query)
-                if 'flt' in query:
-                    cyclone_id = query['flt'][0].strip()
-                    if cyclone_id and cyclone_id not in cleaned_storm_ids:
-                        cleaned_storm_ids.append(cyclone_id)
-
-        return cleaned_storm_ids
+        with span("tropicapture.fetch", url=url):
+            response = get_session().get(url)
+        if response.stale:
+            print(f"Network error fetching {url}, using the cached copy.")
+        # Menu entries first (status labels stripped), then storms that only appear as ?flt= links
+        with span("tropicapture.parse"):
+            return parse_listing(response.content)
 
     except requests.RequestException as e:
         print(f"Error scraping active storms: {e}")
@@ -54,20 +52,48 @@ def scrape_active_storms():
 def get_active_tropical_systems():
     return scrape_active_storms()
 
-# Function to fetch the real-time imagery of a tropical system
-def fetch_image(system_name, imagery_type):
+# Function to build the URL of a tropical system's imagery
+def imagery_url(system_name, imagery_type):
     if imagery_type == "still":
-        image_url = f"https://www.force-13.com/floaters/{system_name.replace(' ', '_')}/imagery/ott.png"
+        return f"{base_url}/floaters/{system_name.replace(' ', '_')}/imagery/ott.png"
     elif imagery_type == "animated":
-        image_url = f"https://www.force-13.com/floaters/{system_name.replace(' ', '_')}/imagery/ott-animated.gif"
-    else:
+        return f"{base_url}/floaters/{system_name.replace(' ', '_')}/imagery/ott-animated.gif"
+    return None
+
+# Function to start downloading still and animated imagery for every listed system in the background
+def prefetch_imagery(systems, max_workers=8, per_host=4):
+    global _prefetcher
+    if _prefetcher is None:
+        _prefetcher = Prefetcher(get_session(), max_workers=max_workers, per_host=per_host)
+    _prefetcher.prefetch(imagery_url(system.storm_id, imagery_type) for system in systems for imagery_type in ("still", "animated"))
+    return _prefetcher
+
+# Function to stop the background downloads and release the pooled HTTP connections
+def close_connections():
+    global _session, _prefetcher
+    if _prefetcher is not None:
+        _prefetcher.close()
+        _prefetcher = None
+    if _session is not None:
+        _session.close()
+        _session = None
+
+# Function to fetch the real-time imagery of a tropical system
+def fetch_image(system_name, imagery_type):
+    image_url = imagery_url(system_name, imagery_type)
+    if image_url is None:
         print("Invalid imagery type selected.")
         return None
     
     try:
-        response = requests.get(image_url)
-        response.raise_for_status()
-        img_data = response.content
+        # Prefetched imagery is already in memory (or about to be); otherwise go through the cache
+        img_data = _prefetcher.get(image_url) if _prefetcher else None
+        if img_data is None:
+            with span("tropicapture.fetch", url=image_url):
+                response = get_session().get(image_url)
+            if response.stale:
+                print(f"Network error fetching {image_url}, using the cached copy.")
+            img_data = response.content
         img = Image.open(BytesIO(img_data))
         print(f"Link to {system_name}'s imagery: {image_url}")
         return img
@@ -79,38 +105,73 @@ def fetch_image(system_name, imagery_type):
 def display_image(image):
     if image:
         root = Tk()
-        root.title(f"Tropical System Imagery (Still) - TropiCapture by Blaine Palmer (Ver {version}) || TempestPy {tempestpy_releasenameandversion}")
+        root.title(f"Tropical System Imagery (Still) - TropiCapture by Blaine Palmer (Ver {version}) || TempestPy {release_name()}")
         img_tk = ImageTk.PhotoImage(image)
         label = Label(root, image=img_tk)
         label.pack()
         root.mainloop()
 
 # Function to display animated imagery in a Tkinter window
-def display_animated_image(image):
+def display_animated_image(image, max_frame_size=None, show_stats=False):
     if image:
         root = Tk()
-        root.title(f"Tropical System Imagery (Animated) - TropiCapture by Blaine Palmer (Ver {version}) || TempestPy {tempestpy_releasenameandversion}")
+        root.title(f"Tropical System Imagery (Animated) - TropiCapture by Blaine Palmer (Ver {version}) || TempestPy {release_name()}")
         label = Label(root)
         label.pack()
-        def update_frame(frame_index):
-            try:
-                image.seek(frame_index)
-                img_tk = ImageTk.PhotoImage(image)
-                label.config(image=img_tk)
-                label.image = img_tk
-                root.after(100, update_frame, (frame_index + 1) % image.n_frames)
-            except EOFError:
-                root.after(100, update_frame, 0)
-        update_frame(0)
+        # Frames are decoded once in the background and then replayed with their own GIF timing
+        player = FramePlayer(root, label, image, max_size=max_frame_size)
+        player.start()
         root.mainloop()
+        if show_stats:
+            stats = player.stats()
+            print(f"Animation: {stats['frames_shown']} frames shown ({stats['frames_cached']} cached), "
+                  f"{stats['fps']:.1f} fps, {stats['cpu_percent']:.1f}% CPU")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="TropiCapture - view real-time imagery of active tropical systems.")
+    parser.add_argument("--base-url", default=base_url, help="Force-13 base URL (default: %(default)s)")
+    parser.add_argument("--cache-dir", default=cache_dir, help="Directory for the HTTP cache (default: %(default)s)")
+    parser.add_argument("--prefetch", action="store_true", help="Download imagery for every active system in the background")
+    parser.add_argument("--prefetch-workers", type=int, default=8, help="Concurrent prefetch downloads (default: 8)")
+    parser.add_argument("--max-frame-size", type=int, help="Downscale animation frames to this longest side (saves memory)")
+    parser.add_argument("--frame-stats", action="store_true", help="Print fps and CPU use after closing an animation")
+    parser.add_argument("--watch", action="store_true", help="Run headless: poll all active systems and archive new imagery")
+    parser.add_argument("--interval", type=int, default=600, help="Seconds between polls in --watch mode (default: 600)")
+    parser.add_argument("--archive-dir", default=DEFAULT_ARCHIVE_DIR, help="Where --watch archives imagery (default: %(default)s)")
+    parser.add_argument("--cycles", type=int, help="Stop --watch after this many polls (default: run until stopped)")
+    return parser.parse_args(argv)
+
+# Function to poll Force-13 without a UI and archive new imagery until stopped
+def watch(interval=600, archive_dir=DEFAULT_ARCHIVE_DIR, cycles=None):
+    print(f"Watching {base_url} every {interval} s, archiving to {archive_dir} (Ctrl+C to stop)")
+    list_storms = lambda: [system.storm_id for system in get_active_tropical_systems()]
+    watcher = Watcher(get_session(), list_storms, imagery_url, archive_dir)
+    stats = watcher.run(interval, cycles)
+    print(f"Stopped after {stats['polls']} poll(s): {stats['frames_saved']} frame(s) archived, "
+          f"{stats['unchanged']} unchanged download(s), {stats['errors']} error(s)")
+    return stats
 
 # Main function to interact with the user
-def main():
+def main(argv=None):
+    global base_url, cache_dir
+    args = parse_args(argv)
+    base_url = args.base_url.rstrip("/")
+    cache_dir = args.cache_dir
     print("Welcome to TropiCapture!")
     print("A program/script that is a part of the TempestPy Weather Enthusiast Suite")
     print(f"Version {version}")
     print("by Blaine Palmer")
     print("==================")
+    try:
+        menu(args)
+    finally:
+        close_connections()
+
+# Function to run --watch, or list the active systems and show the one the user picks
+def menu(args):
+    if args.watch:
+        watch(args.interval, args.archive_dir, args.cycles)
+        return
     print("Fetching currently active tropical systems....")
     print("==================")
     active_systems = get_active_tropical_systems()
@@ -118,18 +179,22 @@ def main():
     if not active_systems:
         print("Sorry, no active tropical systems found.")
         return
+    if args.prefetch:
+        # Downloads run while the user is still reading the menu
+        print(f"Prefetching imagery for {len(active_systems)} system(s) in the background...")
+        prefetch_imagery(active_systems, max_workers=args.prefetch_workers)
     
     print("Currently active tropical systems:")
     print("==================")
     for idx, system in enumerate(active_systems, 1):
-        print(f"{idx}. {system}")
+        print(f"{idx}. {system.storm_id}" + (f" ({system.status})" if system.status else ""))
     
     try:
         choice = int(input("Enter the number of the tropical system you want to view: "))
         if choice < 1 or choice > len(active_systems):
             print("Invalid choice, please select a valid number.")
             return
-        system_name = active_systems[choice - 1]
+        system_name = active_systems[choice - 1].storm_id
         
         imagery_type = input("Would you like still imagery or animated imagery? (Enter 'still' or 'animated'): ").strip().lower()
         if imagery_type not in ['still', 'animated']:
@@ -143,7 +208,7 @@ def main():
             if imagery_type == "still":
                 display_image(image)
             elif imagery_type == "animated":
-                display_animated_image(image)
+                display_animated_image(image, max_frame_size=args.max_frame_size, show_stats=args.frame_stats)
         else:
             print("Failed to load image.")
     
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import re
+import signal
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from io import BytesIO
+
+import requests
+from PIL import Image
+
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "archive")
+# Frame hashes remembered per storm; an animation loop is far shorter than this, so a frame
+# that scrolls back into the loop is still recognised, while memory stays fixed
+SEEN_PER_STORM = 512
+
+def _safe_name(storm_id):
+    return re.sub(r"[^\w.-]+", "_", storm_id).strip("_") or "unknown"
+
+def _utc_stamp():
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+class StormArchive:
+    """
+    Per-storm archive directory: one file per new frame plus an append-only index.jsonl.
+
+    Each index line is a compact record: {"t", "kind", "sha256", "file", "bytes"}. Only the
+    last SEEN_PER_STORM frame hashes are kept in memory; on start-up they are reloaded from
+    the tail of the index, so a restarted watcher doesn't save the same frames again.
+    """
+
+    def __init__(self, root, storm_id):
+        self.storm_id = storm_id
+        self.directory = os.path.join(root, _safe_name(storm_id))
+        self.index_path = os.path.join(self.directory, "index.jsonl")
+        self._order = deque(maxlen=SEEN_PER_STORM)
+        self._seen = set()
+        os.makedirs(self.directory, exist_ok=True)
+        for record in self._tail_records():
+            self._remember(record["sha256"])
+
+    def _tail_records(self, max_bytes=256 * 1024):
+        # Only the end of the index matters; it can grow for as long as the storm lives
+        try:
+            with open(self.index_path, "rb") as file:
+                file.seek(0, os.SEEK_END)
+                file.seek(max(0, file.tell() - max_bytes))
+                lines = file.read().splitlines()[-SEEN_PER_STORM:]
+        except OSError:
+            return []
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # the first line of the tail may be cut in half
+        return records
+
+    def _remember(self, digest):
+        if len(self._order) == self._order.maxlen:
+            self._seen.discard(self._order[0])
+        self._order.append(digest)
+        self._seen.add(digest)
+
+    def add(self, kind, digest, data, extension):
+        """
+        Save one frame unless its hash has been seen recently.
+
+        Returns:
+            bool: True if the frame was new and written to disk.
+        """
+        if digest in self._seen:
+            return False
+        name = f"{_utc_stamp()}-{kind}-{digest[:12]}.{extension}"
+        with open(os.path.join(self.directory, name), "wb") as file:
+            file.write(data)
+        record = {"t": int(time.time()), "kind": kind, "sha256": digest, "file": name, "bytes": len(data)}
+        with open(self.index_path, "a") as file:
+            file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._remember(digest)
+        return True
+
+def animation_frames(data):
+    """
+    Split an animated GIF into full frames.
+
+    Yields:
+        tuple: (sha256 of the decoded pixels, PNG bytes of the frame)
+    """
+    with Image.open(BytesIO(data)) as image:
+        for index in range(getattr(image, "n_frames", 1)):
+            image.seek(index)
+            frame = image.convert("RGBA")
+            digest = hashlib.sha256(frame.tobytes()).hexdigest()
+            buffer = BytesIO()
+            frame.save(buffer, format="PNG")
+            yield digest, buffer.getvalue()
+
+class Watcher:
+    """
+    Headless poller: lists the active storms and archives new imagery for each one.
+
+    Change detection is two-level. The whole download is hashed first, so an unchanged
+    image (which the HTTP cache usually answers with a 304 anyway) costs no decoding at all.
+    When an animated loop does change, it is split into frames and only the frames not seen
+    before are written; the loop normally gains one frame per update, so that is all that
+    gets stored. Memory use doesn't grow with uptime: state is one hash per (storm, imagery)
+    plus a bounded set of frame hashes per active storm.
+
+    Parameters:
+        session (CachedSession): Shared HTTP session.
+        list_storms (callable): Returns the ids of the currently active storms.
+        url_for (callable): (storm_id, 'still' | 'animated') -> imagery URL.
+        archive_dir (str): Root of the archive, one subdirectory per storm.
+    """
+
+    def __init__(self, session, list_storms, url_for, archive_dir=DEFAULT_ARCHIVE_DIR):
+        self.session = session
+        self.list_storms = list_storms
+        self.url_for = url_for
+        self.archive_dir = archive_dir
+        self._archives = OrderedDict()
+        self._last_hash = {}
+        self.stats = {"polls": 0, "downloads": 0, "unchanged": 0, "frames_saved": 0, "errors": 0}
+
+    def _archive(self, storm_id):
+        if storm_id not in self._archives:
+            self._archives[storm_id] = StormArchive(self.archive_dir, storm_id)
+        return self._archives[storm_id]
+
+    def poll_storm(self, storm_id):
+        """
+        Check one storm's still and animated imagery.
+
+        Returns:
+            int: Number of frames written to the archive.
+        """
+        saved = 0
+        for kind in ("still", "animated"):
+            url = self.url_for(storm_id, kind)
+            try:
+                data = self.session.get(url).content
+            except requests.RequestException as e:
+                self.stats["errors"] += 1
+                print(f"[{_utc_stamp()}] {storm_id} {kind}: {e}")
+                continue
+            self.stats["downloads"] += 1
+            digest = hashlib.sha256(data).hexdigest()
+            if self._last_hash.get((storm_id, kind)) == digest:
+                self.stats["unchanged"] += 1
+                continue
+            self._last_hash[(storm_id, kind)] = digest
+            archive = self._archive(storm_id)
+            try:
+                if kind == "still":
+                    saved += archive.add(kind, digest, data, "png")
+                else:
+                    for frame_digest, png in animation_frames(data):
+                        saved += archive.add("frame", frame_digest, png, "png")
+            except (OSError, SyntaxError, ValueError, EOFError, Image.DecompressionBombError) as e:
+                # PIL raises these for truncated, corrupt, oversized or non-image responses;
+                # one bad image must not stop the rest of the pass
+                self.stats["errors"] += 1
+                print(f"[{_utc_stamp()}] {storm_id} {kind}: unreadable image ({e})")
+        self.stats["frames_saved"] += saved
+        return saved
+
+    def poll(self):
+        """
+        One pass over every active storm. Storms that left the list are forgotten.
+
+        Returns:
+            dict: storm id -> frames saved this pass.
+        """
+        self.stats["polls"] += 1
+        storms = list(dict.fromkeys(self.list_storms()))
+        for storm_id in list(self._archives):
+            if storm_id not in storms:
+                del self._archives[storm_id]
+        for key in [key for key in self._last_hash if key[0] not in storms]:
+            del self._last_hash[key]
+        return {storm_id: self.poll_storm(storm_id) for storm_id in storms}
+
+    def run(self, interval=600, cycles=None):
+        """
+        Poll every `interval` seconds until interrupted (Ctrl+C / SIGTERM) or `cycles` passes are done.
+
+        SIGTERM is only handled when run on the main thread; Python allows signal handlers nowhere else.
+        """
+        stopping = False
+        def stop(signum, frame):
+            nonlocal stopping
+            stopping = True
+        on_main_thread = threading.current_thread() is threading.main_thread()
+        previous = signal.signal(signal.SIGTERM, stop) if on_main_thread else None
+        completed = 0
+        try:
+            while not stopping:
+                started = time.monotonic()
+                results = self.poll()
+                new = {storm_id: count for storm_id, count in results.items() if count}
+                print(f"[{_utc_stamp()}] {len(results)} active system(s), "
+                      f"{sum(new.values())} new frame(s)" + (f": {new}" if new else ""))
+                completed += 1
+                if cycles is not None and completed >= cycles:
+                    break
+                # Sleep in short steps so SIGTERM is handled promptly
+                while not stopping and time.monotonic() - started < interval:
+                    time.sleep(max(0.0, min(1.0, interval - (time.monotonic() - started))))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if on_main_thread:
+                signal.signal(signal.SIGTERM, previous)
+        return self.stats
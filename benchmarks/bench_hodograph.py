@@ -0,0 +1,36 @@
+import os
+import tempfile
+
+from common import best_rate, metric, parse_args, report, use_tool
+
+use_tool("Custom Hodograph Creator")
+from hodocalc import dense_levels, hodograph_parameters, storm_relative_helicity, synthetic_soundings
+from render import render_batch
+
+def main(argv=None):
+    args = parse_args("Hodograph parameter and rendering throughput on generated soundings.", argv)
+    count = 20000 if args.quick else 100000
+    dense_count = 1000 if args.quick else 10000
+    renders = 20 if args.quick else 50
+    min_seconds = 0.2 if args.quick else 1.0
+    metrics = {}
+
+    pressure, speed, direction = synthetic_soundings(count)
+    metrics["parameters"] = metric(best_rate(lambda: hodograph_parameters(pressure, speed, direction), items=count,
+                                             min_seconds=min_seconds), "soundings/s")
+    dense_pressure, dense_speed, dense_direction = synthetic_soundings(dense_count, levels=dense_levels(300))
+    metrics["srh_dense"] = metric(best_rate(lambda: storm_relative_helicity(dense_pressure, dense_speed, dense_direction),
+                                            items=dense_count, min_seconds=min_seconds), "profiles/s")
+
+    ids = [f"synthetic:{index}" for index in range(renders)]
+    with tempfile.TemporaryDirectory() as scratch:
+        render_batch(ids, pressure, speed[:renders], direction[:renders], os.path.join(scratch, "warmup"))
+        stats = min((render_batch(ids, pressure, speed[:renders], direction[:renders], os.path.join(scratch, "png"))
+                     for _ in range(2)), key=lambda stats: stats["seconds"])
+        if stats["failed"]:
+            raise RuntimeError(f"{stats['failed']} hodograph renders failed")
+        metrics["render_png"] = metric(stats["rendered"] / stats["seconds"], "images/s")
+    report(metrics, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import csv
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from common import DATA_DIR, best_rate, metric, parse_args, report, use_tool
+
+use_tool("RetroWx")
+import run
+from ingest import ingest
+from rollups import query_rollup
+
+# Bump when the generated rows or the schema change, so cached databases get rebuilt
+FIXTURE_VERSION = 2
+FIRST_DAY = date(2000, 1, 1)
+DESCRIPTIONS = ["Clear skies", "Scattered thunderstorms", "Severe thunderstorm with large hail",
+                "Tornado warning issued", "Heavy rain and flash flooding", "Dense fog", "Strong gusty winds",
+                "Light snow showers", "Freezing rain and sleet", "Tropical storm remnants", "Hot and humid",
+                "Blowing dust", "Frost overnight", "Hail up to golf ball size", "Drizzle"]
+COMPASS = ["N", "NE", "E", "SE", "S", "SW", "W", "NW"]
+
+def stations(count, seed=0):
+    """
+    `count` station locations scattered over the contiguous US, as RetroWx stores them.
+
+    Returns:
+        list: (location text, latitude, longitude)
+    """
+    rng = np.random.default_rng(seed)
+    latitudes = rng.uniform(25, 49, count).round(2)
+    longitudes = rng.uniform(-124, -67, count).round(2)
+    return [(f"{lat:.2f}° N {-lon:.2f}°W", lat, lon) for lat, lon in zip(latitudes, longitudes)]
+
+def write_archive(path, station_count, days, seed=0):
+    """
+    Write a synthetic station archive: one event per station per day, in date order.
+
+    Returns:
+        int: Number of rows written.
+    """
+    rng = np.random.default_rng(seed)
+    locations = [location for location, _, _ in stations(station_count)]
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["date", "temperature", "precipitation", "wind_speed", "wind_direction",
+                         "pressure", "additional_info", "location"])
+        for day in range(days):
+            stamp = (FIRST_DAY + timedelta(days=day)).strftime("%Y/%m/%d")
+            season = 15 * np.sin(2 * np.pi * (day % 365) / 365 - np.pi / 2)
+            temperature = (60 + season + rng.normal(0, 8, station_count)).round(1)
+            precipitation = np.where(rng.random(station_count) < 0.3, rng.exponential(0.3, station_count), 0).round(2)
+            wind_speed = rng.gamma(2, 5, station_count).round(1)
+            direction = rng.integers(0, 360, station_count)
+            pressure = rng.normal(1013, 8, station_count).round(1)
+            description = rng.integers(0, len(DESCRIPTIONS), station_count)
+            for index, location in enumerate(locations):
+                # Some stations report compass points instead of degrees, like the hand-made data
+                wind = COMPASS[direction[index] // 45] if index % 5 == 0 else direction[index]
+                writer.writerow([stamp, temperature[index], precipitation[index], wind_speed[index], wind,
+                                 pressure[index], DESCRIPTIONS[description[index]], location])
+    return station_count * days
+
+def fixture_database(station_count, days):
+    """
+    Path of the synthetic benchmark database, built (once, through RetroWx's own ingest) if missing.
+    """
+    path = os.path.join(DATA_DIR, f"retrowx-{station_count}x{days}-v{FIXTURE_VERSION}.db")
+    if os.path.exists(path):
+        return path
+    os.makedirs(DATA_DIR, exist_ok=True)
+    print(f"Building {station_count * days:,} row RetroWx fixture database (first run only)...")
+    with tempfile.TemporaryDirectory() as scratch:
+        archive = os.path.join(scratch, "archive.csv")
+        write_archive(archive, station_count, days)
+        partial = path + ".partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+        stats = ingest(partial, [archive])
+        print(f"  {stats['inserted']:,} rows in {stats['seconds']:.1f} s")
+    os.replace(partial, path)
+    return path
+
+def main(argv=None):
+    args = parse_args("RetroWx ingest and query throughput on a synthetic multi-million-row database.", argv)
+    # 1000 stations x 2000 days = 2M events (200k with --quick)
+    station_count, days = (200, 1000) if args.quick else (1000, 2000)
+    sample_days = 100 if args.quick else 200
+    min_seconds = 0.2 if args.quick else 1.0
+    db_path = fixture_database(station_count, days)
+    metrics = {}
+
+    with tempfile.TemporaryDirectory() as scratch:
+        archive = os.path.join(scratch, "sample.csv")
+        rows = write_archive(archive, station_count, sample_days, seed=1)
+        stats = ingest(os.path.join(scratch, "ingest.db"), [archive])
+        if stats["inserted"] != rows:
+            raise RuntimeError(f"ingest inserted {stats['inserted']} of {rows} rows")
+        metrics["ingest"] = metric(stats["rows_per_second"], "rows/s")
+
+    rng = np.random.default_rng(2)
+    def random_day(span_days=0):
+        first = FIRST_DAY + timedelta(days=int(rng.integers(0, days - span_days)))
+        return first.strftime("%Y/%m/%d"), (first + timedelta(days=span_days)).strftime("%Y/%m/%d")
+    sites = stations(station_count)
+
+    metrics["page_query"] = metric(best_rate(lambda: run.query_weather_page(db_path, *random_day(30), page=3),
+                                             min_seconds=min_seconds), "queries/s")
+    # A week of every station into a DataFrame
+    week_rows = station_count * 7
+    metrics["range_query"] = metric(best_rate(lambda: run.query_weather_database(db_path, *random_day(6)),
+                                              items=week_rows, min_seconds=min_seconds), "rows/s")
+    def near():
+        _, lat, lon = sites[rng.integers(0, len(sites))]
+        run.query_weather_near(db_path, lat, lon, 50, *random_day(30))
+    metrics["near_query"] = metric(best_rate(near, min_seconds=min_seconds), "queries/s")
+    metrics["search_query"] = metric(best_rate(lambda: run.search_weather_events(db_path, "hail", *random_day(365)),
+                                               min_seconds=min_seconds), "queries/s")
+    def rollup():
+        location = sites[rng.integers(0, len(sites))][0]
+        query_rollup(db_path, "monthly", location, "2000/01", "2004/12")
+    metrics["rollup_query"] = metric(best_rate(rollup, min_seconds=min_seconds), "queries/s")
+
+    started = time.perf_counter()
+    streamed = sum(1 for _ in run.iter_weather_events(db_path, *random_day(60)))
+    metrics["stream"] = metric(streamed / (time.perf_counter() - started), "rows/s")
+    report(metrics, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import os
+import tempfile
+
+from common import best_rate, metric, parse_args, report, use_tool
+
+use_tool("Custom Skew-T Diagram Creator")
+from batch import process_soundings, synthetic_soundings
+from render import render_batch
+from thermo import thermo_parameters
+from thermocache import ThermoCache
+
+def main(argv=None):
+    args = parse_args("Skew-T solver, cache and rendering throughput on generated soundings.", argv)
+    count = 20 if args.quick else 100
+    renders = 20 if args.quick else 50
+    soundings = list(synthetic_soundings(count, levels=40))
+    metrics = {}
+
+    # One process, no cache: the MetPy parcel solver itself
+    metrics["solver"] = metric(best_rate(lambda: list(process_soundings(soundings, workers=1)), items=count,
+                                         rounds=2, min_seconds=0), "soundings/s")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        cache = ThermoCache(os.path.join(scratch, "thermo.sqlite"))
+        for _, pressure, temperature, dewpoint in soundings:
+            thermo_parameters(pressure, temperature, dewpoint, cache=cache)
+        metrics["cache_hit"] = metric(best_rate(
+            lambda: [thermo_parameters(p, t, d, cache=cache) for _, p, t, d in soundings], items=count), "soundings/s")
+        cache.close()
+
+        # Rendering only: the thermodynamics come from the warm cache
+        render_batch(soundings[:renders], os.path.join(scratch, "warmup"), cache_path=cache.path)
+        stats = min((render_batch(soundings[:renders], os.path.join(scratch, "png"), cache_path=cache.path)
+                     for _ in range(2)), key=lambda stats: stats["seconds"])
+        if stats["failed"]:
+            raise RuntimeError(f"{stats['failed']} Skew-T renders failed")
+        metrics["render_png"] = metric(stats["rendered"] / stats["seconds"], "images/s")
+    report(metrics, args.output)
+
+if __name__ == "__main__":
+    main()
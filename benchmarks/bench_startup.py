@@ -0,0 +1,15 @@
+import sys
+
+from common import ROOT, metric, parse_args, report
+
+sys.path.insert(0, ROOT)
+from tempestpy.startup import measure
+
+def main(argv=None):
+    args = parse_args("Launcher startup time ('python -m tempestpy --help').", argv)
+    result = measure(runs=3 if args.quick else 10)
+    # A few ms of scheduler noise is a large fraction of a ~60 ms start
+    report({"launcher": metric(result["wall_ms"], "ms", higher_is_better=False, tolerance=0.5)}, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import itertools
+import os
+import tempfile
+
+from common import best_rate, metric, parse_args, report, use_tool
+from standin import FIXTURES_DIR, start_standin
+
+use_tool("TropiCapture")
+import run
+from frames import decode_frames
+from listing import parse_listing
+
+def main(argv=None):
+    args = parse_args("TropiCapture throughput against a local Force-13 stand-in.", argv)
+    min_seconds = 0.2 if args.quick else 1.0
+    images = 5 if args.quick else 20
+    server, base_url = start_standin()
+    metrics = {}
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            run.base_url = base_url
+            run.cache_dir = cache_dir
+            # The first fetch fills the cache; after that every call revalidates (304) and re-parses
+            systems = run.scrape_active_storms()
+            if not systems:
+                raise RuntimeError("the stand-in listing parsed to no storms")
+            metrics["listing_refresh"] = metric(best_rate(run.scrape_active_storms, min_seconds=min_seconds), "listings/s")
+
+            with open(os.path.join(FIXTURES_DIR, "cyclones_archive_large.html"), "rb") as file:
+                archive = file.read()
+            metrics["parse_archive_large"] = metric(best_rate(lambda: parse_listing(archive), min_seconds=min_seconds), "pages/s")
+
+            # Cold fetches: a storm id that was never requested misses the cache every time
+            fetched = itertools.count()
+            metrics["image_fetch"] = metric(best_rate(
+                lambda: [run.fetch_image(f"BENCH{next(fetched)}", "animated") for _ in range(images)],
+                items=images, rounds=2, min_seconds=0), "images/s")
+
+            gif = run.fetch_image(systems[0].storm_id, "animated")
+            frame_count = gif.n_frames
+            metrics["gif_decode"] = metric(best_rate(lambda: list(decode_frames(gif)), items=frame_count,
+                                                     rounds=5, min_seconds=min_seconds), "frames/s")
+            run.get_session().close()
+    finally:
+        server.shutdown()
+    report(metrics, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+# Repository root, where the tool folders and the shared tempestpy package live
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Generated fixtures (synthetic databases) are kept here between runs
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+def use_tool(directory):
+    """
+    Make a tool's modules importable the way the launcher does: by bare module name, with
+    tempestpy importable from the repository root.
+    """
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, os.path.join(ROOT, directory))
+
+def metric(value, unit, higher_is_better=True, tolerance=None):
+    """
+    One benchmark result. tolerance widens suite.py's allowed slowdown for noisy metrics.
+    """
+    entry = {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+    if tolerance is not None:
+        entry["tolerance"] = tolerance
+    return entry
+
+def best_rate(function, items=1, rounds=3, min_seconds=0.2):
+    """
+    Items per second of function(), which handles `items` items per call.
+
+    function() is called until at least min_seconds have passed, rounds times over, and
+    the best round counts: the slower rounds are the ones other processes got in the way of.
+    """
+    best = 0.0
+    for _ in range(rounds):
+        calls = 0
+        started = time.perf_counter()
+        while True:
+            function()
+            calls += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_seconds:
+                break
+        best = max(best, calls * items / elapsed)
+    return best
+
+def parse_args(description, argv=None):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--quick", action="store_true", help="Smaller fixtures and shorter timings")
+    parser.add_argument("--output", help="Write the metrics as JSON here instead of printing them")
+    return parser.parse_args(argv)
+
+def report(metrics, output=None):
+    """
+    Hand the metrics to suite.py (a JSON file) or print them when run on its own.
+    """
+    if output:
+        with open(output, "w") as file:
+            json.dump(metrics, file, indent=2)
+        return
+    for name, entry in metrics.items():
+        print(f"{name:<32} {entry['value']:>12.1f} {entry['unit']}")
@@ -0,0 +1,122 @@
+import argparse
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from common import ROOT
+
+FIXTURES_DIR = os.path.join(ROOT, "TropiCapture", "fixtures")
+# Saved Force-13 listing served at /cyclones
+DEFAULT_LISTING = "cyclones_active_season.html"
+
+@lru_cache(maxsize=None)
+def floater_images(size=(480, 360), frames=12, seed=0, first=0):
+    """
+    Deterministic satellite-like stand-ins for ott.png and ott-animated.gif.
+
+    The frames are smoothed noise drifting across the image, which compresses about as
+    badly as real infrared imagery does, so fetches and GIF decoding do realistic work.
+    The loop holds frames first..frames-1, so first=1, frames=13 is the next update of the
+    default loop: the oldest frame dropped and one new frame added.
+
+    Returns:
+        dict: file name -> bytes
+    """
+    rng = np.random.default_rng(seed)
+    width, height = size
+    cloud = rng.random((height // 8 + 2, width // 8 + 2))
+    images = []
+    for index in range(frames):
+        shifted = np.roll(cloud, index, axis=1)
+        small = Image.fromarray((shifted * 255).astype(np.uint8))
+        layer = np.asarray(small.resize((width + 16, height + 16), Image.Resampling.BICUBIC))[:height, :width]
+        noise = rng.integers(0, 24, (height, width))
+        images.append(Image.fromarray(np.clip(layer.astype(int) + noise, 0, 255).astype(np.uint8)).convert("P"))
+    images = images[first:]
+    still = BytesIO()
+    images[-1].convert("RGB").save(still, format="PNG")
+    animated = BytesIO()
+    images[0].save(animated, format="GIF", save_all=True, append_images=images[1:], duration=80, loop=0)
+    return {"ott.png": still.getvalue(), "ott-animated.gif": animated.getvalue()}
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """
+    Serves the pages TropiCapture requests from Force-13 with the headers it relies on.
+
+    Every response carries an ETag and `Cache-Control: no-cache`, so TropiCapture's
+    CachedSession revalidates (and usually gets a 304) like it does against the live site.
+    Imagery is served for any storm id.
+    """
+    listing = DEFAULT_LISTING
+    protocol_version = "HTTP/1.1"
+
+    def _body(self):
+        path = self.path.split("?")[0]
+        if path == "/cyclones":
+            with open(os.path.join(FIXTURES_DIR, self.listing), "rb") as file:
+                return file.read(), "text/html; charset=utf-8"
+        parts = path.strip("/").split("/")
+        if len(parts) == 4 and parts[0] == "floaters" and parts[2] == "imagery":
+            body = floater_images().get(parts[3])
+            if body is not None:
+                return body, "image/png" if parts[3].endswith(".png") else "image/gif"
+        return None, None
+
+    def do_GET(self):
+        body, content_type = self._body()
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_standin(port=0, listing=DEFAULT_LISTING):
+    """
+    Start the stand-in Force-13 server on a background thread.
+
+    Returns:
+        tuple: (server, base URL); call server.shutdown() when done.
+    """
+    handler = type("Handler", (StandinHandler,), {"listing": listing})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the Force-13 pages TropiCapture uses.")
+    parser.add_argument("--port", type=int, default=8013)
+    parser.add_argument("--listing", default=DEFAULT_LISTING, help="Fixture served at /cyclones (default: %(default)s)")
+    args = parser.parse_args(argv)
+    server, url = start_standin(args.port, args.listing)
+    print(f"Serving on {url} - run TropiCapture with TROPICAPTURE_BASE_URL={url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import ROOT
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+# Recorded per machine with --update-baseline and never committed (it is in .gitignore)
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+# Benchmarks in the order they run; every tool has its own process, since the tool
+# folders share module names (run, render, create...)
+BENCHMARKS = ["startup", "tropicapture", "retrowx", "skewt", "hodograph"]
+DEFAULT_TOLERANCE = 0.3
+
+def run_benchmark(name, quick=False, trace_path=None):
+    """
+    Run benchmarks/bench_<name>.py in a fresh process, with span tracing on.
+
+    Returns:
+        tuple: (metrics dict, trace summary dict or None, captured output)
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        output = os.path.join(scratch, "metrics.json")
+        env = dict(os.environ, MPLBACKEND="Agg", PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+        env.pop("TEMPESTPY_PROFILE", None)
+        if trace_path:
+            env["TEMPESTPY_TRACE"] = trace_path
+        else:
+            env.pop("TEMPESTPY_TRACE", None)
+        command = [sys.executable, os.path.join(BENCH_DIR, f"bench_{name}.py"), "--output", output]
+        if quick:
+            command.append("--quick")
+        result = subprocess.run(command, cwd=scratch, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"bench_{name}.py failed (exit {result.returncode}):\n{result.stdout}")
+        with open(output) as file:
+            metrics = json.load(file)
+    summary = None
+    if trace_path and os.path.exists(trace_path):
+        with open(trace_path) as file:
+            summary = json.load(file).get("summary")
+    return metrics, summary, result.stdout
+
+def compare(metrics, baseline, tolerance):
+    """
+    Check metrics against baseline values.
+
+    Returns:
+        list: (metric name, value, baseline value or None, relative change, status) where
+            status is "ok", "faster", "REGRESSION" or "new". The relative change is
+            positive when things got better. A metric's own tolerance, when larger, wins.
+    """
+    rows = []
+    for name, entry in metrics.items():
+        reference = baseline.get(name)
+        if not reference:
+            rows.append((name, entry, None, 0.0, "new"))
+            continue
+        change = entry["value"] / reference - 1 if entry["higher_is_better"] else reference / entry["value"] - 1
+        allowed = max(tolerance, entry.get("tolerance", 0.0))
+        status = "REGRESSION" if change < -allowed else "faster" if change > allowed else "ok"
+        rows.append((name, entry, reference, change, status))
+    return rows
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)
+
+def save_baseline(baseline, path=BASELINE_PATH):
+    with open(path, "w") as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run every TempestPy tool headlessly on recorded/generated fixtures "
+                                                 "and fail on throughput regressions against benchmarks/baseline.json.")
+    parser.add_argument("benchmarks", nargs="*", metavar="benchmark",
+                        help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--quick", action="store_true", help="Smaller fixtures, compared with the 'quick' baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown as a fraction of the baseline (default: %(default)s)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file (default: benchmarks/baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="Record this run as the new baseline")
+    parser.add_argument("--trace-dir", help="Keep each benchmark's span trace here (default: a temporary directory)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest spans to show per benchmark (default: %(default)s)")
+    args = parser.parse_args(argv)
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    mode = "quick" if args.quick else "full"
+    baseline = load_baseline(args.baseline)
+    reference = baseline.get(mode, {})
+    recorded = {}
+    regressions = 0
+    with tempfile.TemporaryDirectory() as scratch:
+        trace_dir = args.trace_dir or scratch
+        os.makedirs(trace_dir, exist_ok=True)
+        for name in args.benchmarks or BENCHMARKS:
+            started = time.perf_counter()
+            metrics, summary, _ = run_benchmark(name, args.quick, os.path.join(trace_dir, f"{name}.json"))
+            print(f"== {name} ({time.perf_counter() - started:.1f} s)")
+            for metric_name, entry, expected, change, status in compare(metrics, reference.get(name, {}), args.tolerance):
+                against = f"baseline {expected:>12.1f}  {change:+6.0%}" if expected else "no baseline"
+                print(f"  {metric_name:<22} {entry['value']:>12.1f} {entry['unit']:<12} {against:<28} {status}")
+                regressions += status == "REGRESSION"
+            for span_name, entry in list((summary or {}).items())[:args.top]:
+                print(f"    span {span_name:<24} {entry['count']:>7}x  total {entry['total_ms']:>9.1f} ms"
+                      f"  self {entry['self_ms']:>9.1f} ms  max {entry['max_ms']:>8.2f} ms")
+            recorded[name] = {metric_name: round(entry["value"], 2) for metric_name, entry in metrics.items()}
+        if args.trace_dir:
+            print(f"Span traces written to {args.trace_dir} (open them in chrome://tracing or ui.perfetto.dev)")
+
+    if args.update_baseline:
+        baseline.setdefault(mode, {}).update(recorded)
+        baseline["machine"] = f"{platform.machine()} {platform.processor() or platform.system()}, {os.cpu_count()} CPU(s), Python {platform.python_version()}"
+        save_baseline(baseline, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+    if not reference:
+        print(f"No '{mode}' baseline yet; record one on this machine with --update-baseline.")
+    if regressions:
+        print(f"FAIL: {regressions} metric(s) slower than the baseline allows")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+import gc
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from tempestpy.png import BackgroundEncoder, safe_name, write_png
+from tempestpy.trace import span
+
+# PNGs rendered but not yet written; the renderer waits for the writer thread beyond this
+MAX_PENDING_WRITES = 4
+
+class BlitRenderer:
+    """
+    Base for headless renderers that reuse one figure for any number of images.
+
+    Everything static is drawn once and kept as a pixel buffer. For each image the buffer
+    is restored and only the data layers are drawn on top of it, and PNGs are encoded
+    against the same background (see tempestpy.png.BackgroundEncoder), so only the bands
+    of rows an image drew on are compressed.
+
+    Subclasses create their data artists with animated=True (so a normal draw leaves them
+    out of the background), draw the canvas and call capture_background() once the static
+    parts are in place, and list the data artists in _data_artists().
+    """
+
+    # First part of the span names ("<trace_name>.render", "<trace_name>.encode")
+    trace_name = "render"
+
+    def __init__(self, fig):
+        self.fig = fig
+        self.canvas = FigureCanvasAgg(fig)
+
+    def capture_background(self):
+        """
+        Keep the drawn canvas (everything but the animated data layers) as the background.
+        """
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.encoder = BackgroundEncoder(np.asarray(self.canvas.buffer_rgba()))
+
+    def _data_artists(self):
+        raise NotImplementedError
+
+    def render_rgba(self):
+        """
+        Restore the cached background, draw the data layers and return the RGBA pixels.
+        """
+        with span(f"{self.trace_name}.render"):
+            self.canvas.restore_region(self.background)
+            for artist in self._data_artists():
+                self.fig.draw_artist(artist)
+            return np.asarray(self.canvas.buffer_rgba())
+
+    def render_frame(self):
+        """
+        render_rgba as a standalone copy, safe to keep (and encode) after the next render.
+        """
+        return self.render_rgba().copy()
+
+    def write_png(self, path, pixels):
+        """
+        Encode pixels from this renderer against its background and write them to path.
+        """
+        with span(f"{self.trace_name}.encode"):
+            write_png(path, pixels, self.encoder)
+
+    def save(self, path):
+        """
+        Write the current image to a .png (blitted) or .svg (the same figure, fully drawn) file.
+        """
+        if path.endswith(".svg"):
+            # Vector output can't reuse pixels, but it still reuses the figure
+            artists = self._data_artists()
+            for artist in artists:
+                artist.set_animated(False)
+            try:
+                self.fig.savefig(path, format="svg")
+            finally:
+                for artist in artists:
+                    artist.set_animated(True)
+            return
+        self.write_png(path, self.render_rgba())
+
+    def close(self):
+        plt.close(self.fig)
+
+def render_all(renderer, items, update, out_dir, file_format="png", default_name="image"):
+    """
+    Write one image per item to out_dir/<item id>.<format>, reusing renderer for all of them.
+
+    PNGs are encoded and written on a background thread while the next item renders (at most
+    MAX_PENDING_WRITES images wait in memory). An item that fails is reported and counted and
+    the batch carries on.
+
+    Parameters:
+        renderer (BlitRenderer): Renderer to draw with; the caller closes it.
+        items (iterable): (item id, data) pairs.
+        update (callable): update(item id, data) points the renderer's data layers at one item.
+        out_dir (str): Output directory, created if missing.
+        file_format (str): 'png' or 'svg'.
+        default_name (str): File name for ids with no usable characters.
+
+    Returns:
+        dict: rendered, failed, seconds
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{renderer.trace_name}-png")
+    writes = deque()
+    rendered = failed = 0
+    started = time.perf_counter()
+    try:
+        for item_id, data in items:
+            try:
+                update(item_id, data)
+                path = os.path.join(out_dir, f"{safe_name(item_id, default_name)}.{file_format}")
+                if file_format == "png":
+                    writes.append(writer.submit(renderer.write_png, path, renderer.render_frame()))
+                    while len(writes) > MAX_PENDING_WRITES:
+                        writes.popleft().result()
+                else:
+                    renderer.save(path)
+                rendered += 1
+            except Exception as e:
+                failed += 1
+                print(f"{item_id}: {type(e).__name__}: {e}")
+        while writes:
+            writes.popleft().result()
+    finally:
+        writer.shutdown()
+    return {"rendered": rendered, "failed": failed, "seconds": time.perf_counter() - started}
+
+def compare_with_fresh(items, render_fresh, renderer, out_dir, default_name="image", passes=2):
+    """
+    Time fresh figures against a reused, blitted renderer on the same items.
+
+    Rendering (figure to pixels, what an on-screen draw costs) and the full path to a PNG file
+    are timed separately, per item, each as the best of `passes` passes: the slower passes are
+    the ones other processes got in the way of.
+
+    Parameters:
+        items (list): (item id, *data) tuples.
+        render_fresh (callable): render_fresh(path, item id, *data) draws one item on a new
+            figure and saves it to path, or only draws it when path is None.
+        renderer (BlitRenderer): Reused renderer; renderer.update(item id, *data) must take the
+            same arguments. The caller closes it.
+        out_dir (str): Directory for the PNG files, created if missing.
+
+    Returns:
+        dict: items, fresh_render_ms, cached_render_ms, render_speedup, fresh_png_ms,
+            cached_png_ms, png_speedup (times per item)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    def timed(function):
+        best = float("inf")
+        for _ in range(passes):
+            gc.collect()  # so no pass pays for collecting the figures the one before it left behind
+            started = time.perf_counter()
+            for item in items:
+                function(*item)
+            best = min(best, time.perf_counter() - started)
+        return best / len(items) * 1000
+
+    def path(prefix, item_id):
+        return os.path.join(out_dir, f"{prefix}_{safe_name(item_id, default_name)}.png")
+
+    def cached_render(*item):
+        renderer.update(*item)
+        renderer.render_rgba()
+
+    def cached_png(*item):
+        renderer.update(*item)
+        renderer.save(path("cached", item[0]))
+
+    fresh_render = timed(lambda *item: render_fresh(None, *item))
+    fresh_png = timed(lambda *item: render_fresh(path("fresh", item[0]), *item))
+    cached_render_ms = timed(cached_render)
+    cached_png_ms = timed(cached_png)
+    return {"items": len(items), "fresh_render_ms": fresh_render, "cached_render_ms": cached_render_ms,
+            "render_speedup": fresh_render / cached_render_ms, "fresh_png_ms": fresh_png,
+            "cached_png_ms": cached_png_ms, "png_speedup": fresh_png / cached_png_ms}
+
+def print_comparison(result, noun):
+    """
+    Print a compare_with_fresh result, e.g. print_comparison(result, "diagram").
+    """
+    print(f"{result['items']} soundings, ms per {noun}:")
+    print(f"  render:     fresh figure {result['fresh_render_ms']:7.1f}, reused figure {result['cached_render_ms']:6.1f} "
+          f"({result['render_speedup']:.1f}x faster)")
+    print(f"  PNG output: fresh figure {result['fresh_png_ms']:7.1f}, reused figure {result['cached_png_ms']:6.1f} "
+          f"({result['png_speedup']:.1f}x faster)")
@@ -0,0 +1,94 @@
+import argparse
+import importlib
+import os
+import sys
+
+from tempestpy.config import ROOT
+
+# Subcommand -> (tool directory, description, {script: (module, summary)}).
+# The first script of each tool is the one run when none is named.
+TOOLS = {
+    "tropicapture": ("TropiCapture", "Satellite imagery of active tropical systems from Force-13.", {
+        "run": ("run", "interactive imagery viewer; --watch archives new frames"),
+        "listing": ("listing", "parse a saved cyclone listing page, check/benchmark the parser"),
+        "frames": ("frames", "benchmark animated GIF frame decoding"),
+    }),
+    "retrowx": ("RetroWx", "Historical weather events database.", {
+        "run": ("run", "query events by date, place or text"),
+        "ingest": ("ingest", "import CSV archives into the database"),
+        "rollups": ("rollups", "daily/monthly summaries and climatology"),
+        "columnar": ("columnar", "export to Parquet/Arrow (needs pyarrow)"),
+        "service": ("service", "local JSON query service"),
+    }),
+    "hodograph": ("Custom Hodograph Creator", "Hodographs, helicity, shear and storm motion.", {
+        "create": ("create", "draw a hodograph from winds you enter"),
+        "calc": ("hodocalc", "helicity/shear/Bunkers motion for many soundings"),
+        "render": ("render", "render many hodographs to PNG/SVG"),
+    }),
+    "skewt": ("Custom Skew-T Diagram Creator", "Skew-T diagrams and parcel thermodynamics.", {
+        "create": ("create", "draw a Skew-T diagram from a sounding you enter"),
+        "batch": ("batch", "CAPE/CIN/LCL/LFC for many soundings on all cores"),
+        "render": ("render", "render many Skew-T diagrams to PNG/SVG"),
+    }),
+}
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m tempestpy", description="TempestPy Weather Enthusiast Suite launcher.",
+        epilog="Run 'python -m tempestpy <tool> <script> --help' for the options of a script.")
+    parser.add_argument("--trace", metavar="FILE", help="Write a JSON timing trace of the run (chrome://tracing format)")
+    parser.add_argument("--profile", metavar="FILE", help="Dump cProfile stats of the run")
+    subparsers = parser.add_subparsers(dest="tool", metavar="<tool>", required=True)
+    for name, (_, description, scripts) in TOOLS.items():
+        default = next(iter(scripts))
+        listing = "\n".join(f"  {script:<10} {summary}" for script, (_, summary) in scripts.items())
+        tool = subparsers.add_parser(
+            name, help=description, description=f"{description}\n\nscripts (default: {default}):\n{listing}",
+            formatter_class=argparse.RawDescriptionHelpFormatter)
+        tool.add_argument("args", nargs=argparse.REMAINDER, metavar="[script] ...",
+                          help="script to run and its own arguments")
+    return parser
+
+def run_tool(tool, argv):
+    """
+    Import one tool script and call its main() with the remaining arguments.
+
+    Only here are the tool's modules (and with them matplotlib, MetPy, pandas, PIL...)
+    imported, so the launcher itself starts in a few milliseconds.
+    """
+    directory, _, scripts = TOOLS[tool]
+    script = argv[0] if argv and argv[0] in scripts else next(iter(scripts))
+    if argv and argv[0] == script:
+        argv = argv[1:]
+    # The tool scripts import their siblings by bare module name, and tempestpy from the repository root
+    sys.path[:0] = [os.path.join(ROOT, directory), ROOT]
+    module = importlib.import_module(scripts[script][0])
+    sys.argv = [f"python -m tempestpy {tool} {script}"] + argv
+    return module.main(argv)
+
+def _launcher_options(argv):
+    # --trace/--profile go before the tool name; everything after it belongs to the script
+    options = {}
+    while argv and argv[0].split("=")[0] in ("--trace", "--profile"):
+        name, _, value = argv[0].partition("=")
+        if not value:
+            if len(argv) < 2:
+                break
+            value, argv = argv[1], argv[1:]
+        options[name[2:]] = value
+        argv = argv[1:]
+    return options, argv
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    options, argv = _launcher_options(argv)
+    if options:
+        from tempestpy.trace import enable
+        enable(options.get("trace"), options.get("profile"))
+    # Hand everything after the tool name to the script untouched (argparse's REMAINDER
+    # won't take arguments that start with an option, e.g. 'python -m tempestpy retrowx --db x');
+    # the launcher's own parser only handles help and unknown tools
+    if argv and argv[0] in TOOLS and argv[1:2] not in (["-h"], ["--help"]):
+        return run_tool(argv[0], argv[1:])
+    args = build_parser().parse_args(argv)
+    return run_tool(args.tool, args.args)
@@ -0,0 +1,32 @@
+import functools
+import os
+
+# Repository root: the tool directories, Assets and the shared settings files live here
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _read_setting(name):
+    with open(os.path.join(ROOT, name), 'r') as file:
+        return file.read().strip()
+
+@functools.lru_cache(maxsize=None)
+def release_name():
+    """
+    TempestPy release name and version from globalversionnumber.txt, shown in window titles.
+    """
+    return _read_setting("globalversionnumber.txt")
+
+@functools.lru_cache(maxsize=None)
+def icon_path():
+    """
+    Absolute path of the window icon named in iconlocation.txt.
+
+    The file holds the path as the tools used to open it from their own directory
+    (`..\\Assets\\...`, Windows separators), so it works from any working directory and OS.
+    """
+    location = _read_setting("iconlocation.txt").replace("\\", "/")
+    if os.path.isabs(location):
+        return os.path.normpath(location)
+    # Relative to a tool directory, i.e. one level below the root
+    if location.startswith("../"):
+        location = location[3:]
+    return os.path.normpath(os.path.join(ROOT, location))
@@ -0,0 +1,196 @@
+import argparse
+import time
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+class HoverLayer:
+    """
+    Hover annotations for plotted profiles that stay responsive with thousands of points.
+
+    The points of every series are put in a KD-tree in screen (pixel) coordinates, so
+    finding the point under the mouse is a tree query however long the profile is, and it
+    works on any axes transform (the skewed Skew-T axes included). The tree is rebuilt
+    only when the figure is redrawn, i.e. after a zoom, pan or resize.
+
+    Only the annotation and a highlight marker are redrawn while hovering: the rest of the
+    figure is restored from a saved copy of the last full draw (blitting). Mouse moves are
+    coalesced to at most max_fps redraws per second; the newest position is always the one
+    drawn, so the annotation never lags behind the cursor by more than one frame.
+    """
+
+    def __init__(self, ax, series, formatter, radius=10, max_fps=60, annotation_kwargs=None, marker_kwargs=None):
+        """
+        Parameters:
+            ax (matplotlib.axes.Axes): Axes the series are plotted on.
+            series (list): (x, y) pairs of arrays in data coordinates, one per hoverable profile.
+            formatter (callable): formatter(series index, point index) -> annotation text.
+            radius (float): How close to a point (pixels) the mouse has to be.
+            max_fps (float): Maximum annotation redraws per second.
+            annotation_kwargs (dict, optional): Extra Axes.annotate arguments (font, colors...).
+            marker_kwargs (dict, optional): Style of the highlight marker, None to use the default.
+        """
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.formatter = formatter
+        self.radius = radius
+        self.min_interval = 1.0 / max_fps
+        self.points = []
+        self.owners = []
+        for index, (x, y) in enumerate(series):
+            xy = np.column_stack((np.asarray(x, dtype=np.float64).ravel(), np.asarray(y, dtype=np.float64).ravel()))
+            valid = np.flatnonzero(np.isfinite(xy).all(axis=1))
+            self.points.append(xy[valid])
+            self.owners.append(np.column_stack((np.full(len(valid), index), valid)))
+        self.points = np.concatenate(self.points) if self.points else np.empty((0, 2))
+        self.owners = np.concatenate(self.owners) if self.owners else np.empty((0, 2), dtype=int)
+
+        annotation_kwargs = dict({"xytext": (10, 10), "textcoords": "offset points", "ha": 'center'}, **(annotation_kwargs or {}))
+        self.annotation = ax.annotate("", xy=(0, 0), visible=False, animated=True, **annotation_kwargs)
+        marker_kwargs = marker_kwargs if marker_kwargs is not None else {"marker": 'o', "markersize": 10,
+                                                                         "markerfacecolor": 'none', "markeredgecolor": 'black'}
+        self.marker, = ax.plot([], [], linestyle='none', visible=False, animated=True, **marker_kwargs)
+        self.current = None
+        self.tree = None
+        self.background = None
+        self.pending = None
+        self.last_draw = 0.0
+        self.timer = self.canvas.new_timer(interval=int(self.min_interval * 1000))
+        self.timer.single_shot = True
+        self.timer.add_callback(self._flush)
+        self.connections = [self.canvas.mpl_connect("draw_event", self._on_draw),
+                            self.canvas.mpl_connect("motion_notify_event", self._on_motion),
+                            self.canvas.mpl_connect("figure_leave_event", self._on_leave)]
+
+    def _on_draw(self, event):
+        # A full draw happened (first show, zoom, pan, resize): new pixels to restore from and
+        # new screen positions for every point
+        self.background = self.canvas.copy_from_bbox(self.ax.figure.bbox) if self.canvas.supports_blit else None
+        self.tree = cKDTree(self.ax.transData.transform(self.points)) if len(self.points) else None
+        self._draw_overlay()
+
+    def _on_motion(self, event):
+        self.pending = (event.x, event.y) if event.inaxes is self.ax else None
+        wait = self.min_interval - (time.perf_counter() - self.last_draw)
+        if wait <= 0:
+            self._flush()
+        else:
+            # Too soon after the last redraw: the timer picks up the newest position
+            self.timer.start()
+
+    def _on_leave(self, event):
+        self.pending = None
+        self._flush()
+
+    def _flush(self):
+        position, self.pending = self.pending, None
+        self.hover(*(position or (None, None)))
+
+    def _nearest_index(self, x, y):
+        if self.tree is None or x is None:
+            return None
+        distance, index = self.tree.query((x, y), distance_upper_bound=self.radius)
+        return int(index) if np.isfinite(distance) else None
+
+    def nearest(self, x, y):
+        """
+        (series index, point index) of the closest point within radius of a screen position, or None.
+        """
+        index = self._nearest_index(x, y)
+        return None if index is None else tuple(int(i) for i in self.owners[index])
+
+    def hover(self, x, y):
+        """
+        Show the annotation for the point nearest to screen position (x, y), or hide it for None.
+        Redraws only when the hovered point changes.
+        """
+        found = self._nearest_index(x, y)
+        if found == self.current:
+            return
+        self.current = found
+        if found is not None:
+            xy = self.points[found]
+            series, point = self.owners[found]
+            self.annotation.xy = xy
+            self.annotation.set_text(self.formatter(int(series), int(point)))
+            self.marker.set_data([xy[0]], [xy[1]])
+        self.annotation.set_visible(found is not None)
+        self.marker.set_visible(found is not None)
+        self._draw_overlay()
+        self.last_draw = time.perf_counter()
+
+    def _draw_overlay(self):
+        if self.background is None:
+            if not self.canvas.supports_blit:
+                self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self.ax.draw_artist(self.marker)
+        self.ax.draw_artist(self.annotation)
+        self.canvas.blit(self.ax.figure.bbox)
+
+    def disconnect(self):
+        for connection in self.connections:
+            self.canvas.mpl_disconnect(connection)
+        self.timer.stop()
+
+def benchmark(levels=5000, moves=200):
+    """
+    Time one mouse move on a profile with `levels` points: the contains() + full redraw
+    handler the creators used vs HoverLayer, on an off-screen Agg canvas.
+
+    Returns:
+        dict: levels, full_redraw_ms, hover_layer_ms, speedup (per mouse move)
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.backend_bases import MouseEvent
+
+    rng = np.random.default_rng(0)
+    pressure = np.linspace(1000, 100, levels)
+    temperature = np.cumsum(rng.normal(-0.07, 0.3, levels)) * 1000 / levels + 25
+    fig, ax = plt.subplots(figsize=(8, 10))
+    ax.plot(temperature, pressure, 'r')
+    scatter = ax.scatter(temperature, pressure, s=4)
+    ax.invert_yaxis()
+    fig.canvas.draw()
+    screen = ax.transData.transform(np.column_stack((temperature, pressure)))
+    # Moves along the profile, so most of them land on a new point
+    path = screen[np.linspace(0, levels - 1, moves).astype(int)] + rng.normal(0, 2, (moves, 2))
+
+    annotation = ax.annotate("", xy=(0, 0), xytext=(10, 10), textcoords="offset points", visible=False)
+    started = time.perf_counter()
+    for x, y in path:
+        event = MouseEvent("motion_notify_event", fig.canvas, x, y)
+        hit, info = scatter.contains(event)
+        if hit:
+            index = info["ind"][0]
+            annotation.xy = (temperature[index], pressure[index])
+            annotation.set_text(f"{pressure[index]:.0f} hPa")
+        annotation.set_visible(hit)
+        fig.canvas.draw()
+    full_redraw = (time.perf_counter() - started) / moves * 1000
+    annotation.remove()
+
+    layer = HoverLayer(ax, [(temperature, pressure)], lambda series, index: f"{pressure[index]:.0f} hPa")
+    fig.canvas.draw()
+    started = time.perf_counter()
+    for x, y in path:
+        layer.hover(x, y)
+    hover_layer = (time.perf_counter() - started) / moves * 1000
+    plt.close(fig)
+    return {"levels": levels, "full_redraw_ms": full_redraw, "hover_layer_ms": hover_layer,
+            "speedup": full_redraw / hover_layer}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark hover handling on dense profiles.")
+    parser.add_argument("--levels", type=int, nargs="+", default=[5, 500, 5000], help="Profile sizes to time (default: %(default)s)")
+    args = parser.parse_args(argv)
+    for levels in args.levels:
+        result = benchmark(levels)
+        print(f"{result['levels']:>6} levels: full redraw {result['full_redraw_ms']:7.2f} ms, "
+              f"hover layer {result['hover_layer_ms']:6.2f} ms per mouse move ({result['speedup']:.0f}x faster)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from tempestpy.config import ROOT
+
+# Packages only tool subcommands may import; any of them at launcher startup is a regression
+HEAVY_MODULES = ["matplotlib", "metpy", "numpy", "pandas", "scipy", "PIL", "bs4", "lxml", "requests", "pyarrow", "tkinter"]
+BUDGET_MS = 100.0
+
+def parse_importtime(stderr):
+    """
+    Parse `python -X importtime` output.
+
+    Returns:
+        list: (module, self microseconds, cumulative microseconds) for every import, in the
+            order Python reports them (a package after its own imports). Module names keep
+            Python's indentation: two spaces per level of nesting.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return imports
+
+def measure(args=("--help",), runs=5):
+    """
+    Start `python -m tempestpy <args>` runs times, the last one with -X importtime.
+
+    Returns:
+        dict: wall_ms (best of the runs, interpreter start included), python_ms (best time
+            of a bare `python -c pass`, for comparison), import_ms (total of the top-level
+            imports), imports (see parse_importtime) and heavy (HEAVY_MODULES that got imported).
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    command = [sys.executable, "-m", "tempestpy", *args]
+
+    def best_ms(command):
+        times = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            times.append((time.perf_counter() - started) * 1000)
+        return min(times)
+
+    traced = subprocess.run([sys.executable, "-X", "importtime", *command[1:]], env=env, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True, check=True)
+    imports = parse_importtime(traced.stderr)
+    # Top-level imports are the ones without leading spaces in the module column
+    names = {name.strip().split(".")[0] for name, _, _ in imports}
+    total_us = sum(cumulative for name, _, cumulative in imports if not name.startswith(" "))
+    return {"wall_ms": best_ms(command), "python_ms": best_ms([sys.executable, "-c", "pass"]), "import_ms": total_us / 1000, "imports": imports,
+            "heavy": [module for module in HEAVY_MODULES if module in names]}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that the launcher (python -m tempestpy) starts fast and imports nothing heavy.")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="Wall time limit for 'python -m tempestpy --help' (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=5, help="Launches to time, the best one counts (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports to list (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    result = measure(runs=args.runs)
+    print(f"python -m tempestpy --help: {result['wall_ms']:.1f} ms wall (best of {args.runs}; bare interpreter "
+          f"{result['python_ms']:.1f} ms), {result['import_ms']:.1f} ms in imports, budget {args.budget_ms:.0f} ms")
+    for name, self_us, cumulative_us in sorted(result["imports"], key=lambda item: -item[1])[:args.top]:
+        print(f"  {self_us / 1000:6.2f} ms  {name.strip()}")
+    failures = []
+    if result["heavy"]:
+        failures.append(f"heavy modules imported at startup: {', '.join(result['heavy'])}")
+    if result["wall_ms"] > args.budget_ms:
+        failures.append(f"startup took {result['wall_ms']:.1f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
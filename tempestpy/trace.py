@@ -0,0 +1,157 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+# Set either one to trace a run without touching its command line (any tool, any entry point)
+TRACE_ENV = "TEMPESTPY_TRACE"
+PROFILE_ENV = "TEMPESTPY_PROFILE"
+
+class Tracer:
+    """
+    Collects timed spans of one process and writes them as a Chrome/Perfetto trace.
+
+    Spans nest per thread. The JSON file holds `traceEvents` (complete "X" events, open it
+    in chrome://tracing or ui.perfetto.dev) plus a `summary` of count/total/self/max time
+    per span name, which is usually enough to see where a run spends its time.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.origin = time.perf_counter()
+        self.events = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def record(self, name, started, ended, attrs, child_seconds):
+        event = {"name": name, "cat": name.split(".")[0], "ph": "X", "pid": os.getpid(),
+                 "tid": threading.get_ident(), "ts": (started - self.origin) * 1e6,
+                 "dur": (ended - started) * 1e6, "self": (ended - started - child_seconds) * 1e6}
+        if attrs:
+            event["args"] = attrs
+        with self._lock:
+            self.events.append(event)
+
+    def summary(self):
+        """
+        Returns:
+            dict: span name -> count, total_ms, self_ms (total minus nested spans), max_ms,
+                sorted by total time, largest first.
+        """
+        totals = {}
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            entry = totals.setdefault(event["name"], {"count": 0, "total_ms": 0.0, "self_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += event["dur"] / 1000
+            entry["self_ms"] += event["self"] / 1000
+            entry["max_ms"] = max(entry["max_ms"], event["dur"] / 1000)
+        return dict(sorted(totals.items(), key=lambda item: -item[1]["total_ms"]))
+
+    def write(self, path=None):
+        path = path or self.path
+        with self._lock:
+            events = [{key: value for key, value in event.items() if key != "self"} for event in self.events]
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms", "summary": self.summary()}, file)
+
+_tracer = None
+_profiler = None
+_profile_path = None
+
+class span:
+    """
+    Time a block as a named span: `with span("retrowx.sql", query="range"): ...`
+
+    Names are "<tool>.<stage>". Keyword arguments are stored with the span. When tracing
+    is off (the default) a span costs about a microsecond, so spans belong around stages
+    (a fetch, a query, a solver call), not inside per-point loops.
+    Also works as a decorator: `@span("skewt.solver")`.
+    """
+    __slots__ = ("name", "attrs", "started", "children", "tracer")
+
+    def __init__(self, name, **attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.tracer = _tracer
+        if self.tracer is not None:
+            self.tracer._stack().append(self)
+            self.children = 0.0
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        tracer = self.tracer
+        if tracer is None:
+            return False
+        ended = time.perf_counter()
+        stack = tracer._stack()
+        stack.pop()
+        if stack:
+            stack[-1].children += ended - self.started
+        tracer.record(self.name, self.started, ended, self.attrs, self.children)
+        return False
+
+    def __call__(self, function):
+        name, attrs = self.name, self.attrs
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name, **attrs):
+                return function(*args, **kwargs)
+        return wrapper
+
+def enabled():
+    return _tracer is not None
+
+def enable(trace_path=None, profile_path=None):
+    """
+    Start recording spans (and optionally profiling) for the rest of this process.
+
+    Parameters:
+        trace_path (str, optional): JSON trace written when the process exits.
+        profile_path (str, optional): cProfile stats dumped at exit (read them with pstats
+            or snakeviz).
+
+    Returns:
+        Tracer: The active tracer, also available for summary() before exit.
+    """
+    global _tracer, _profiler, _profile_path
+    if _tracer is None:
+        _tracer = Tracer(trace_path)
+        atexit.register(_finish)
+    elif trace_path:
+        _tracer.path = trace_path
+    if profile_path and _profiler is None:
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profile_path = profile_path
+        _profiler.enable()
+    return _tracer
+
+def _finish():
+    global _profiler
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(_profile_path)
+        _profiler = None
+    if _tracer is not None and _tracer.path:
+        _tracer.write()
+
+def get_tracer():
+    return _tracer
+
+if os.environ.get(TRACE_ENV) or os.environ.get(PROFILE_ENV):
+    enable(os.environ.get(TRACE_ENV) or None, os.environ.get(PROFILE_ENV) or None)
@@ -0,0 +1,16 @@
+import numpy as np
+
+def wind_components(speed, direction):
+    """
+    Vectorized u/v components, the same convention as metpy.calc.wind_components.
+
+    Parameters:
+        speed (array-like): Wind speed (any unit, u/v come back in the same unit).
+        direction (array-like): Direction the wind blows from, in degrees.
+
+    Returns:
+        tuple: (u, v) float arrays with the shape of the inputs.
+    """
+    radians = np.deg2rad(np.asarray(direction, dtype=np.float64))
+    speed = np.asarray(speed, dtype=np.float64)
+    return -speed * np.sin(radians), -speed * np.cos(radians)
@@ -0,0 +1,12 @@
+import os
+import sys
+
+# Repository root, where the tool folders and the shared tempestpy package live
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Tool modules import each other by bare name, as under the launcher. Every tool folder is on the
+# path at once, so tests only import modules whose names are unique across tools (not run, create or render).
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")] + [
+    os.path.join(ROOT, directory)
+    for directory in ("TropiCapture", "RetroWx", "Custom Hodograph Creator", "Custom Skew-T Diagram Creator")
+]
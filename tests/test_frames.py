@@ -0,0 +1,40 @@
+import time
+from io import BytesIO
+
+from PIL import Image
+
+from frames import FramePlayer
+from standin import floater_images
+
+class FakeRoot:
+    # Records Tk's after() calls instead of running a Tk event loop (there is no display here)
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+class FakeLabel:
+    def __init__(self):
+        self.options = {}
+
+    def config(self, **options):
+        self.options.update(options)
+
+def play_until_idle(player, root, timeout=10):
+    # Run the player's ticks until it stops rescheduling itself
+    deadline = time.monotonic() + timeout
+    player.start()
+    while root.scheduled and time.monotonic() < deadline:
+        root.scheduled.pop(0)()
+        time.sleep(0.01)
+    return not root.scheduled
+
+def test_decode_error_stops_polling_and_is_shown():
+    data = floater_images()["ott-animated.gif"]
+    image = Image.open(BytesIO(data[:len(data) // 20]))  # the header parses, the frames don't
+    root, label = FakeRoot(), FakeLabel()
+    player = FramePlayer(root, label, image)
+    assert play_until_idle(player, root)
+    assert player.decoded and not player.frames and player.error is not None
+    assert label.options["text"].startswith("Could not play the animation")
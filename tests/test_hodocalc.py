@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from hodocalc import (KNOTS_TO_MS, PARAMETERS, hodograph_parameters, reference_parameters, storm_relative_helicity,
+                      synthetic_soundings)
+
+# create.py's five levels, and one sounding typed into it with the values create.py computes for it
+PRESSURE = [1000, 850, 600, 350, 150]
+SPEED = [10, 25, 40, 55, 70]
+DIRECTION = [160, 200, 240, 260, 270]
+CREATE_PY = {
+    "helicity": 9.99496780291135, "shear_u": 73.4202014332567, "shear_v": -9.396926207859071,
+    "shear_mag": 74.01910699715268, "mean_u": 23.483936179233503, "mean_v": 15.609972874796995,
+    "rm_u": 24.436081502489756, "rm_v": 23.049288655391422, "lm_u": 22.53179085597725, "lm_v": 8.170657094202568,
+}
+
+def test_pressure_mode_matches_create_py():
+    params = hodograph_parameters(PRESSURE, [SPEED], [DIRECTION])
+    for name, value in CREATE_PY.items():
+        assert params[name][0] == pytest.approx(value, rel=1e-12)
+    # create.py's flipped rotation: its right mover is to the left of (counterclockwise from) the shear
+    turn = CREATE_PY["shear_u"] * (CREATE_PY["rm_v"] - CREATE_PY["mean_v"]) - CREATE_PY["shear_v"] * (CREATE_PY["rm_u"] - CREATE_PY["mean_u"])
+    assert turn > 0
+
+def test_pressure_mode_matches_the_metpy_reference():
+    pressure, speed, direction = synthetic_soundings(20)
+    params = hodograph_parameters(pressure, speed, direction)
+    for index in range(len(speed)):
+        reference = reference_parameters(pressure, speed[index], direction[index])
+        for name in PARAMETERS:
+            assert params[name][index] == pytest.approx(reference[name], rel=1e-9, abs=1e-9)
+
+def test_pressure_mode_ragged_soundings():
+    speed = np.array([SPEED, SPEED[:3] + [np.nan, np.nan], [SPEED[0]] + [np.nan] * 4], dtype=float)
+    direction = np.array([DIRECTION] * 3, dtype=float)
+    params = hodograph_parameters(PRESSURE, speed, direction)
+    cut = hodograph_parameters(PRESSURE[:3], [SPEED[:3]], [DIRECTION[:3]])
+    for name in PARAMETERS:
+        assert params[name][0] == pytest.approx(CREATE_PY[name], rel=1e-12)
+        assert params[name][1] == pytest.approx(cut[name][0], rel=1e-12)
+        assert np.isnan(params[name][2])
+
+# Analytic height-mode profile: a straight westerly hodograph, u = SHEAR * z (m/s), v = 0
+SHEAR = 0.005  # 5 m/s per km
+
+def straight_profile(top=8000, step=250):
+    height = np.arange(0, top + step, step, dtype=float)
+    return height, SHEAR * height / KNOTS_TO_MS, np.full_like(height, 270.0)
+
+@pytest.mark.parametrize("step", [500, 250, 50])
+def test_height_mode_on_a_straight_hodograph(step):
+    height, speed, direction = straight_profile(step=step)
+    result = storm_relative_helicity(None, [speed], [direction], height=height)
+    # 0-6 km mean wind is u(3 km); the shear from the 0-0.5 km to the 5.5-6 km mean is along +u,
+    # so the right mover sits 7.5 m/s to the right of it (south, -v) and the left mover north
+    assert result["mean_u"][0] == pytest.approx(SHEAR * 3000 / KNOTS_TO_MS)
+    assert result["shear_u"][0] == pytest.approx(SHEAR * 5500 / KNOTS_TO_MS)
+    assert result["rm_u"][0] == pytest.approx(SHEAR * 3000 / KNOTS_TO_MS)
+    assert result["rm_v"][0] == pytest.approx(-7.5 / KNOTS_TO_MS)
+    assert result["lm_v"][0] == pytest.approx(7.5 / KNOTS_TO_MS)
+    # SRH of a straight hodograph relative to a motion 7.5 m/s off it: 7.5 m/s times the wind change
+    assert result["srh_0_1km"][0] == pytest.approx(7.5 * SHEAR * 1000)
+    assert result["srh_0_3km"][0] == pytest.approx(7.5 * SHEAR * 3000)
+
+def test_height_mode_layer_bounds_between_levels():
+    # 0-1 km and 0-3 km fall between the 700 m-spaced levels; the answer must not change
+    height, speed, direction = straight_profile(top=8400, step=700)
+    result = storm_relative_helicity(None, [speed], [direction], height=height)
+    assert result["srh_0_1km"][0] == pytest.approx(7.5 * SHEAR * 1000)
+    assert result["srh_0_3km"][0] == pytest.approx(7.5 * SHEAR * 3000)
+
+def test_height_mode_ragged_profiles():
+    height, speed, direction = straight_profile()
+    short = len(height) - 4  # still above 6 km
+    shallow = int(np.searchsorted(height, 2000)) + 1  # only reaches 2 km
+    heights = np.tile(height, (3, 1))
+    speeds = np.tile(speed, (3, 1))
+    directions = np.tile(direction, (3, 1))
+    for row, levels in ((1, short), (2, shallow)):
+        heights[row, levels:] = speeds[row, levels:] = directions[row, levels:] = np.nan
+    result = storm_relative_helicity(None, speeds, directions, height=heights)
+    for name, values in result.items():
+        assert values[1] == pytest.approx(values[0]), name
+    # Too shallow for the 0-6 km Bunkers layers, so there is no storm motion to be relative to
+    assert np.isnan(result["rm_u"][2]) and np.isnan(result["srh_0_1km"][2]) and np.isnan(result["srh_0_3km"][2])
@@ -0,0 +1,92 @@
+import hashlib
+import os
+
+import pytest
+import requests
+
+from httpcache import CachedSession
+from standin import floater_images, start_standin
+
+@pytest.fixture
+def standin():
+    server, url = start_standin()
+    yield server, url
+    server.shutdown()
+    server.server_close()
+
+def cache_key(url):
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+def respond_with(server, status):
+    # Make the stand-in answer every request with a bare status from now on
+    def do_GET(handler):
+        handler.send_response(status)
+        handler.send_header("Content-Length", "0")
+        handler.end_headers()
+    server.RequestHandlerClass.do_GET = do_GET
+
+def test_unchanged_body_is_revalidated_and_served_from_disk(standin, tmp_path):
+    server, url = standin
+    requests_seen = []
+    handle = server.RequestHandlerClass.do_GET
+    def do_GET(handler):
+        requests_seen.append(handler.headers.get("If-None-Match"))
+        handle(handler)
+    server.RequestHandlerClass.do_GET = do_GET
+    session = CachedSession(str(tmp_path))
+    first = session.get(f"{url}/floaters/AL01/imagery/ott.png")
+    second = session.get(f"{url}/floaters/AL01/imagery/ott.png")
+    session.close()
+    assert not first.from_cache and first.content == floater_images()["ott.png"]
+    # no-cache: the second GET is a conditional one, answered with a 304 and the body from disk
+    assert requests_seen[0] is None and requests_seen[1] == first.headers["ETag"]
+    assert second.from_cache and not second.stale
+    assert second.status_code == 200 and second.content == first.content
+
+def test_least_recently_used_entries_are_evicted(standin, tmp_path):
+    _, url = standin
+    size = len(floater_images()["ott.png"])
+    session = CachedSession(str(tmp_path), max_bytes=2 * size + 1)
+    urls = {storm: f"{url}/floaters/{storm}/imagery/ott.png" for storm in ("AL01", "AL02", "AL03")}
+    session.get(urls["AL01"])
+    session.get(urls["AL02"])
+    # Revalidating AL01 makes AL02 the least recently used entry
+    assert session.get(urls["AL01"]).from_cache
+    session.get(urls["AL03"])
+    session.close()
+    stored = {name[:-5] for name in os.listdir(tmp_path) if name.endswith(".body")}
+    assert stored == {cache_key(urls["AL01"]), cache_key(urls["AL03"])}
+    # A new session rebuilds the same index from disk
+    assert set(CachedSession(str(tmp_path), max_bytes=2 * size + 1)._index) == stored
+
+@pytest.mark.parametrize("status", [501, 503])
+def test_server_errors_serve_the_stale_copy(standin, tmp_path, status):
+    server, url = standin
+    session = CachedSession(str(tmp_path), retries=0)
+    first = session.get(f"{url}/cyclones")
+    respond_with(server, status)
+    stale = session.get(f"{url}/cyclones")
+    session.close()
+    assert stale.from_cache and stale.stale and stale.content == first.content
+
+def test_connection_errors_serve_the_stale_copy(standin, tmp_path):
+    server, url = standin
+    session = CachedSession(str(tmp_path), retries=0)
+    first = session.get(f"{url}/cyclones")
+    session.close()
+    server.shutdown()
+    server.server_close()
+    # A later run, offline: nothing is listening on the port any more
+    session = CachedSession(str(tmp_path), retries=0)
+    stale = session.get(f"{url}/cyclones")
+    session.close()
+    assert stale.stale and stale.content == first.content
+
+def test_client_errors_are_raised_despite_a_cached_copy(standin, tmp_path):
+    server, url = standin
+    session = CachedSession(str(tmp_path), retries=0)
+    session.get(f"{url}/floaters/AL01/imagery/ott.png")
+    respond_with(server, 404)
+    with pytest.raises(requests.HTTPError):
+        session.get(f"{url}/floaters/AL01/imagery/ott.png")
+    session.close()
@@ -0,0 +1,64 @@
+import csv
+
+import pytest
+
+from ingest import INSERT_SQL, ingest, main, normalize_batch, read_batches
+from schema import open_database
+
+ROWS = [
+    ("2013/05/31", "19.0", "", "19", "E", "1000.2", "Tornado near El Reno", "35.53° N 97.95°W"),
+    ("2013/5/31 23:05", "17.5", "2.5", "40", "270", "", "Hail and damaging winds", "35.39, -97.60"),
+    ("2013-06-01", "21", "0", "10", "NNW", "1011", "Clear skies after the storms", "35.47° N 97.52°W"),
+    ("2011/04/27", "", "", "", "", "", "Tornado outbreak", "33.21° N 87.57°W"),
+    ("2011/04/27", "25", "", "30", "225", "995", "Same day, another station", "34.73, -86.59"),
+    ("not a date", "1", "", "", "", "", "Rejected", "35, -97"),
+    ("2012/02/30", "1", "", "", "", "", "Rejected too", "35, -97"),
+    ("1999/05/03", "24", "5", "", "", "", "", "no coordinates here"),
+]
+
+@pytest.fixture
+def archive(tmp_path):
+    path = tmp_path / "archive.csv"
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["date", "temperature", "precipitation", "wind_speed", "wind_direction",
+                         "pressure", "additional_info", "location"])
+        writer.writerows(ROWS)
+    return str(path)
+
+def derived_tables(db_path):
+    # Everything the suspended per-row triggers maintain
+    conn = open_database(db_path)
+    try:
+        return {
+            "rtree": conn.execute("SELECT * FROM historical_weather_rtree ORDER BY id").fetchall(),
+            "fts": conn.execute("SELECT rowid, additional_info FROM historical_weather_fts ORDER BY rowid").fetchall(),
+            "fts_match": conn.execute("SELECT rowid FROM historical_weather_fts WHERE historical_weather_fts MATCH 'tornado' "
+                                      "ORDER BY rowid").fetchall(),
+            "dirty": conn.execute("SELECT day FROM weather_rollup_dirty ORDER BY day").fetchall(),
+        }
+    finally:
+        conn.close()
+
+def test_second_ingest_inserts_nothing(archive, tmp_path):
+    db_path = str(tmp_path / "bulk.db")
+    first = ingest(db_path, [archive], batch_size=3, commit_every=3, workers=0, refresh=False)
+    second = ingest(db_path, [archive], batch_size=3, commit_every=3, workers=0, refresh=False)
+    assert (first["read"], first["inserted"], first["duplicates"], first["rejected"]) == (8, 6, 0, 2)
+    assert (second["read"], second["inserted"], second["duplicates"], second["rejected"]) == (8, 0, 6, 2)
+
+    # The same rows inserted one by one with every trigger in place
+    reference_path = str(tmp_path / "triggers.db")
+    conn = open_database(reference_path)
+    for header, rows in read_batches(archive, 100):
+        conn.executemany(INSERT_SQL, normalize_batch(header, rows)[0])
+    conn.commit()
+    conn.close()
+    bulk, reference = derived_tables(db_path), derived_tables(reference_path)
+    assert len(reference["rtree"]) == 5 and len(reference["fts_match"]) == 2
+    assert bulk == reference
+
+def test_commit_every_option(archive, tmp_path, capsys):
+    db_path = str(tmp_path / "cli.db")
+    main([archive, "--db", db_path, "--workers", "0", "--commit-every", "2", "--batch-size", "2"])
+    assert "6 inserted" in capsys.readouterr().out
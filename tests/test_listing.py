@@ -0,0 +1,37 @@
+import glob
+import json
+import os
+
+import pytest
+
+import listing
+from listing import FIXTURES_DIR, parse_listing, parse_listing_legacy
+
+PAGES = sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html")))
+
+def read(path):
+    with open(path, "rb") as file:
+        return file.read()
+
+@pytest.fixture(params=["lxml", "html.parser"])
+def parser(request, monkeypatch):
+    if request.param == "lxml":
+        if listing.etree is None:
+            pytest.skip("lxml is not installed")
+    else:
+        monkeypatch.setattr(listing, "etree", None)
+    return request.param
+
+@pytest.mark.parametrize("page", PAGES, ids=os.path.basename)
+def test_parse_listing_matches_the_original_scraper(page, parser):
+    html = read(page)
+    ids = [record.storm_id for record in parse_listing(html)]
+    # The legacy parser keeps repeated menu entries; parse_listing lists each storm once
+    assert ids == list(dict.fromkeys(parse_listing_legacy(html)))
+    with open(os.path.splitext(page)[0] + ".expected.json") as file:
+        assert ids == json.load(file)
+
+def test_every_fixture_has_expected_output():
+    assert PAGES
+    for page in PAGES:
+        assert os.path.exists(os.path.splitext(page)[0] + ".expected.json"), page
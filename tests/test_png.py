@@ -0,0 +1,92 @@
+import zlib
+from io import BytesIO
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from PIL import Image
+
+from tempestpy.blit import BlitRenderer
+from tempestpy.png import BAND_ROWS, BackgroundEncoder, encode_png, write_png
+
+def decode(data):
+    with Image.open(BytesIO(data)) as image:
+        image.load()
+        return np.asarray(image)
+
+def saved_pixels(fig):
+    # What matplotlib itself writes for the figure, decoded by PIL
+    buffer = BytesIO()
+    fig.savefig(buffer, format="png", dpi=fig.dpi)
+    return decode(buffer.getvalue())
+
+@pytest.mark.parametrize("channels", [3, 4])
+@pytest.mark.parametrize("height", [1, BAND_ROWS, 3 * BAND_ROWS + 5])
+def test_encode_png_round_trip(channels, height):
+    pixels = np.random.default_rng(height).integers(0, 256, (height, 7, channels), dtype=np.uint8)
+    data = encode_png(pixels)
+    assert data.startswith(b"\x89PNG\r\n\x1a\n")
+    assert np.array_equal(decode(data), pixels)
+
+@pytest.mark.parametrize("channels", [3, 4])
+@pytest.mark.parametrize("rows", [[], [0], [BAND_ROWS - 1, BAND_ROWS], [3, 40, 41, 99], [100]])
+def test_background_encoder_round_trip(channels, rows):
+    rng = np.random.default_rng(channels)
+    background = rng.integers(0, 256, (101, 9, channels), dtype=np.uint8)
+    encoder = BackgroundEncoder(background)
+    frame = background.copy()
+    for row in rows:
+        frame[row, row % 9] ^= 0xFF
+    assert encoder.changed_bands(frame).tolist() == sorted({row // BAND_ROWS for row in rows})
+    data = encoder.encode(frame)
+    assert np.array_equal(decode(data), frame)
+    # The joined bands must still be one valid zlib stream, Adler-32 included
+    assert len(zlib.decompress(data[data.index(b"IDAT") + 4:data.index(b"IEND") - 8])) == frame.shape[0] * (9 * channels + 1)
+
+def test_background_encoder_rejects_other_shapes():
+    encoder = BackgroundEncoder(np.zeros((4, 4, 4), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        encoder.encode(np.zeros((4, 5, 4), dtype=np.uint8))
+
+def test_write_png_matches_savefig(tmp_path):
+    fig, ax = plt.subplots(figsize=(3, 2), dpi=80)
+    ax.plot([0, 1, 2], [2, 0, 1], "r-")
+    ax.set_title("round trip")
+    fig.canvas.draw()
+    write_png(tmp_path / "figure.png", np.asarray(fig.canvas.buffer_rgba()))
+    with open(tmp_path / "figure.png", "rb") as file:
+        assert np.array_equal(decode(file.read()), saved_pixels(fig))
+    plt.close(fig)
+
+class LineRenderer(BlitRenderer):
+    # The smallest BlitRenderer: fixed axes as the background, one line as the data layer
+    def __init__(self):
+        super().__init__(plt.figure(figsize=(3, 2), dpi=80))
+        ax = self.fig.add_subplot(1, 1, 1)
+        ax.set_xlim(0, 10)
+        ax.set_ylim(0, 10)
+        self.line, = ax.plot([], [], "b-", linewidth=2, animated=True)
+        self.canvas.draw()
+        self.capture_background()
+
+    def _data_artists(self):
+        return [self.line]
+
+    def update(self, x, y):
+        self.line.set_data(x, y)
+
+def test_blitted_png_matches_savefig(tmp_path):
+    renderer = LineRenderer()
+    for index, y in enumerate(([1, 9, 2], [5, 5, 5], [9, 0, 9])):
+        renderer.update([1, 5, 9], y)
+        renderer.save(str(tmp_path / f"{index}.png"))
+        with open(tmp_path / f"{index}.png", "rb") as file:
+            blitted = decode(file.read())
+        # savefig draws everything, the data layer included, the ordinary way
+        renderer.line.set_animated(False)
+        expected = saved_pixels(renderer.fig)
+        renderer.line.set_animated(True)
+        assert np.array_equal(blitted, expected)
+    renderer.close()
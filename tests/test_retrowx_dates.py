@@ -0,0 +1,66 @@
+import sqlite3
+
+import pytest
+
+from schema import _date_iso_sql, _sql_normalize_date, open_database
+
+# (raw date, date_iso) pairs; None means both parsers must reject the date
+DATES = [
+    ("2013/05/31", "2013-05-31"),
+    ("2013-05-31", "2013-05-31"),
+    ("2013/5/1", "2013-05-01"),
+    ("2013-5/31", "2013-05-31"),
+    ("  2013/05/31\t", "2013-05-31"),
+    ("2013/5/31 4:5", "2013-05-31T04:05:00"),
+    ("2013/5/31   4:05", "2013-05-31T04:05:00"),
+    ("2013/5/31T04:05", "2013-05-31T04:05:00"),
+    ("2013/05/31T14:05:09", "2013-05-31T14:05:09"),
+    ("2013-05-31 14:05:09", "2013-05-31T14:05:09"),
+    ("2013-05-31 0:0:7", "2013-05-31T00:00:07"),
+    ("2012/02/29", "2012-02-29"),
+    ("2013/02/29", None),
+    ("2013/13/01", None),
+    ("2013/04/31", None),
+    ("0000/01/01", None),
+    ("13/05/31", None),
+    ("2013/005/31", None),
+    ("2013/05/031", None),
+    ("2013.05.31", None),
+    ("2013/05/31 24:00", None),
+    ("2013/05/31 12:60", None),
+    ("2013/05/31 12:00:60", None),
+    ("2013/05/31 123:00", None),
+    ("2013/05/31 12", None),
+    ("2013/05/31 12:00:", None),
+    ("2013/05/31 12:00:00:00", None),
+    ("2013/05/31T 12:00", None),
+    ("2013/05/31  T12:00", None),
+    ("2013/05/31x", None),
+    ("2013/05/31 ", "2013-05-31"),
+    ("", None),
+    ("not a date", None),
+]
+
+@pytest.fixture(scope="module")
+def conn():
+    connection = open_database(":memory:")
+    yield connection
+    connection.close()
+
+@pytest.mark.parametrize("raw, expected", DATES)
+def test_python_parser(raw, expected):
+    assert _sql_normalize_date(raw) == expected
+
+@pytest.mark.parametrize("raw, expected", DATES)
+def test_sql_parser_matches_python(raw, expected):
+    # A bare connection, without the retrowx_normalize_date function, like SQLiteStudio
+    with sqlite3.connect(":memory:") as bare:
+        assert bare.execute(f"SELECT {_date_iso_sql('?')}", (raw,)).fetchone()[0] == expected
+
+@pytest.mark.parametrize("raw, expected", DATES)
+def test_triggers_fill_date_iso(conn, raw, expected):
+    row_id = conn.execute("INSERT INTO historical_weather (date) VALUES (?)", (raw,)).lastrowid
+    assert conn.execute("SELECT date_iso FROM historical_weather WHERE id = ?", (row_id,)).fetchone()[0] == expected
+    conn.execute("UPDATE historical_weather SET date = '2000/1/1' WHERE id = ?", (row_id,))
+    conn.execute("UPDATE historical_weather SET date = ? WHERE id = ?", (raw, row_id))
+    assert conn.execute("SELECT date_iso FROM historical_weather WHERE id = ?", (row_id,)).fetchone()[0] == expected
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from queries import select_in_bbox, select_near
+from schema import fill_missing_coordinates, open_database
+from service import ENDPOINTS
+
+@pytest.fixture(scope="module")
+def conn():
+    connection = open_database(":memory:")
+    rng = random.Random(0)
+    rows = [(f"2013/05/{rng.randint(1, 31)}", f"{rng.uniform(35, 36):.3f}, {rng.uniform(-98, -97):.3f}")
+            for _ in range(300)]
+    connection.executemany("INSERT INTO historical_weather (date, location) VALUES (?, ?)", rows)
+    fill_missing_coordinates(connection)
+    yield connection
+    connection.close()
+
+def pages(select, *args, limit):
+    # Every page of a paged query, in order, until a short page
+    rows, offset = [], 0
+    while True:
+        _, page = select(*args, limit=limit, offset=offset)
+        rows += page
+        if len(page) < limit:
+            return rows
+        offset += limit
+
+def test_near_pages_are_slices_of_the_distance_order(conn):
+    columns, everything = select_near(conn, 35.5, -97.5, 30)
+    distances = [row[columns.index("distance_km")] for row in everything]
+    assert 0 < len(everything) < 300 and distances == sorted(distances) and max(distances) <= 30
+    assert select_near(conn, 35.5, -97.5, 30, limit=7, offset=14)[1] == everything[14:21]
+    assert pages(select_near, conn, 35.5, -97.5, 30, limit=9) == everything
+
+def test_bbox_pages_are_slices_of_the_date_order(conn):
+    columns, everything = select_in_bbox(conn, 35.2, -97.8, 35.8, -97.2, "2013/05/01", "2013/05/20")
+    assert everything and all(35.2 <= row[columns.index("latitude")] <= 35.8 for row in everything)
+    assert select_in_bbox(conn, 35.2, -97.8, 35.8, -97.2, "2013/05/01", "2013/05/20", limit=5, offset=5)[1] == everything[5:10]
+    assert pages(select_in_bbox, conn, 35.2, -97.8, 35.8, -97.2, "2013/05/01", "2013/05/20", limit=8) == everything
+
+@pytest.mark.parametrize("endpoint, params", [
+    ("/near", {"lat": "35.5", "lon": "-97.5", "radius_km": "100"}),
+    ("/bbox", {"min_lat": "35", "min_lon": "-98", "max_lat": "36", "max_lon": "-97"}),
+])
+def test_service_pages_spatial_endpoints(conn, endpoint, params):
+    _, first = ENDPOINTS[endpoint](conn, dict(params, limit="10"))
+    _, second = ENDPOINTS[endpoint](conn, dict(params, limit="10", page="2"))
+    _, everything = ENDPOINTS[endpoint](conn, dict(params, limit="10000"))
+    assert len(everything) == 300 and first + second == everything[:20]
+    with pytest.raises(ValueError):
+        ENDPOINTS[endpoint](conn, dict(params, limit="10001"))
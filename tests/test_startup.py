@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Repository root, where `python -m tempestpy` finds the launcher package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Only a tool script may pull these in; the launcher's help must start without them
+HEAVY_MODULES = {"numpy", "pandas", "matplotlib", "metpy"}
+
+def imported_modules(*args):
+    """
+    Top-level names of every module imported by `python -m tempestpy <args>` (from -X importtime).
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-m", "tempestpy", *args], cwd=ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    return {line.rsplit("|", 1)[1].strip().split(".")[0] for line in result.stderr.splitlines()
+            if line.startswith("import time:") and "[us]" not in line}
+
+@pytest.mark.parametrize("args", [["--help"], ["skewt", "--help"], ["retrowx", "--help"]])
+def test_help_imports_no_heavy_modules(args):
+    imported = imported_modules(*args)
+    assert "tempestpy" in imported
+    assert not imported & HEAVY_MODULES
@@ -0,0 +1,74 @@
+import json
+import os
+import threading
+
+import pytest
+from PIL import Image
+
+from httpcache import CachedSession
+from standin import floater_images, start_standin
+from watch import Watcher
+
+STORMS = ["AL01", "EP02"]
+
+@pytest.fixture
+def standin():
+    server, url = start_standin()
+    yield server, url
+    server.shutdown()
+    server.server_close()
+
+def make_watcher(url, tmp_path):
+    session = CachedSession(str(tmp_path / "cache"))
+    def url_for(storm_id, kind):
+        name = "ott.png" if kind == "still" else "ott-animated.gif"
+        return f"{url}/floaters/{storm_id}/imagery/{name}"
+    return Watcher(session, lambda: STORMS, url_for, archive_dir=str(tmp_path / "archive"))
+
+def archived(tmp_path, storm_id):
+    with open(tmp_path / "archive" / storm_id / "index.jsonl") as file:
+        return [json.loads(line) for line in file]
+
+def test_restart_does_not_save_unchanged_images_again(standin, tmp_path):
+    _, url = standin
+    assert make_watcher(url, tmp_path).poll() == {storm_id: 13 for storm_id in STORMS}
+    files = sorted(os.listdir(tmp_path / "archive" / "AL01"))
+    # A new watcher (fresh process state) reloads the frame hashes from index.jsonl
+    restarted = make_watcher(url, tmp_path)
+    assert restarted.poll() == {storm_id: 0 for storm_id in STORMS}
+    assert restarted.stats["downloads"] == 4 and restarted.stats["errors"] == 0
+    assert sorted(os.listdir(tmp_path / "archive" / "AL01")) == files
+
+def test_shifted_loop_archives_exactly_one_new_frame(standin, tmp_path):
+    server, url = standin
+    watcher = make_watcher(url, tmp_path)
+    watcher.poll()
+    before = archived(tmp_path, "AL01")
+    # The next update of the loop: oldest frame dropped, one new frame at the end
+    shifted = floater_images(frames=13, first=1)
+    body = server.RequestHandlerClass._body
+    def _body(handler):
+        if handler.path.endswith("/ott-animated.gif"):
+            return shifted["ott-animated.gif"], "image/gif"
+        return body(handler)
+    server.RequestHandlerClass._body = _body
+    assert watcher.poll() == {storm_id: 1 for storm_id in STORMS}
+    added = archived(tmp_path, "AL01")[len(before):]
+    assert [record["kind"] for record in added] == ["frame"]
+
+def test_undecodable_images_are_skipped(standin, tmp_path, monkeypatch):
+    _, url = standin
+    watcher = make_watcher(url, tmp_path)
+    # Every stand-in image is now over PIL's decompression bomb limit
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+    assert watcher.poll() == {"AL01": 1, "EP02": 1}  # the still PNG is archived without decoding
+    assert watcher.stats["errors"] == 2
+
+def test_run_from_a_worker_thread(standin, tmp_path):
+    _, url = standin
+    watcher = make_watcher(url, tmp_path)
+    results = []
+    worker = threading.Thread(target=lambda: results.append(watcher.run(interval=0, cycles=1)))
+    worker.start()
+    worker.join()
+    assert results and results[0]["polls"] == 1 and results[0]["frames_saved"] == 26